@@ -0,0 +1,445 @@
+"""
+Worker alert headless: memantau watchlist di luar Streamlit, bangun setiap
+candle close, lalu menulis transisi BUY/SELL baru ke sink (file JSONL,
+SQLite, webhook).
+
+- Penjadwal  : satu heap berisi waktu close berikutnya per interval (bukan
+               per ticker, bukan thread per ticker). Semua ticker dengan
+               interval yang sama diproses bersama dalam satu kali bangun,
+               jadi ribuan pasangan ticker/interval tetap satu thread.
+- Indikator  : StreamingIndicators per interval, di-seed sekali dari histori
+               lalu diperbarui O(1) per candle yang baru close; aturannya
+               sama dengan generate_smart_signal.
+- Data       : ``fetch_many`` per batch ticker, hanya ekor pendek sejak
+               candle terakhir yang sudah diproses. Candle yang belum close
+               (candle berjalan) selalu diabaikan.
+- Jam        : objek dengan ``time()`` dan ``sleep(detik)``. SimulatedClock
+               memajukan waktu tanpa menunggu, sehingga worker bisa diuji
+               dengan FakeFetcher tanpa network.
+
+Grid candle dihitung dari epoch UTC (sama dengan FakeFetcher/OHLCVStore).
+
+Contoh:
+    python alert_worker.py BTC-USD ETH-USD --interval 15m --interval 1h --jsonl alerts.jsonl
+    python alert_worker.py --watchlist watchlist.txt --sqlite alerts.db --webhook https://contoh/hook
+    python alert_worker.py BTC-USD AAPL --fake --simulate-hours 48   # jam simulasi, tanpa network
+"""
+import argparse
+import heapq
+import json
+import logging
+import sqlite3
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from ohlcv_store import MAX_LOOKBACK_DAYS, interval_to_seconds, normalize_ohlcv, period_to_seconds
+from signal_rules import CODE_BUY, CODE_SELL, SIGNAL_LABELS, SIGNAL_REASONS
+from streaming import StreamingIndicators
+
+logger = logging.getLogger("trading_analisa.alerts")
+
+# periode Yahoo yang dipakai untuk seed / ekor, dari yang terpendek
+_PERIODS = ("1d", "5d", "1mo", "3mo", "6mo", "1y", "2y", "5y", "10y")
+
+# jumlah candle histori untuk seed (EMA200 butuh beberapa ratus bar)
+SEED_BARS = 400
+
+_ALERT_CODES = (CODE_BUY, CODE_SELL)
+
+
+# =========================
+# JAM
+# =========================
+class SystemClock:
+    """Jam asli (epoch detik)."""
+
+    def time(self) -> float:
+        return time.time()
+
+    def sleep(self, seconds: float):
+        time.sleep(seconds)
+
+
+class SimulatedClock:
+    """Jam simulasi untuk tes: ``sleep`` langsung memajukan waktu."""
+
+    def __init__(self, start: float):
+        self.now = float(start)
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += max(0.0, seconds)
+
+
+def next_close(interval: str, now: float) -> float:
+    """Waktu close candle yang sedang berjalan pada grid ``interval``."""
+    step = interval_to_seconds(interval)
+    return (now // step + 1) * step
+
+
+def period_for_span(interval: str, seconds: float) -> str:
+    """Periode Yahoo terpendek yang mencakup ``seconds`` ke belakang (dibatasi histori intraday)."""
+    limit = MAX_LOOKBACK_DAYS.get(interval)
+    allowed = [p for p in _PERIODS if limit is None or period_to_seconds(p) <= limit * 86400]
+    for period in allowed:
+        if period_to_seconds(period) >= seconds:
+            return period
+    return allowed[-1]
+
+
+def _index_ns(index) -> np.ndarray:
+    """Timestamp index sebagai int64 nanodetik UTC (index naif dianggap UTC)."""
+    index = pd.DatetimeIndex(index)
+    if index.tz is None:
+        index = index.tz_localize("UTC")
+    return index.tz_convert("UTC").as_unit("ns").asi8
+
+
+# =========================
+# SINK ALERT
+# =========================
+class MemorySink:
+    """Simpan alert di list (untuk tes / pemakaian di dalam proses)."""
+
+    def __init__(self):
+        self.alerts = []
+
+    def emit(self, alerts):
+        self.alerts.extend(alerts)
+
+
+class JsonlSink:
+    """Satu alert per baris JSON; ``path='-'`` menulis ke stdout."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def emit(self, alerts):
+        lines = "".join(json.dumps(a, ensure_ascii=False) + "\n" for a in alerts)
+        if self.path == "-":
+            sys.stdout.write(lines)
+            sys.stdout.flush()
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+
+class SQLiteSink:
+    """
+    Tabel ``alerts`` di SQLite. Alert yang sama (ticker, interval, waktu bar)
+    hanya disimpan sekali, jadi worker yang di-restart tidak menggandakan.
+    """
+
+    _COLUMNS = ("symbol", "interval", "signal", "bar_time", "close",
+                "ema10", "ema20", "ema50", "ema200", "rsi", "reason", "emitted_at")
+
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS alerts ("
+            "id INTEGER PRIMARY KEY, symbol TEXT, interval TEXT, signal TEXT, bar_time TEXT, "
+            "close REAL, ema10 REAL, ema20 REAL, ema50 REAL, ema200 REAL, rsi REAL, "
+            "reason TEXT, emitted_at TEXT, UNIQUE (symbol, interval, bar_time))"
+        )
+        self.conn.commit()
+
+    def emit(self, alerts):
+        columns = ", ".join(self._COLUMNS)
+        marks = ", ".join("?" for _ in self._COLUMNS)
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT OR IGNORE INTO alerts ({columns}) VALUES ({marks})",
+                [tuple(a[c] for c in self._COLUMNS) for a in alerts],
+            )
+
+    def close(self):
+        self.conn.close()
+
+
+class WebhookSink:
+    """
+    Stub webhook: POST JSON ``{"alerts": [...]}`` ke ``url``. Tanpa ``url``
+    payload hanya dicatat di ``sent`` (tidak ada network). ``post`` bisa
+    diganti fungsi ``post(url, body_bytes)`` untuk tes.
+    """
+
+    def __init__(self, url=None, timeout: float = 5.0, post=None):
+        self.url = url
+        self.timeout = timeout
+        self.post = post or self._post
+        self.sent = []
+
+    def _post(self, url, body):
+        import urllib.request
+
+        request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+    def emit(self, alerts):
+        body = json.dumps({"alerts": alerts}, ensure_ascii=False).encode("utf-8")
+        self.sent.append(body)
+        if self.url:
+            self.post(self.url, body)
+
+
+# =========================
+# WORKER
+# =========================
+class _IntervalGroup:
+    """Semua ticker untuk satu interval: state indikator + bar terakhir yang sudah diproses."""
+
+    def __init__(self, interval, symbols):
+        self.interval = interval
+        self.step_ns = interval_to_seconds(interval) * 10 ** 9
+        self.symbols = list(symbols)
+        self.indicators = StreamingIndicators(self.symbols)
+        self.last_ns = np.full(len(self.symbols), -1, dtype=np.int64)
+        self.codes = self.indicators.codes()
+
+
+class AlertWorker:
+    """
+    Worker alert untuk ``watchlist`` berupa pasangan (ticker Yahoo, interval).
+
+    ``start()`` men-seed indikator dari histori; ``run_pending()`` memproses
+    semua interval yang sudah jatuh tempo; ``run(until=...)`` tidur sampai
+    close berikutnya lalu memproses, berulang.
+    """
+
+    def __init__(self, watchlist, fetcher, sinks=(), clock=None, delay: float = 5.0, batch_size: int = 200):
+        self.fetcher = fetcher
+        self.sinks = list(sinks)
+        self.clock = clock if clock is not None else SystemClock()
+        self.delay = delay            # jeda setelah close sebelum fetch (data upstream telat sedikit)
+        self.batch_size = batch_size
+
+        by_interval = {}
+        for ticker, interval in watchlist:
+            interval_to_seconds(interval)  # validasi lebih awal
+            by_interval.setdefault(interval, {})[ticker] = None
+        self.groups = {iv: _IntervalGroup(iv, tickers) for iv, tickers in by_interval.items()}
+        self._heap = []
+        self.wakeups = 0
+
+    # ---------- data ----------
+    def _fetch(self, group, period):
+        frames = {}
+        for lo in range(0, len(group.symbols), self.batch_size):
+            batch = group.symbols[lo:lo + self.batch_size]
+            try:
+                frames.update(self.fetcher.fetch_many(batch, group.interval, period))
+            except Exception as exc:  # batch gagal dicoba lagi di candle berikutnya
+                logger.warning("fetch %s %s gagal: %s", group.interval, batch[0], exc)
+        return frames
+
+    def _closed(self, frame, now_ns, step_ns):
+        """(ts_ns, close) untuk candle yang sudah close."""
+        frame = normalize_ohlcv(frame)
+        if frame.empty:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        ts = _index_ns(frame.index)
+        done = ts + step_ns <= now_ns
+        return ts[done], frame["Close"].to_numpy(dtype=np.float64)[done]
+
+    # ---------- siklus ----------
+    def start(self):
+        """Seed indikator semua interval lalu jadwalkan close berikutnya."""
+        now = self.clock.time()
+        now_ns = int(now * 1e9)
+        for interval, group in self.groups.items():
+            period = period_for_span(interval, SEED_BARS * interval_to_seconds(interval))
+            frames = self._fetch(group, period)
+            seeds = {}
+            for j, symbol in enumerate(group.symbols):
+                ts, close = self._closed(frames.get(symbol), now_ns, group.step_ns)
+                seeds[symbol] = pd.DataFrame({"Close": close})
+                if len(ts):
+                    group.last_ns[j] = ts[-1]
+            group.indicators = StreamingIndicators.from_frames(seeds)
+            # state awal bukan transisi baru: hanya perubahan setelah start yang di-alert
+            group.codes = group.indicators.codes()
+            heapq.heappush(self._heap, (next_close(interval, now) + self.delay, interval))
+        logger.info("worker mulai: %s", {iv: len(g.symbols) for iv, g in self.groups.items()})
+
+    def process(self, group):
+        """Masukkan candle yang baru close untuk satu interval; return alert baru."""
+        now = self.clock.time()
+        now_ns = int(now * 1e9)
+        oldest = group.last_ns[group.last_ns >= 0]
+        since = (now_ns - oldest.min()) / 1e9 if len(oldest) else SEED_BARS * interval_to_seconds(group.interval)
+        frames = self._fetch(group, period_for_span(group.interval, since))
+
+        # candle baru per ticker, disusun per "putaran": putaran ke-k berisi
+        # candle baru ke-k tiap ticker (NaN kalau ticker itu tidak punya)
+        new_ts, new_close = [], []
+        for j, symbol in enumerate(group.symbols):
+            ts, close = self._closed(frames.get(symbol), now_ns, group.step_ns)
+            fresh = ts > group.last_ns[j]
+            new_ts.append(ts[fresh])
+            new_close.append(close[fresh])
+            if fresh.any():
+                group.last_ns[j] = ts[fresh][-1]
+
+        rounds = max((len(c) for c in new_close), default=0)
+        alerts = []
+        emitted_at = pd.Timestamp(now, unit="s", tz="UTC").isoformat()
+        for k in range(rounds):
+            row = np.array([c[k] if k < len(c) else np.nan for c in new_close])
+            codes = group.indicators.update(row)
+            has = ~np.isnan(row)
+            fired = has & np.isin(codes, _ALERT_CODES) & (codes != group.codes)
+            group.codes = np.where(has, codes, group.codes)
+            if fired.any():
+                alerts.extend(self._alerts(group, np.nonzero(fired)[0], codes, new_ts, k, emitted_at))
+        return alerts
+
+    def _alerts(self, group, cols, codes, new_ts, k, emitted_at):
+        ind = group.indicators
+        rsi = ind.rsi()
+        ema = {span: ind.ema[i] for i, span in enumerate(ind.spans)}
+        out = []
+        for j in cols:
+            code = int(codes[j])
+            out.append({
+                "symbol": group.symbols[j],
+                "interval": group.interval,
+                "signal": SIGNAL_LABELS[code],
+                "bar_time": pd.Timestamp(int(new_ts[j][k]), unit="ns", tz="UTC").isoformat(),
+                "close": float(ind.last_close[j]),
+                "ema10": float(ema[10][j]),
+                "ema20": float(ema[20][j]),
+                "ema50": float(ema[50][j]),
+                "ema200": float(ema[200][j]),
+                "rsi": float(rsi[j]),
+                "reason": SIGNAL_REASONS[code],
+                "emitted_at": emitted_at,
+            })
+        return out
+
+    def emit(self, alerts):
+        for sink in self.sinks:
+            try:
+                sink.emit(alerts)
+            except Exception as exc:  # satu sink gagal tidak menghentikan sink lain
+                logger.warning("sink %s gagal: %s", type(sink).__name__, exc)
+
+    def run_pending(self):
+        """Proses semua interval yang close-nya sudah lewat; return alert baru."""
+        now = self.clock.time()
+        alerts = []
+        while self._heap and self._heap[0][0] <= now:
+            _, interval = heapq.heappop(self._heap)
+            alerts.extend(self.process(self.groups[interval]))
+            self.wakeups += 1
+            heapq.heappush(self._heap, (next_close(interval, now) + self.delay, interval))
+        if alerts:
+            self.emit(alerts)
+            logger.info("%d alert baru", len(alerts))
+        return alerts
+
+    def next_wakeup(self):
+        return self._heap[0][0] if self._heap else None
+
+    def run(self, until=None):
+        """Loop utama: tidur sampai close berikutnya, proses, ulangi (sampai ``until``)."""
+        if not self._heap:
+            self.start()
+        alerts = []
+        while self._heap:
+            due = self.next_wakeup()
+            if until is not None and due > until:
+                break
+            self.clock.sleep(max(0.0, due - self.clock.time()))
+            alerts.extend(self.run_pending())
+        return alerts
+
+
+# =========================
+# CLI
+# =========================
+def read_watchlist(path, default_intervals):
+    """File watchlist: satu ticker per baris, opsional diikuti interval; '#' = komentar."""
+    pairs = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            parts = line.split("#", 1)[0].split()
+            if not parts:
+                continue
+            for interval in parts[1:] or default_intervals:
+                pairs.append((parts[0], interval))
+    return pairs
+
+
+def build_parser():
+    from trading_cli import MARKET_TYPES
+
+    parser = argparse.ArgumentParser(description="Worker alert BUY/SELL di setiap candle close (tanpa UI).")
+    parser.add_argument("tickers", nargs="*", help="Ticker, opsional dengan awalan '<jenis pasar>:'")
+    parser.add_argument("--watchlist", help="file watchlist (ticker [interval ...] per baris)")
+    parser.add_argument("--market", default="Crypto", choices=MARKET_TYPES, help="jenis pasar default")
+    parser.add_argument("--interval", action="append", help="interval (boleh diulang, default 1h)")
+    parser.add_argument("--jsonl", help="file JSONL alert ('-' = stdout)")
+    parser.add_argument("--sqlite", help="file database SQLite alert")
+    parser.add_argument("--webhook", help="URL webhook (POST JSON)")
+    parser.add_argument("--delay", type=float, default=5.0, help="jeda setelah close sebelum fetch (detik)")
+    parser.add_argument("--batch-size", type=int, default=200, help="ticker per panggilan fetch_many")
+    parser.add_argument("--fake", action="store_true", help="pakai data sintetis (offline)")
+    parser.add_argument("--simulate-hours", type=float,
+                        help="jalankan dengan jam simulasi selama N jam lalu berhenti (cocok dengan --fake)")
+    parser.add_argument("--verbose", action="store_true", help="log ke stderr")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    from trading_cli import parse_ticker
+    from trading_core import map_ticker_to_yahoo
+
+    logging.basicConfig(stream=sys.stderr, level=logging.INFO if args.verbose else logging.WARNING,
+                        format="%(asctime)s %(message)s")
+
+    intervals = args.interval or ["1h"]
+    pairs = read_watchlist(args.watchlist, intervals) if args.watchlist else []
+    pairs += [(t, iv) for t in args.tickers for iv in intervals]
+    if not pairs:
+        build_parser().error("isi ticker atau --watchlist")
+    watchlist = [(map_ticker_to_yahoo(*parse_ticker(raw, args.market)), iv) for raw, iv in pairs]
+
+    clock = SimulatedClock(time.time()) if args.simulate_hours else SystemClock()
+    if args.fake:
+        from ohlcv_store import FakeFetcher
+
+        fetcher = FakeFetcher(clock=clock.time)
+    else:
+        from fetch_service import FetchService
+        from ohlcv_store import YahooFetcher
+
+        fetcher = FetchService(YahooFetcher())
+
+    sinks = []
+    if args.jsonl:
+        sinks.append(JsonlSink(args.jsonl))
+    if args.sqlite:
+        sinks.append(SQLiteSink(args.sqlite))
+    if args.webhook:
+        sinks.append(WebhookSink(args.webhook))
+    if not sinks:
+        sinks.append(JsonlSink("-"))
+
+    worker = AlertWorker(watchlist, fetcher, sinks, clock=clock, delay=args.delay, batch_size=args.batch_size)
+    until = clock.time() + args.simulate_hours * 3600 if args.simulate_hours else None
+    try:
+        worker.run(until=until)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
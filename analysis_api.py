@@ -0,0 +1,380 @@
+"""
+HTTP API lokal Trader Analyzer: mapping ticker, EMA + RSI,
+generate_smart_signal, dan compute_position_sizing untuk layanan lain,
+tanpa Streamlit. Hanya memakai standard library (+ pyarrow opsional).
+
+Endpoint:
+- GET  /health
+- GET  /symbols?q=BB&market=Saham%20Indonesia&limit=10  -> autocomplete lokal
+- GET  /resolve?ticker=gold&market=Forex               -> validasi + alias
+- GET  /analyze?ticker=BTC-USD&market=Crypto&period=3mo&interval=1d
+         &balance=1000&risk_pct=2&stop_pct=3          -> satu objek JSON
+- POST /sizing  {"balance", "risk_pct", "stop_pct", "price"}
+- POST /batch   {"tickers": [...], "market", "period", "interval",
+                 "balance", "risk_pct", "stop_pct", "format"}
+
+/batch menganalisis semua ticker secara paralel (thread pool bersama) dan
+mengirim hasil begitu tiap ticker selesai (chunked transfer), jadi klien
+tidak menunggu ticker paling lambat. Urutan = urutan selesai; field
+``index`` menunjuk posisi ticker di request. Format:
+- ``ndjson`` (default): satu objek JSON per baris.
+- ``arrow``: stream Arrow IPC, satu record batch per ticker (butuh pyarrow).
+Format juga bisa dipilih lewat header Accept
+(``application/vnd.apache.arrow.stream``).
+
+Contoh:
+    python analysis_api.py --port 8765
+    python analysis_api.py --fake          # data sintetis, tanpa network
+    curl -N -d '{"tickers": ["BTC-USD", "ETH-USD", "Forex:EURUSD"]}' localhost:8765/batch
+"""
+import argparse
+import json
+import logging
+import math
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from trading_cli import CSV_FIELDS, MARKET_TYPES, parse_ticker
+
+logger = logging.getLogger("trading_analisa.api")
+
+NDJSON_TYPE = "application/x-ndjson"
+ARROW_TYPE = "application/vnd.apache.arrow.stream"
+
+MAX_BATCH = 1000          # ticker per request /batch
+MAX_BODY_BYTES = 1 << 20
+MAX_COMPLETE_LIMIT = 100  # saran per request /symbols
+
+_TEXT_FIELDS = {"ticker", "market_type", "yahoo_ticker", "period", "interval", "signal", "time", "reason"}
+
+
+class RequestError(ValueError):
+    """Parameter request tidak valid (dijawab 400)."""
+
+
+def _finite(value):
+    """NaN / inf -> None supaya hasil tetap JSON yang valid."""
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def _number(params, name, default):
+    value = params.get(name, default)
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise RequestError(f"'{name}' harus berupa angka") from None
+    if not math.isfinite(number):
+        raise RequestError(f"'{name}' harus berupa angka terhingga")
+    return number
+
+
+def analysis_options(params) -> dict:
+    """Opsi analisis dari query / body JSON, dengan default yang sama seperti CLI."""
+    market = params.get("market", "Crypto")
+    if market not in MARKET_TYPES:
+        raise RequestError(f"'market' harus salah satu dari {MARKET_TYPES}")
+    return {
+        "market": market,
+        "period": str(params.get("period", "3mo")),
+        "interval": str(params.get("interval", "1d")),
+        "balance": _number(params, "balance", 1000.0),
+        "risk_pct": _number(params, "risk_pct", 2.0),
+        "stop_pct": _number(params, "stop_pct", 3.0),
+    }
+
+
+# =========================
+# LAYANAN
+# =========================
+class AnalysisService:
+    """
+    Pipeline analisis di atas satu store candle + thread pool untuk batch.
+    ``symbols`` (symbol_index.SymbolIndex) opsional: ticker yang tidak
+    valid dijawab ERROR tanpa request ke upstream.
+    """
+
+    def __init__(self, store, max_workers: int = 8, symbols=None):
+        self.store = store
+        self.symbols = symbols
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analyze")
+
+    def analyze(self, raw_ticker: str, options: dict) -> dict:
+        from trading_core import analyze_ticker
+
+        ticker, market = parse_ticker(raw_ticker, options["market"])
+        try:
+            result = analyze_ticker(
+                ticker, market, options["period"], options["interval"], self.store,
+                balance=options["balance"], risk_pct=options["risk_pct"], stop_pct=options["stop_pct"],
+                symbols=self.symbols,
+            )
+        except Exception as exc:  # satu ticker gagal tidak menghentikan batch
+            result = {"ticker": ticker, "market_type": market, "signal": "ERROR", "reason": str(exc)}
+        return {k: _finite(v) for k, v in result.items()}
+
+    def iter_batch(self, tickers, options: dict):
+        """Hasil per ticker (dengan ``index``) dalam urutan selesai."""
+        futures = {self._pool.submit(self.analyze, t, options): i for i, t in enumerate(tickers)}
+        try:
+            for future in as_completed(futures):
+                yield dict(future.result(), index=futures[future])
+        finally:
+            # klien putus di tengah jalan: ticker yang belum mulai tidak dikerjakan
+            for future in futures:
+                future.cancel()
+
+    def complete(self, params) -> dict:
+        market = analysis_options(params)["market"]
+        limit = _number(params, "limit", 10)
+        if limit < 1 or limit != int(limit):
+            raise RequestError("'limit' harus bilangan bulat positif")
+        limit = min(int(limit), MAX_COMPLETE_LIMIT)
+        matches = self.symbols.complete(params.get("q", ""), market, limit) if self.symbols else []
+        return {"market": market, "symbols": [
+            {"symbol": s.symbol, "yahoo": s.yahoo, "name": s.name} for s in matches
+        ]}
+
+    def resolve(self, params) -> dict:
+        if self.symbols is None:
+            raise RequestError("daftar simbol tidak aktif di server ini")
+        ticker, market = parse_ticker(params.get("ticker", ""), analysis_options(params)["market"])
+        res = self.symbols.resolve(ticker, market)
+        return {
+            "ticker": res.ticker, "market_type": res.market_type, "status": res.status,
+            "yahoo_ticker": res.yahoo, "suggestions": list(res.suggestions), "message": res.message(),
+        }
+
+    @staticmethod
+    def sizing(params) -> dict:
+        from trading_core import compute_position_sizing
+
+        risk_amount, qty, sl_price, tp_price = compute_position_sizing(
+            _number(params, "balance", 1000.0),
+            _number(params, "risk_pct", 2.0),
+            _number(params, "stop_pct", 3.0),
+            _number(params, "price", 0.0),
+        )
+        result = {"risk_amount": risk_amount, "qty": qty, "sl_price": sl_price, "tp_price": tp_price}
+        return {k: _finite(v) for k, v in result.items()}
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+# =========================
+# ENCODER STREAM
+# =========================
+def arrow_schema():
+    import pyarrow as pa
+
+    fields = [pa.field("index", pa.int64())]
+    fields += [pa.field(name, pa.string() if name in _TEXT_FIELDS else pa.float64()) for name in CSV_FIELDS]
+    return pa.schema(fields)
+
+
+class _ChunkWriter:
+    """File-like minimal untuk pyarrow: setiap write = satu chunk HTTP."""
+
+    def __init__(self, send):
+        self.send = send
+        self.closed = False
+
+    def write(self, data):
+        self.send(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def stream_ndjson(results, send):
+    for row in results:
+        send((json.dumps(row, ensure_ascii=False) + "\n").encode("utf-8"))
+
+
+def stream_arrow(results, send):
+    import pyarrow as pa
+
+    schema = arrow_schema()
+    with pa.ipc.new_stream(pa.PythonFile(_ChunkWriter(send), mode="w"), schema) as writer:
+        for row in results:
+            writer.write_batch(pa.RecordBatch.from_pylist([row], schema=schema))
+
+
+# =========================
+# HTTP
+# =========================
+class AnalysisHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "TraderAnalyzerAPI/1.0"
+
+    @property
+    def service(self) -> AnalysisService:
+        return self.server.service
+
+    def log_message(self, format, *args):
+        logger.info("%s %s", self.address_string(), format % args)
+
+    # ---------- respons ----------
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_chunk(self, data: bytes):
+        if data:
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self.wfile.flush()
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            raise RequestError("body terlalu besar")
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            raise RequestError("body harus JSON") from None
+        if not isinstance(payload, dict):
+            raise RequestError("body harus objek JSON")
+        return payload
+
+    # ---------- routing ----------
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            if url.path == "/health":
+                self._send_json(200, {"status": "ok"})
+            elif url.path == "/analyze":
+                if not params.get("ticker"):
+                    raise RequestError("'ticker' wajib diisi")
+                self._send_json(200, self.service.analyze(params["ticker"], analysis_options(params)))
+            elif url.path == "/symbols":
+                self._send_json(200, self.service.complete(params))
+            elif url.path == "/resolve":
+                self._send_json(200, self.service.resolve(params))
+            else:
+                self._send_json(404, {"error": f"endpoint tidak dikenal: {url.path}"})
+        except RequestError as exc:
+            self._send_json(400, {"error": str(exc)})
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        try:
+            payload = self._read_json()
+            if path == "/sizing":
+                self._send_json(200, self.service.sizing(payload))
+            elif path == "/batch":
+                self._batch(payload)
+            else:
+                self._send_json(404, {"error": f"endpoint tidak dikenal: {path}"})
+        except RequestError as exc:
+            self._send_json(400, {"error": str(exc)})
+
+    def _batch(self, payload):
+        tickers = payload.get("tickers")
+        if not isinstance(tickers, list) or not tickers or not all(isinstance(t, str) for t in tickers):
+            raise RequestError("'tickers' harus berupa list ticker")
+        if len(tickers) > MAX_BATCH:
+            raise RequestError(f"maksimal {MAX_BATCH} ticker per request")
+        options = analysis_options(payload)
+
+        fmt = payload.get("format") or ("arrow" if ARROW_TYPE in self.headers.get("Accept", "") else "ndjson")
+        if fmt not in ("ndjson", "arrow"):
+            raise RequestError("'format' harus 'ndjson' atau 'arrow'")
+        if fmt == "arrow":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                self._send_json(501, {"error": "format arrow butuh pyarrow (pip install pyarrow)"})
+                return
+
+        self.send_response(200)
+        self.send_header("Content-Type", ARROW_TYPE if fmt == "arrow" else NDJSON_TYPE)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        results = self.service.iter_batch(tickers, options)
+        try:
+            (stream_arrow if fmt == "arrow" else stream_ndjson)(results, self._send_chunk)
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            logger.info("klien putus di tengah batch (%d ticker)", len(tickers))
+            self.close_connection = True
+        finally:
+            results.close()
+
+
+class AnalysisServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, service: AnalysisService):
+        super().__init__(address, AnalysisHandler)
+        self.service = service
+
+
+def make_server(store, host: str = "127.0.0.1", port: int = 8765, max_workers: int = 8, symbols=None) -> AnalysisServer:
+    """Server siap ``serve_forever()``; ``port=0`` memilih port bebas (untuk tes)."""
+    return AnalysisServer((host, port), AnalysisService(store, max_workers=max_workers, symbols=symbols))
+
+
+def serve_in_thread(server: AnalysisServer) -> threading.Thread:
+    """Jalankan server di thread latar (mis. tes dengan FakeFetcher); hentikan dengan ``server.shutdown()``."""
+    thread = threading.Thread(target=server.serve_forever, name="analysis-api", daemon=True)
+    thread.start()
+    return thread
+
+
+# =========================
+# CLI
+# =========================
+def build_parser():
+    parser = argparse.ArgumentParser(description="HTTP API lokal analisis EMA + RSI + ukuran posisi.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=8, help="ticker yang dianalisis bersamaan")
+    parser.add_argument("--store-dir", help="folder cache candle lokal")
+    parser.add_argument("--fake", action="store_true", help="pakai data sintetis (offline)")
+    parser.add_argument("--no-validate", action="store_true",
+                        help="lewati validasi ticker terhadap daftar simbol lokal")
+    parser.add_argument("--verbose", action="store_true", help="log request ke stderr")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    from fetch_service import FetchService
+    from ohlcv_store import FakeFetcher, OHLCVStore, YahooFetcher, store_root
+    from symbol_index import default_index
+
+    logging.basicConfig(stream=sys.stderr, level=logging.INFO if args.verbose else logging.WARNING,
+                        format="%(asctime)s %(message)s")
+
+    fetcher = FakeFetcher() if args.fake else FetchService(YahooFetcher())
+    store = OHLCVStore(root=store_root(args.store_dir, args.fake), fetcher=fetcher)
+    symbols = None if args.no_validate else default_index()
+    server = make_server(store, args.host, args.port, max_workers=args.workers, symbols=symbols)
+    logger.warning("API berjalan di http://%s:%d", *server.server_address[:2])
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.service.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+Backfill histori panjang untuk interval intraday.
+
+Yahoo membatasi histori intraday (MAX_LOOKBACK_DAYS) dan panjang rentang
+per request. Rentang panjang dipecah jadi jendela yang diizinkan, diunduh
+paralel (lewat FetchService kalau dipasang, jadi rate limit + retry tetap
+berlaku), lalu digabung tanpa duplikat dan disimpan oleh OHLCVStore.
+
+Bar yang lebih tua dari batas Yahoo memang tidak bisa diunduh. Store
+tidak pernah membuang bar yang sudah tersimpan, jadi histori lokal terus
+memanjang kalau backfill dijalankan rutin (mis. cron harian); sejak itu
+seri multi-tahun dilayani dari disk.
+
+Contoh:
+    python backfill.py BTC-USD ETH-USD --interval 1h --period 2y
+    python backfill.py BTC-USD --interval 15m --period 1y --fake
+"""
+import argparse
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from ohlcv_store import MAX_LOOKBACK_DAYS, interval_to_seconds
+
+# panjang satu jendela request per interval (hari); lebih pendek dari
+# batas Yahoo supaya tiap request kecil dan bisa jalan paralel
+BACKFILL_WINDOW_DAYS = {
+    "1m": 7,
+    "2m": 30,
+    "5m": 30,
+    "15m": 30,
+    "30m": 30,
+    "90m": 30,
+    "60m": 180,
+    "1h": 180,
+    "4h": 180,
+}
+
+# jangan meminta persis di batas lookback (Yahoo menolak request itu)
+LOOKBACK_MARGIN = 86400
+
+
+def lookback_start(interval: str, now: float):
+    """Waktu tertua yang masih bisa diunduh untuk ``interval`` (None = tanpa batas)."""
+    days = MAX_LOOKBACK_DAYS.get(interval)
+    return None if days is None else now - days * 86400 + LOOKBACK_MARGIN
+
+
+def needs_backfill(interval: str, start: float, now: float) -> bool:
+    """Rentang [start, now] lebih panjang dari satu jendela atau melewati batas lookback."""
+    window = BACKFILL_WINDOW_DAYS.get(interval)
+    if window is None:
+        return False
+    oldest = lookback_start(interval, now)
+    return now - start > window * 86400 or (oldest is not None and start < oldest)
+
+
+def plan_windows(interval: str, start: float, end: float, now: float, window_days=None):
+    """
+    Pecah [start, end) jadi jendela (start, end) epoch detik yang diizinkan.
+    Bagian sebelum batas lookback dibuang; jendela bertumpuk satu bar supaya
+    tidak ada candle yang jatuh di celah antar request.
+    """
+    oldest = lookback_start(interval, now)
+    if oldest is not None:
+        start = max(start, oldest)
+    end = min(end, now)
+    if start >= end:
+        return []
+
+    step = interval_to_seconds(interval)
+    width = (window_days or BACKFILL_WINDOW_DAYS.get(interval, 3650)) * 86400
+    windows = []
+    lo = start
+    while lo < end:
+        hi = min(lo + width, end)
+        windows.append((lo, min(hi + step, end) if hi < end else end))
+        lo = hi
+    return windows
+
+
+def fetch_windows(fetcher, ticker: str, interval: str, windows, max_workers: int = 4):
+    """Unduh semua jendela paralel -> list frame (urut seperti ``windows``)."""
+    def fetch(window):
+        lo, hi = window
+        return fetcher.fetch(
+            ticker, interval,
+            start=pd.Timestamp(lo, unit="s", tz="UTC"),
+            end=pd.Timestamp(hi, unit="s", tz="UTC"),
+        )
+
+    if len(windows) <= 1:
+        return [fetch(w) for w in windows]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(windows)), thread_name_prefix="backfill") as pool:
+        return list(pool.map(fetch, windows))
+
+
+# =========================
+# CLI
+# =========================
+def build_parser():
+    from trading_cli import MARKET_TYPES
+
+    parser = argparse.ArgumentParser(description="Isi store candle lokal dengan histori panjang (intraday).")
+    parser.add_argument("tickers", nargs="+", help="Ticker, opsional dengan awalan '<jenis pasar>:'")
+    parser.add_argument("--market", default="Crypto", choices=MARKET_TYPES, help="jenis pasar default")
+    parser.add_argument("--interval", default="1h")
+    parser.add_argument("--period", default="2y")
+    parser.add_argument("--store-dir", help="folder cache candle lokal")
+    parser.add_argument("--fake", action="store_true", help="pakai data sintetis (offline)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    from fetch_service import FetchService
+    from ohlcv_store import FakeFetcher, OHLCVStore, YahooFetcher, store_root
+    from symbol_index import default_index
+    from trading_cli import parse_ticker
+
+    fetcher = FakeFetcher() if args.fake else FetchService(YahooFetcher())
+    store = OHLCVStore(root=store_root(args.store_dir, args.fake), fetcher=fetcher)
+    symbols = default_index()
+
+    status = 0
+    for raw in args.tickers:
+        resolution = symbols.resolve(*parse_ticker(raw, args.market))
+        if not resolution.ok:
+            print(resolution.message(), file=sys.stderr)
+            status = 1
+            continue
+        data = store.get(resolution.yahoo, args.period, args.interval)
+        span = f"{data.index[0]} .. {data.index[-1]}" if len(data) else "-"
+        print(f"{resolution.yahoo} {args.interval}: {len(data)} bar ({span})")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
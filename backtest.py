@@ -0,0 +1,299 @@
+"""
+Backtest aturan generate_smart_signal pada seluruh histori.
+
+Sinyal dievaluasi untuk semua bar sekaligus (signal_rules), lalu setiap
+sinyal BUY/SELL disimulasikan sebagai entry di harga Close bar sinyal
+dengan SL/TP seperti compute_position_sizing: SL = stop % dari entry,
+TP = RR x jarak SL (default 1:2). Mencari bar keluar juga dilakukan dengan
+operasi array per blok bar, bukan loop per baris, sehingga ratusan ribu
+candle tetap selesai dalam hitungan milidetik.
+
+Asumsi simulasi:
+- hanya satu posisi terbuka; sinyal saat posisi masih jalan diabaikan
+- jika SL dan TP tersentuh di candle yang sama, dianggap kena SL dulu
+- gap melewati SL diisi di harga Open (lebih buruk dari SL)
+- posisi yang belum kena SL/TP ditutup di Close bar terakhir
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from scanner import ema_2d, rsi_2d
+from signal_rules import (
+    CODE_BUY,
+    CODE_DATA_KURANG,
+    CODE_SELL,
+    MIN_SIGNAL_BARS,
+    evaluate_signal_codes,
+)
+
+EXIT_STOP = -1
+EXIT_END = 0
+EXIT_TARGET = 1
+
+_EXIT_LABELS = {EXIT_STOP: "SL", EXIT_END: "Akhir data", EXIT_TARGET: "TP"}
+
+
+@dataclass
+class BacktestResult:
+    trades: pd.DataFrame   # satu baris per trade
+    equity: pd.Series      # equity per bar (berubah saat trade ditutup)
+    stats: dict            # ringkasan: win rate, return, drawdown, dll.
+
+
+def signal_codes(
+    df: pd.DataFrame,
+    rsi_period: int = 14,
+    fast: int = 10,
+    slow: int = 20,
+    trend_fast: int = 50,
+    trend_slow: int = 200,
+    buy_band=(45, 80),
+    sell_band=(20, 55),
+):
+    """
+    Kode sinyal untuk setiap bar dari frame OHLCV mentah (tanpa kolom EMA).
+    Bar sebelum indikator + 60 bar data siap diberi kode DATA KURANG,
+    sama seperti cek panjang data di generate_smart_signal.
+    Parameter default = aturan generate_smart_signal; dipakai untuk
+    parameter selain default (Mode 1 memakai trading_core.signal_timeline).
+    """
+    close = df["Close"].to_numpy(dtype=np.float64)
+    closes = close[:, None]
+    emas = {span: ema_2d(closes, span)[:, 0] for span in {fast, slow, trend_fast, trend_slow}}
+    rsi = rsi_2d(closes, np.array([len(close)]), period=rsi_period)[:, 0]
+
+    codes = evaluate_signal_codes(
+        close, emas[fast], emas[slow], emas[trend_fast], emas[trend_slow], rsi,
+        buy_band=buy_band, sell_band=sell_band,
+    )
+    codes[: warmup_bars(rsi_period)] = CODE_DATA_KURANG
+    return codes
+
+
+def warmup_bars(rsi_period: int = 14) -> int:
+    """Jumlah bar awal yang belum bisa memberi sinyal (warm-up RSI + 60 bar)."""
+    return (rsi_period - 1) + MIN_SIGNAL_BARS - 1
+
+
+def _first_exit(open_, high, low, entry_idx, sl, tp, is_long, block=256):
+    """
+    Cari bar pertama setelah entry yang menyentuh SL atau TP untuk semua
+    kandidat trade sekaligus. Setiap putaran memeriksa satu blok bar ke
+    depan untuk semua kandidat yang belum selesai; ukuran blok digandakan
+    tiap putaran supaya trade yang panjang tetap butuh sedikit putaran.
+    """
+    n = len(high)
+    m = len(entry_idx)
+    exit_idx = np.full(m, n - 1, dtype=np.int64)
+    exit_kind = np.full(m, EXIT_END, dtype=np.int8)
+
+    pending = np.arange(m)
+    offset = 1
+    while pending.size:
+        starts = entry_idx[pending] + offset
+        alive = starts < n
+        pending, starts = pending[alive], starts[alive]
+        if not pending.size:
+            break
+
+        cols = np.arange(block)
+        idx = starts[:, None] + cols[None, :]
+        in_range = idx < n
+        idx = np.minimum(idx, n - 1)
+
+        h = high[idx]
+        lo = low[idx]
+        lng = is_long[pending][:, None]
+        s = sl[pending][:, None]
+        t = tp[pending][:, None]
+
+        stop_hit = np.where(lng, lo <= s, h >= s) & in_range
+        target_hit = np.where(lng, h >= t, lo <= t) & in_range
+        hit = stop_hit | target_hit
+
+        done = hit.any(axis=1)
+        first = hit.argmax(axis=1)
+
+        rows = np.nonzero(done)[0]
+        exit_idx[pending[rows]] = starts[rows] + first[rows]
+        exit_kind[pending[rows]] = np.where(stop_hit[rows, first[rows]], EXIT_STOP, EXIT_TARGET)
+
+        pending = pending[~done]
+        offset += block
+        block = min(block * 2, 1 << 14)
+
+    return exit_idx, exit_kind
+
+
+def simulate(
+    open_,
+    high,
+    low,
+    close,
+    codes,
+    stop_pct: float,
+    rr: float = 2.0,
+    balance: float = 1000.0,
+    risk_pct: float = 1.0,
+    allow_short: bool = True,
+    compound: bool = True,
+):
+    """
+    Inti simulasi pada array numpy (tanpa DataFrame), dipakai juga oleh
+    optimizer. Return (trades, equity, stats): ``trades`` berupa dict array
+    per trade, ``equity`` array per bar.
+    """
+    codes = np.asarray(codes)
+    n = len(close)
+
+    wanted = (codes == CODE_BUY) | ((codes == CODE_SELL) if allow_short else False)
+    entry_idx = np.nonzero(wanted)[0]
+    # sinyal di bar terakhir belum bisa disimulasikan
+    entry_idx = entry_idx[entry_idx < n - 1]
+
+    is_long = codes[entry_idx] == CODE_BUY
+    entry = close[entry_idx]
+    direction = np.where(is_long, 1.0, -1.0)
+    stop_dist = entry * (stop_pct / 100.0)
+    sl = entry - direction * stop_dist
+    tp = entry + direction * stop_dist * rr
+
+    exit_idx, exit_kind = _first_exit(open_, high, low, entry_idx, sl, tp, is_long)
+
+    # hanya satu posisi: lompat ke kandidat pertama setelah trade sebelumnya ditutup
+    # (loop ini per trade, bukan per bar)
+    next_cand = np.searchsorted(entry_idx, exit_idx, side="right")
+    taken = []
+    k = 0
+    while k < len(entry_idx):
+        taken.append(k)
+        k = next_cand[k]
+    taken = np.asarray(taken, dtype=np.int64)
+
+    entry_idx, exit_idx, exit_kind = entry_idx[taken], exit_idx[taken], exit_kind[taken]
+    is_long, entry, direction = is_long[taken], entry[taken], direction[taken]
+    stop_dist, sl, tp = stop_dist[taken], sl[taken], tp[taken]
+
+    exit_open = open_[exit_idx]
+    stop_fill = np.where(is_long, np.minimum(sl, exit_open), np.maximum(sl, exit_open))
+    exit_price = np.select(
+        [exit_kind == EXIT_STOP, exit_kind == EXIT_TARGET],
+        [stop_fill, tp],
+        default=close[exit_idx],
+    )
+
+    r_multiple = direction * (exit_price - entry) / stop_dist
+    risk_frac = risk_pct / 100.0
+    if compound:
+        equity_after = balance * np.cumprod(1.0 + risk_frac * r_multiple)
+    else:
+        equity_after = balance + np.cumsum(balance * risk_frac * r_multiple)
+    equity_before = np.concatenate([[balance], equity_after[:-1]])
+    risk_amount = (equity_before if compound else balance) * risk_frac
+    pnl = equity_after - equity_before
+
+    # equity per bar: nilai setelah trade terakhir yang sudah ditutup
+    closed_count = np.searchsorted(exit_idx, np.arange(n), side="right")
+    equity = np.concatenate([[balance], equity_after])[closed_count]
+    peak = np.maximum.accumulate(equity)
+    drawdown = 1.0 - equity / peak
+
+    trades = {
+        "entry_idx": entry_idx,
+        "exit_idx": exit_idx,
+        "exit_kind": exit_kind,
+        "is_long": is_long,
+        "entry": entry,
+        "sl": sl,
+        "tp": tp,
+        "qty": risk_amount / stop_dist,
+        "exit_price": exit_price,
+        "r_multiple": r_multiple,
+        "pnl": pnl,
+        "equity_after": equity_after,
+    }
+
+    wins = r_multiple > 0
+    gross_win = pnl[wins].sum()
+    gross_loss = -pnl[~wins].sum()
+    stats = {
+        "trades": int(len(taken)),
+        "wins": int(wins.sum()),
+        "win_rate": float(wins.mean()) if len(taken) else float("nan"),
+        "total_return_pct": float((equity[-1] / balance - 1) * 100) if n else 0.0,
+        "max_drawdown_pct": float(drawdown.max() * 100) if n else 0.0,
+        "profit_factor": float(gross_win / gross_loss) if gross_loss > 0 else float("inf"),
+        "avg_r": float(r_multiple.mean()) if len(taken) else float("nan"),
+        "final_equity": float(equity[-1]) if n else balance,
+    }
+    return trades, equity, stats
+
+
+def backtest_signals(
+    df: pd.DataFrame,
+    codes,
+    stop_pct: float,
+    rr: float = 2.0,
+    balance: float = 1000.0,
+    risk_pct: float = 1.0,
+    allow_short: bool = True,
+    compound: bool = True,
+) -> BacktestResult:
+    """Simulasikan trade dari kode sinyal per bar pada frame OHLC ``df``."""
+    t, equity, stats = simulate(
+        df["Open"].to_numpy(dtype=np.float64),
+        df["High"].to_numpy(dtype=np.float64),
+        df["Low"].to_numpy(dtype=np.float64),
+        df["Close"].to_numpy(dtype=np.float64),
+        codes,
+        stop_pct,
+        rr=rr,
+        balance=balance,
+        risk_pct=risk_pct,
+        allow_short=allow_short,
+        compound=compound,
+    )
+
+    index = df.index
+    trades = pd.DataFrame({
+        "Waktu entry": index[t["entry_idx"]],
+        "Arah": np.where(t["is_long"], "BUY", "SELL"),
+        "Entry": t["entry"],
+        "SL": t["sl"],
+        "TP": t["tp"],
+        "Qty": t["qty"],
+        "Waktu exit": index[t["exit_idx"]],
+        "Exit": t["exit_price"],
+        "Keluar karena": [_EXIT_LABELS[int(k)] for k in t["exit_kind"]],
+        "R": t["r_multiple"],
+        "PnL": t["pnl"],
+        "Equity": t["equity_after"],
+    })
+    return BacktestResult(trades=trades, equity=pd.Series(equity, index=index, name="Equity"), stats=stats)
+
+
+def run_backtest(
+    df: pd.DataFrame,
+    stop_pct: float,
+    rr: float = 2.0,
+    balance: float = 1000.0,
+    risk_pct: float = 1.0,
+    allow_short: bool = True,
+    compound: bool = True,
+) -> BacktestResult:
+    """
+    Hitung indikator + kode sinyal lewat pipeline Mode 1
+    (trading_core.analyze_frame + signal_timeline), lalu jalankan simulasi
+    pada frame mulai bar warm-up. Pemanggil yang sudah punya ``data_ind``
+    dan kodenya cukup memanggil backtest_signals langsung.
+    """
+    from trading_core import analyze_frame, signal_timeline
+
+    data_ind, _, _ = analyze_frame(df)
+    codes = signal_timeline(data_ind) if not data_ind.empty else np.empty(0, dtype=np.int8)
+    return backtest_signals(
+        data_ind, codes, stop_pct, rr=rr, balance=balance, risk_pct=risk_pct,
+        allow_short=allow_short, compound=compound,
+    )
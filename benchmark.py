@@ -0,0 +1,280 @@
+"""
+Benchmark jalur panas: indikator, sinyal, sizing, dan pipeline Mode 1.
+
+Data OHLCV sintetis (1e3 s/d 1e7 baris) dibuat sekali per ukuran, lalu
+setiap fungsi diukur:
+- waktu      : terbaik dari beberapa ulangan (detik) + throughput baris/detik
+- memori     : puncak alokasi Python/numpy selama satu panggilan (tracemalloc)
+- scaling    : eksponen log-log waktu terhadap jumlah baris (1.0 = linear)
+
+Baseline disimpan sebagai JSON; dengan ``--check`` setiap hasil yang lebih
+lambat dari baseline x (1 + threshold) ditandai dan exit code menjadi 1.
+
+Contoh:
+    python benchmark.py                                   # 1e3..1e6 baris
+    python benchmark.py --sizes 1e3,1e5,1e7 --only compute_rsi,compute_emas
+    python benchmark.py --save-baseline benchmark_baseline.json
+    python benchmark.py --check benchmark_baseline.json --threshold 0.3
+"""
+import argparse
+import atexit
+import json
+import math
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+# batas ukuran untuk pipeline end-to-end (store sintetis 1 menit, periode 10y)
+_E2E_MAX_ROWS = 5_000_000
+
+# interval yang dipakai saat menyimpan frame sintetis e2e: tanpa jendela
+# backfill, jadi store selalu lewat jalur satu request (spasi bar sintetis
+# tidak diperiksa store)
+_E2E_INTERVAL = "1d"
+
+
+def synthetic_ohlcv(n: int, seed: int = 7, freq: str = "15min", end=None) -> pd.DataFrame:
+    """Random walk OHLCV sebanyak ``n`` bar, berakhir di ``end`` (default: sekarang)."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, n)))
+    spread = np.abs(rng.normal(0, 0.001, n)) * close
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    end = pd.Timestamp.now(tz="UTC").floor(freq) if end is None else end
+    index = pd.date_range(end=end, periods=n, freq=freq)
+    return pd.DataFrame(
+        {
+            "Open": open_,
+            "High": np.maximum(open_, close) + spread,
+            "Low": np.minimum(open_, close) - spread,
+            "Close": close,
+            "Volume": rng.integers(1_000, 10_000, n),
+        },
+        index=index,
+    )
+
+
+class _FrameFetcher:
+    """Fetcher palsu yang mengembalikan frame sintetis yang sudah disiapkan."""
+
+    def __init__(self, frame):
+        self.frame = frame
+
+    def fetch(self, ticker, interval, period=None, start=None, end=None):
+        frame = self.frame
+        if start is not None:
+            frame = frame[frame.index >= pd.Timestamp(start)]
+        if end is not None:
+            frame = frame[frame.index < pd.Timestamp(end)]
+        return frame
+
+
+# =========================
+# KASUS BENCHMARK
+# =========================
+def _cases():
+    """{nama: setup(df) -> fungsi tanpa argumen yang diukur}."""
+    from backtest import signal_codes
+    from trading_core import (
+        analyze_frame,
+        compute_emas,
+        compute_position_sizing,
+        compute_rsi,
+        generate_smart_signal,
+    )
+
+    def bench_rsi(df):
+        close = df["Close"]
+        return lambda: compute_rsi(close, period=14)
+
+    def bench_emas(df):
+        base = df[["Open", "High", "Low", "Close", "Volume"]]
+        return lambda: compute_emas(base.copy())
+
+    def bench_signal(df):
+        data_ind, _, _ = analyze_frame(df.copy())
+        return lambda: generate_smart_signal(data_ind)
+
+    def bench_signal_all_bars(df):
+        return lambda: signal_codes(df)
+
+    def bench_sizing(df):
+        prices = df["Close"].to_numpy()[:1000].tolist()
+        return lambda: [compute_position_sizing(1000.0, 1.5, 2.0, p) for p in prices]
+
+    def bench_pipeline(df, dtype=None):
+        return lambda: analyze_frame(df, dtype=dtype)
+
+    def bench_e2e(df, warm):
+        from ohlcv_store import OHLCVStore
+
+        fetcher = _FrameFetcher(synthetic_ohlcv(len(df), freq="1min"))
+
+        def analyze(store):
+            data = store.get("BENCH", "10y", _E2E_INTERVAL)
+            data_ind, _, _ = analyze_frame(data)
+            compute_position_sizing(1000.0, 1.5, 2.0, float(data_ind["Close"].iloc[-1]))
+
+        if warm:
+            # store sudah terisi: request berulang dijawab dari disk
+            root = tempfile.mkdtemp(prefix="bench_store_")
+            atexit.register(shutil.rmtree, root, ignore_errors=True)
+            store = OHLCVStore(root, fetcher=fetcher, max_age=3600)
+            store.get("BENCH", "10y", _E2E_INTERVAL)
+            return lambda: analyze(store)
+
+        def cold():
+            root = tempfile.mkdtemp(prefix="bench_store_")
+            try:
+                analyze(OHLCVStore(root, fetcher=fetcher))
+            finally:
+                shutil.rmtree(root, ignore_errors=True)
+        return cold
+
+    return {
+        "compute_rsi": bench_rsi,
+        "compute_emas": bench_emas,
+        "generate_smart_signal": bench_signal,
+        "signal_codes_all_bars": bench_signal_all_bars,
+        "compute_position_sizing_x1000": bench_sizing,
+        "mode1_indicators_signal": bench_pipeline,
+        "mode1_indicators_signal_f32": lambda df: bench_pipeline(df, dtype="float32"),
+        "mode1_e2e_cold": lambda df: bench_e2e(df, warm=False),
+        "mode1_e2e_warm": lambda df: bench_e2e(df, warm=True),
+    }
+
+
+def _time_best(fn, min_total: float = 0.2, max_repeat: int = 20) -> float:
+    """Waktu terbaik dari beberapa ulangan (seperti timeit)."""
+    fn()  # pemanasan
+    best, total, repeat = math.inf, 0.0, 0
+    while repeat < max_repeat and (repeat < 3 or total < min_total):
+        t0 = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - t0
+        best = min(best, elapsed)
+        total += elapsed
+        repeat += 1
+    return best
+
+
+def _peak_memory(fn) -> int:
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, only=None, measure_memory: bool = True):
+    """Return list dict: name, rows, seconds, rows_per_sec, peak_mb."""
+    cases = _cases()
+    if only:
+        cases = {k: v for k, v in cases.items() if k in only}
+
+    results = []
+    for n in sizes:
+        df = synthetic_ohlcv(n)
+        for name, setup in cases.items():
+            if name.startswith("mode1_e2e") and n > _E2E_MAX_ROWS:
+                continue
+            fn = setup(df)
+            seconds = _time_best(fn)
+            results.append({
+                "name": name,
+                "rows": n,
+                "seconds": seconds,
+                "rows_per_sec": n / seconds if seconds > 0 else math.inf,
+                "peak_mb": _peak_memory(fn) / 1e6 if measure_memory else None,
+            })
+    return results
+
+
+def scaling_exponents(results):
+    """Eksponen log-log waktu vs baris per fungsi (butuh >= 2 ukuran)."""
+    df = pd.DataFrame(results)
+    out = {}
+    for name, group in df.groupby("name"):
+        group = group[group["seconds"] > 0]
+        if len(group) >= 2:
+            slope = np.polyfit(np.log(group["rows"]), np.log(group["seconds"]), 1)[0]
+            out[name] = float(slope)
+    return out
+
+
+def compare_with_baseline(results, baseline: dict, threshold: float):
+    """List regresi: hasil yang lebih lambat dari baseline x (1 + threshold)."""
+    regressions = []
+    for r in results:
+        ref = baseline.get(r["name"], {}).get(str(r["rows"]))
+        if ref and r["seconds"] > ref * (1 + threshold):
+            regressions.append(dict(r, baseline=ref, slowdown=r["seconds"] / ref))
+    return regressions
+
+
+def results_to_baseline(results) -> dict:
+    baseline = {}
+    for r in results:
+        baseline.setdefault(r["name"], {})[str(r["rows"])] = r["seconds"]
+    return baseline
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark indikator, sinyal, sizing & pipeline Mode 1.")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="jumlah baris, dipisah koma (mis. 1e3,1e5,1e7)")
+    parser.add_argument("--only", help="nama benchmark, dipisah koma")
+    parser.add_argument("--no-memory", action="store_true", help="lewati pengukuran memori")
+    parser.add_argument("--save-baseline", metavar="PATH", help="simpan hasil sebagai baseline JSON")
+    parser.add_argument("--check", metavar="PATH", help="bandingkan dengan baseline JSON")
+    parser.add_argument("--threshold", type=float, default=0.25, help="batas perlambatan (0.25 = 25%%)")
+    parser.add_argument("--json", metavar="PATH", help="simpan hasil mentah ke JSON")
+    args = parser.parse_args(argv)
+
+    sizes = [int(float(s)) for s in args.sizes.split(",") if s]
+    only = set(args.only.split(",")) if args.only else None
+    results = run_benchmarks(sizes, only=only, measure_memory=not args.no_memory)
+
+    table = pd.DataFrame(results)
+    with pd.option_context("display.width", 160, "display.float_format", "{:,.6g}".format):
+        print(table.to_string(index=False))
+
+    exponents = scaling_exponents(results)
+    if exponents:
+        print("\nScaling (eksponen log-log, 1.0 = linear):")
+        for name, slope in exponents.items():
+            print(f"  {name:32s} {slope:5.2f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"results": results, "scaling": exponents}, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(results_to_baseline(results), f, indent=2, sort_keys=True)
+        print(f"\nBaseline disimpan ke {args.save_baseline}")
+
+    if args.check:
+        with open(args.check, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(results, baseline, args.threshold)
+        if regressions:
+            print(f"\nREGRESI (> {args.threshold:.0%} lebih lambat dari baseline):")
+            for r in regressions:
+                print(f"  {r['name']} @ {r['rows']:,} baris: {r['seconds']:.6f}s "
+                      f"vs {r['baseline']:.6f}s ({r['slowdown']:.2f}x)")
+            return 1
+        print("\nTidak ada regresi terhadap baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
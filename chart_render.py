@@ -0,0 +1,176 @@
+"""
+Render grafik untuk seri panjang: payload ke browser dibatasi sesuai
+lebar tampilan, bukan jumlah baris data.
+
+- Candle diagregasi per kelompok bar (open pertama, high tertinggi,
+  low terendah, close terakhir) sampai muat di ``max_bars``.
+- Garis EMA / RSI diturunkan resolusinya dengan LTTB (Largest Triangle
+  Three Buckets) yang menjaga bentuk puncak & lembah.
+- Garis memakai trace WebGL (Scattergl).
+- Penanda sinyal BUY/SELL (opsional) diletakkan di waktu bar aslinya,
+  jadi tetap tepat walaupun candle-nya diagregasi.
+
+Detail penuh muncul otomatis ketika rentang yang ditampilkan berisi
+lebih sedikit bar daripada anggaran titik (lihat ``visible_window``).
+"""
+import numpy as np
+import pandas as pd
+
+from signal_rules import CODE_BUY, CODE_SELL
+
+# anggaran titik default: kira-kira lebar grafik dalam piksel
+DEFAULT_MAX_BARS = 1200
+DEFAULT_MAX_POINTS = 2000
+
+# indikator yang dibutuhkan panel grafik (lihat indicators.py)
+CHART_EMA_COLUMNS = ("EMA20", "EMA50", "EMA200")
+CHART_INDICATORS = CHART_EMA_COLUMNS + ("RSI",)
+
+
+def visible_window(index: pd.Index, start=None, end=None):
+    """Posisi (awal, akhir) baris di dalam rentang waktu [start, end]."""
+    lo = 0 if start is None else int(index.searchsorted(start, side="left"))
+    hi = len(index) if end is None else int(index.searchsorted(end, side="right"))
+    return lo, hi
+
+
+def aggregate_ohlc(df: pd.DataFrame, max_bars: int = DEFAULT_MAX_BARS) -> pd.DataFrame:
+    """
+    Gabungkan candle berurutan sampai jumlahnya <= ``max_bars``.
+    Waktu tiap candle gabungan = waktu bar pertamanya.
+    """
+    n = len(df)
+    if n <= max_bars:
+        return df[["Open", "High", "Low", "Close"]]
+
+    size = -(-n // max_bars)
+    starts = np.arange(0, n, size)
+    ends = np.minimum(starts + size, n) - 1
+
+    return pd.DataFrame(
+        {
+            "Open": df["Open"].to_numpy()[starts],
+            "High": np.maximum.reduceat(df["High"].to_numpy(), starts),
+            "Low": np.minimum.reduceat(df["Low"].to_numpy(), starts),
+            "Close": df["Close"].to_numpy()[ends],
+        },
+        index=df.index[starts],
+    )
+
+
+def lttb_indices(y, n_out: int):
+    """
+    Indeks titik hasil LTTB untuk seri ``y`` (x = posisi bar).
+    Titik pertama & terakhir selalu dipertahankan.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # batas bucket untuk titik tengah (tanpa titik pertama & terakhir)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    x = np.arange(n, dtype=np.float64)
+
+    # rata-rata tiap bucket [edges[i], edges[i+1]) (titik C untuk bucket
+    # sebelumnya); reduceat atas seri tanpa titik terakhir supaya segmen
+    # terakhir berhenti di n-2, lalu titik terakhir seri ditambahkan
+    counts = np.diff(edges)
+    mean_x = np.append(np.add.reduceat(x[:-1], edges[:-1]) / counts, x[-1])
+    y_filled = np.where(np.isnan(y), np.nanmean(y), y)
+    mean_y = np.append(np.add.reduceat(y_filled[:-1], edges[:-1]) / counts, y_filled[-1])
+
+    out = np.empty(n_out, dtype=np.int64)
+    out[0] = 0
+    out[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        cx, cy = mean_x[i + 1], mean_y[i + 1]
+        area = np.abs((x[a] - cx) * (y_filled[lo:hi] - y_filled[a]) - (x[a] - x[lo:hi]) * (cy - y_filled[a]))
+        a = lo + int(area.argmax())
+        out[i + 1] = a
+    return out
+
+
+def downsample_series(series: pd.Series, max_points: int = DEFAULT_MAX_POINTS) -> pd.Series:
+    """Seri yang diturunkan resolusinya dengan LTTB (untuk RSI / equity)."""
+    if len(series) <= max_points:
+        return series
+    return series.iloc[lttb_indices(series.to_numpy(), max_points)]
+
+
+def build_price_figure(
+    df: pd.DataFrame,
+    ema_columns=CHART_EMA_COLUMNS,
+    max_bars: int = DEFAULT_MAX_BARS,
+    max_points: int = DEFAULT_MAX_POINTS,
+    height: int = 400,
+    codes=None,
+):
+    """
+    Candlestick teragregasi + garis EMA (Scattergl, LTTB) dari frame indikator.
+    ``codes`` (opsional) = kode sinyal per bar ``df`` (signal_rules) untuk
+    penanda BUY di bawah Low dan SELL di atas High.
+    """
+    import plotly.graph_objects as go
+
+    candles = aggregate_ohlc(df, max_bars)
+
+    fig = go.Figure()
+    fig.add_trace(go.Candlestick(
+        x=candles.index,
+        open=candles["Open"],
+        high=candles["High"],
+        low=candles["Low"],
+        close=candles["Close"],
+        name="Harga"
+    ))
+    for col in ema_columns:
+        line = downsample_series(df[col], max_points)
+        fig.add_trace(go.Scattergl(
+            x=line.index,
+            y=line.to_numpy(),
+            mode="lines",
+            name=col
+        ))
+    if codes is not None:
+        codes = np.asarray(codes)
+        for code, price_col, symbol, color, label in (
+            (CODE_BUY, "Low", "triangle-up", "#26a69a", "BUY"),
+            (CODE_SELL, "High", "triangle-down", "#ef5350", "SELL"),
+        ):
+            idx = np.flatnonzero(codes == code)
+            if not len(idx):
+                continue
+            fig.add_trace(go.Scattergl(
+                x=df.index[idx],
+                y=df[price_col].to_numpy()[idx],
+                mode="markers",
+                marker=dict(symbol=symbol, size=10, color=color),
+                name=f"Sinyal {label}"
+            ))
+    fig.update_layout(
+        xaxis_title="Tanggal",
+        yaxis_title="Harga",
+        xaxis_rangeslider_visible=False,
+        height=height,
+    )
+    return fig
+
+
+def build_correlation_figure(corr: pd.DataFrame, height: int = 450):
+    """Heatmap matriks korelasi (-1 s/d 1)."""
+    import plotly.graph_objects as go
+
+    fig = go.Figure(go.Heatmap(
+        z=corr.to_numpy(),
+        x=list(corr.columns),
+        y=list(corr.index),
+        zmin=-1,
+        zmax=1,
+        colorscale="RdBu",
+        reversescale=True,
+    ))
+    fig.update_layout(height=height, yaxis_autorange="reversed")
+    return fig
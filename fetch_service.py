@@ -0,0 +1,145 @@
+"""
+Layanan fetch bersama di atas fetcher mana pun (YahooFetcher / FakeFetcher):
+
+- concurrency : request dijalankan di thread pool, bukan di thread skrip
+- rate limit  : token bucket global untuk semua sesi
+- retry       : backoff eksponensial + jitter untuk error sementara; hasil
+                kosong juga dicoba ulang karena yf.download tidak raise
+                saat HTTP error / rate limit, hanya mengembalikan frame
+                kosong (setelah retry habis, hasil kosong dikembalikan)
+- timeout     : batas waktu tunggu per request
+- coalescing  : request identik (ticker, interval, period/start/end) yang
+                sedang berjalan digabung jadi satu panggilan upstream
+
+FetchService sendiri memenuhi antarmuka fetcher (``fetch`` / ``fetch_many``)
+sehingga bisa langsung dipasang ke OHLCVStore:
+    store = OHLCVStore(fetcher=FetchService(YahooFetcher()))
+"""
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+
+
+class FetchTimeout(Exception):
+    """Request ke upstream melewati batas waktu."""
+
+
+def _is_empty(result) -> bool:
+    """Frame kosong, atau hasil fetch_many yang semua frame-nya kosong."""
+    if isinstance(result, dict):
+        return bool(result) and all(frame.empty for frame in result.values())
+    return result.empty
+
+
+class RateLimiter:
+    """Token bucket thread-safe: ``rate`` request/detik, ledakan maks. ``burst``."""
+
+    def __init__(self, rate: float, burst: int = 1, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = float(burst)
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = self.clock()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_for = (1 - self._tokens) / self.rate
+            self.sleep(wait_for)
+
+
+class FetchService:
+    """Fetcher bersama dengan rate limit, retry, timeout, dan request coalescing."""
+
+    def __init__(
+        self,
+        fetcher,
+        max_workers: int = 8,
+        rate: float = 4.0,
+        burst: int = 4,
+        retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 8.0,
+        timeout: float = 30.0,
+        sleep=time.sleep,
+    ):
+        self.fetcher = fetcher
+        self.limiter = RateLimiter(rate, burst, sleep=sleep)
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.sleep = sleep
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetch")
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.upstream_calls = 0
+
+    # ---------- inti ----------
+    def _call(self, method, args, kwargs):
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            try:
+                with self._lock:
+                    self.upstream_calls += 1
+                result = getattr(self.fetcher, method)(*args, **kwargs)
+            except Exception:
+                if attempt >= self.retries:
+                    raise
+            else:
+                if attempt >= self.retries or not _is_empty(result):
+                    return result
+            attempt += 1
+            delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+            self.sleep(delay * (0.5 + random.random() / 2))
+
+    def _done(self, key, future):
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def _submit(self, method, *args, **kwargs) -> Future:
+        key = (method, args, tuple(sorted(kwargs.items())))
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future
+            future = self._pool.submit(self._call, method, args, kwargs)
+            self._inflight[key] = future
+        future.add_done_callback(lambda f, k=key: self._done(k, f))
+        return future
+
+    def _result(self, future):
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError as exc:
+            raise FetchTimeout(f"Request melewati {self.timeout:g} detik.") from exc
+
+    # ---------- antarmuka fetcher ----------
+    def submit(self, ticker, interval, period=None, start=None, end=None) -> Future:
+        """Versi non-blocking dari ``fetch``; request identik berbagi Future yang sama."""
+        return self._submit("fetch", ticker, interval, period=period, start=start, end=end)
+
+    def fetch(self, ticker, interval, period=None, start=None, end=None):
+        return self._result(self.submit(ticker, interval, period=period, start=start, end=end))
+
+    def fetch_many(self, tickers, interval, period):
+        """
+        Satu panggilan batch ``fetch_many`` ke upstream; watchlist identik
+        yang diminta bersamaan oleh beberapa sesi ikut digabung.
+        """
+        tickers = tuple(dict.fromkeys(tickers))
+        return self._result(self._submit("fetch_many", tickers, interval, period))
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,139 @@
+"""
+Pipeline gambar hemat memori untuk mode screenshot TradingView.
+
+- Kunci     : hash isi file (blake2b), jadi upload ulang file yang sama
+              (atau sesi lain dengan gambar yang sama) memakai cache.
+- Decode    : langsung diperkecil. JPEG memakai ``draft`` (decoder DCT
+              membaca di skala 1/2, 1/4, 1/8), format lain memakai
+              ``reduce`` sebelum resample akhir, jadi bitmap resolusi
+              penuh 4K / multi-monitor tidak perlu diresample penuh.
+- Thumbnail : di-encode ulang (JPEG, atau PNG jika ada transparansi) dan
+              disimpan di ThumbnailCache, LRU yang dibatasi total byte.
+- Asli      : tidak di-decode di server; byte file asli tetap dipegang
+              pemanggil (mis. widget upload) dan dikirim apa adanya hanya
+              saat diminta.
+
+Modul ini hanya butuh Pillow.
+"""
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+DEFAULT_MAX_SIDE = 1600                 # cukup untuk lebar kolom utama Streamlit
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+JPEG_QUALITY = 85
+
+
+@dataclass(frozen=True)
+class Thumbnail:
+    key: str
+    data: bytes              # gambar siap tampil (ter-encode)
+    mime: str
+    size: tuple              # (lebar, tinggi) thumbnail
+    original_size: tuple     # (lebar, tinggi) file asli
+    original_format: str
+    original_bytes: int
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.data)
+
+
+def content_key(data: bytes) -> str:
+    """Hash isi file sebagai kunci cache."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def decode_downscaled(data: bytes, max_side: int = DEFAULT_MAX_SIDE):
+    """
+    Decode ``data`` dengan sisi terpanjang <= ``max_side``. Return
+    (gambar, ukuran asli, format asli).
+    """
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(data))
+    original_size, original_format = image.size, image.format or "?"
+    target = (max_side, max_side)
+
+    # JPEG: decoder memilih skala 1/2..1/8 terbesar yang masih >= target
+    image.draft("RGB", target)
+    # format lain: reduce (rata-rata blok, murah) sampai <= 2x target, lalu LANCZOS
+    image.thumbnail(target, Image.Resampling.LANCZOS, reducing_gap=2.0)
+    return image, original_size, original_format
+
+
+def encode_image(image, quality: int = JPEG_QUALITY):
+    """Encode thumbnail -> (bytes, mime). Gambar dengan transparansi tetap PNG."""
+    out = io.BytesIO()
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        image.save(out, format="PNG", optimize=True)
+        return out.getvalue(), "image/png"
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    image.save(out, format="JPEG", quality=quality, optimize=True)
+    return out.getvalue(), "image/jpeg"
+
+
+def make_thumbnail(data: bytes, max_side: int = DEFAULT_MAX_SIDE, key=None) -> Thumbnail:
+    """Thumbnail dari byte file gambar (tanpa cache)."""
+    image, original_size, original_format = decode_downscaled(data, max_side)
+    encoded, mime = encode_image(image)
+    return Thumbnail(
+        key=key or content_key(data),
+        data=encoded,
+        mime=mime,
+        size=image.size,
+        original_size=original_size,
+        original_format=original_format,
+        original_bytes=len(data),
+    )
+
+
+class ThumbnailCache:
+    """
+    LRU thread-safe untuk Thumbnail, dibatasi total byte hasil encode.
+    Kunci = (hash isi, max_side). ``get`` hanya memanggil ``load()``
+    (byte file asli) saat cache miss.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, load, max_side: int = DEFAULT_MAX_SIDE) -> Thumbnail:
+        cache_key = (key, max_side)
+        with self._lock:
+            thumb = self._items.get(cache_key)
+            if thumb is not None:
+                self._items.move_to_end(cache_key)
+                self.hits += 1
+                return thumb
+            self.misses += 1
+
+        # decode di luar lock supaya sesi lain tidak menunggu
+        thumb = make_thumbnail(load(), max_side=max_side, key=key)
+        with self._lock:
+            old = self._items.pop(cache_key, None)
+            if old is not None:
+                self.nbytes -= old.nbytes
+            if thumb.nbytes <= self.max_bytes:
+                self._items[cache_key] = thumb
+                self.nbytes += thumb.nbytes
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+        return thumb
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.nbytes = 0
+
+    def __len__(self):
+        return len(self._items)
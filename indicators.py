@@ -0,0 +1,207 @@
+"""
+Registry indikator: dihitung malas (hanya saat diminta), sadar dependensi,
+dan di-memo.
+
+Setiap indikator didaftarkan sekali lewat ``register`` (jenis, parameter
+default, dependensi, fungsi hitung). Panel cukup menyebut kolom yang
+dibutuhkan, mis. trading_core.SIGNAL_INDICATORS, SUMMARY_INDICATORS, dan
+chart_render.CHART_INDICATORS; hanya kolom itu beserta dependensinya yang
+dihitung.
+
+- Nama      : "<JENIS><parameter>", mis. "EMA20", "RSI" (= RSI14), "RSI7".
+              Jenis berhuruf kecil ("close") adalah hasil antara yang
+              dipakai bersama oleh indikator lain, bukan kolom frame.
+- Memo      : LazyIndicators menyimpan setiap hasil (termasuk hasil antara)
+              per frame; dengan IndicatorCache hasil juga dipakai ulang
+              lintas panel / rerun dengan kunci (versi data, dtype, jenis,
+              parameter).
+- Versi data: data_version(frame) = panjang, waktu bar pertama/terakhir,
+              dan hash blake2b seluruh kolom Close (indikator hanya
+              bergantung pada Close), jadi dua ticker dengan kalender dan
+              harga ujung yang sama tidak berbagi hasil. Pemanggil boleh
+              memberi ``version`` sendiri.
+"""
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class IndicatorSpec:
+    kind: str
+    compute: Callable       # compute(data, inputs, *params, dtype) -> array
+    defaults: tuple         # parameter default (nama tanpa angka)
+    deps: Callable          # deps(*params) -> tuple nama dependensi
+
+    @property
+    def intermediate(self) -> bool:
+        return self.kind.islower()
+
+
+_REGISTRY = {}
+
+_NAME = re.compile(r"([A-Za-z_]+?)(\d*)")
+
+
+def register(kind: str, defaults=(), deps=()):
+    """
+    Dekorator: daftarkan ``fn(data, inputs, *params, dtype)`` sebagai
+    indikator ``kind``. ``inputs`` berisi hasil setiap dependensi per nama;
+    ``deps`` berupa tuple nama atau fungsi ``deps(*params)``.
+    """
+    def wrap(fn):
+        dep_fn = deps if callable(deps) else (lambda *params: tuple(deps))
+        _REGISTRY[kind] = IndicatorSpec(kind, fn, tuple(defaults), dep_fn)
+        return fn
+
+    return wrap
+
+
+def registered():
+    """Jenis indikator yang terdaftar (tanpa hasil antara)."""
+    return sorted(k for k, spec in _REGISTRY.items() if not spec.intermediate)
+
+
+def parse_name(name: str):
+    """"EMA20" -> ("EMA", (20,)), "RSI" -> ("RSI", (14,)); ValueError untuk nama tak dikenal."""
+    match = _NAME.fullmatch(name)
+    spec = _REGISTRY.get(match.group(1)) if match else None
+    if spec is None:
+        raise ValueError(f"Indikator tidak dikenal: {name!r}")
+    params = (int(match.group(2)),) if match.group(2) else spec.defaults
+    if len(params) != len(spec.defaults):
+        raise ValueError(f"Parameter indikator {name!r} tidak sesuai")
+    return spec.kind, params
+
+
+def merge_needs(*groups):
+    """Gabungan kebutuhan beberapa panel, urutan kemunculan pertama, tanpa duplikat."""
+    return tuple(dict.fromkeys(name for group in groups for name in group))
+
+
+def data_version(data):
+    """Sidik isi frame OHLCV (lihat docstring modul)."""
+    if len(data) == 0:
+        return (0,)
+    close = np.ascontiguousarray(data["Close"].to_numpy(dtype=np.float64))
+    digest = hashlib.blake2b(close, digest_size=16).hexdigest()
+    return (len(data), data.index[0], data.index[-1], digest)
+
+
+# =========================
+# INDIKATOR BAWAAN
+# =========================
+@register("close")
+def _close(data, inputs, dtype):
+    from trading_core import require_finite_close
+
+    return require_finite_close(data["Close"].to_numpy(dtype=np.float64))
+
+
+@register("EMA", defaults=(20,), deps=("close",))
+def _ema(data, inputs, span, dtype):
+    from trading_core import ema_into
+
+    close = inputs["close"]
+    return ema_into(close, span, np.empty(len(close), dtype=dtype))
+
+
+@register("RSI", defaults=(14,), deps=("close",))
+def _rsi(data, inputs, period, dtype):
+    from trading_core import rsi_into
+
+    close = inputs["close"]
+    return rsi_into(close, period, np.empty(len(close), dtype=dtype))
+
+
+# =========================
+# MEMO
+# =========================
+class IndicatorCache:
+    """Memo LRU thread-safe: kunci -> array read-only, maks. ``max_entries``."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._items.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+
+class LazyIndicators:
+    """
+    Indikator untuk satu frame OHLCV yang dihitung saat diminta.
+    ``get(name)`` menghitung dependensi lebih dulu lalu menyimpan setiap
+    hasil, jadi "close" atau EMA yang sama tidak pernah dihitung dua kali.
+    Array hasil bersifat read-only karena bisa dipakai bersama lewat
+    ``cache``.
+    """
+
+    def __init__(self, data, dtype=None, cache=None, version=None):
+        from trading_core import DEFAULT_INDICATOR_DTYPE
+
+        self.data = data
+        self.dtype = np.dtype(dtype or DEFAULT_INDICATOR_DTYPE)
+        self.cache = cache
+        if version is None and cache is not None:
+            version = data_version(data)
+        self.version = version
+        self.computed = []  # kunci yang benar-benar dihitung (bukan dari memo)
+        self._values = {}
+
+    def get(self, name: str):
+        return self._get(parse_name(name))
+
+    def _get(self, key):
+        value = self._values.get(key)
+        if value is not None:
+            return value
+
+        cache_key = (self.version, self.dtype.str) + key
+        if self.cache is not None:
+            value = self.cache.get(cache_key)
+        if value is None:
+            kind, params = key
+            spec = _REGISTRY[kind]
+            inputs = {dep: self._get(parse_name(dep)) for dep in spec.deps(*params)}
+            value = spec.compute(self.data, inputs, *params, dtype=self.dtype)
+            value.flags.writeable = False
+            self.computed.append(key)
+            if self.cache is not None:
+                self.cache.put(cache_key, value)
+
+        self._values[key] = value
+        return value
+
+    def columns(self, names) -> dict:
+        """{nama: array} untuk ``names`` (dihitung seperlunya)."""
+        return {name: self.get(name) for name in names}
@@ -0,0 +1,135 @@
+"""
+Instrumentasi waktu per tahap pipeline (fetch, indikator, warm-up, sinyal,
+figure Plotly, render) dan profil opsional untuk satu kali jalan.
+
+- StageTimer   : ``with timer.stage("indicators"): ...`` mencatat durasi
+                 tiap tahap (perf_counter); tahap boleh bersarang.
+- log_timings  : kirim hasil sebagai satu baris JSON ke logger
+                 ``trading_analisa.timing`` (mudah di-grep / diparse
+                 agregator log untuk mencari latensi terburuk).
+- profile_call : jalankan fungsi sekali di bawah cProfile + tracemalloc,
+                 return (hasil, laporan). Hanya dipakai kalau diminta,
+                 karena overhead-nya besar.
+
+Modul ini hanya memakai standard library; modul profiler baru dimuat
+saat profile_call dipanggil.
+"""
+import json
+import logging
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger("trading_analisa.timing")
+
+
+class StageTimer:
+    """Pencatat durasi tahap; ``stages`` berisi dict name, depth, seconds."""
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.stages = []
+        self._depth = 0
+
+    @contextmanager
+    def stage(self, name: str):
+        record = {"name": name, "depth": self._depth, "seconds": None}
+        self.stages.append(record)
+        self._depth += 1
+        start = self.clock()
+        try:
+            yield record
+        finally:
+            record["seconds"] = self.clock() - start
+            self._depth -= 1
+
+    def add(self, name: str, seconds: float):
+        """Catat tahap yang durasinya diukur di tempat lain (mis. di dalam cache)."""
+        self.stages.append({"name": name, "depth": self._depth, "seconds": seconds})
+
+    def merge(self, stages, depth: int = 0):
+        """Tambahkan tahap dari timer lain, digeser ``depth`` level ke dalam."""
+        self.stages.extend(dict(s, depth=s["depth"] + depth) for s in stages)
+
+    def total(self) -> float:
+        """Jumlah durasi tahap level teratas."""
+        return sum(s["seconds"] or 0.0 for s in self.stages if s["depth"] == 0)
+
+    def as_dict(self) -> dict:
+        """{nama: detik}; nama tahap bersarang digabung dengan '/'."""
+        out, path = {}, []
+        for s in self.stages:
+            del path[s["depth"]:]
+            path.append(s["name"])
+            out["/".join(path)] = s["seconds"]
+        return out
+
+
+class _NullTimer:
+    """Timer kosong: dipakai kalau pemanggil tidak butuh instrumentasi."""
+
+    stages = ()
+
+    @contextmanager
+    def stage(self, name: str):
+        yield None
+
+    def add(self, name: str, seconds: float):
+        pass
+
+
+NULL_TIMER = _NullTimer()
+
+
+def log_timings(event: str, timer: StageTimer, **context):
+    """Tulis timing sebagai satu baris JSON (level INFO)."""
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    payload = {"event": event, "total_s": round(timer.total(), 6)}
+    payload.update(context)
+    payload["stages"] = {k: round(v, 6) for k, v in timer.as_dict().items() if v is not None}
+    logger.info(json.dumps(payload, default=str, ensure_ascii=False))
+
+
+def profile_call(fn, *args, top: int = 25, memory: bool = True, **kwargs):
+    """
+    Jalankan ``fn(*args, **kwargs)`` sekali dengan cProfile (dan tracemalloc
+    bila ``memory``). Return (hasil, laporan) dengan laporan berisi:
+    - cprofile          : teks pstats, ``top`` fungsi teratas per cumtime
+    - peak_mb           : puncak alokasi selama panggilan
+    - top_allocations   : baris kode dengan alokasi terbesar yang masih hidup
+    """
+    # dimuat di sini saja: modul ini ikut diimpor trading_core di setiap jalan
+    import cProfile
+    import io
+    import pstats
+    import tracemalloc
+
+    profiler = cProfile.Profile()
+    started_tracing = memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    if memory:
+        tracemalloc.reset_peak()
+
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        result = fn(*args, **kwargs)
+    finally:
+        profiler.disable()
+        elapsed = time.perf_counter() - start
+        report = {"seconds": elapsed}
+        if memory:
+            report["peak_mb"] = tracemalloc.get_traced_memory()[1] / 1e6
+            snapshot = tracemalloc.take_snapshot()
+            report["top_allocations"] = [
+                {"where": str(stat.traceback), "size_mb": stat.size / 1e6, "count": stat.count}
+                for stat in snapshot.statistics("lineno")[:10]
+            ]
+            if started_tracing:
+                tracemalloc.stop()
+
+    buf = io.StringIO()
+    pstats.Stats(profiler, stream=buf).sort_stats("cumulative").print_stats(top)
+    report["cprofile"] = buf.getvalue()
+    return result, report
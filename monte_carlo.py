@@ -0,0 +1,228 @@
+"""
+Simulasi Monte Carlo risk of ruin untuk ukuran posisi fixed-fractional.
+
+Input: modal, risiko % per trade, win rate, dan RR (dari sidebar / hasil
+backtest Mode 1 atau TP/SL di mode screenshot). Setiap jalur adalah urutan
+``n_trades`` trade menang/kalah acak; trade menang menambah ``risk x RR``,
+trade kalah mengurangi ``risk``.
+
+Supaya jutaan jalur tetap cepat dan memorinya terbatas:
+- jalur disimulasikan per potongan (chunk) sebagai array 2-D (jalur x trade)
+  dengan ukuran potongan ditentukan dari anggaran memori
+- tidak ada hasil per jalur yang disimpan; yang dikumpulkan hanya histogram:
+  max drawdown per jalur, dan jumlah trade menang di setiap titik cek.
+  Equity di titik cek hanya bergantung pada jumlah trade menang, jadi
+  persentil equity bisa dihitung tepat dari histogram itu
+- potongan dijalankan di beberapa thread; simulasi berhenti lebih awal
+  kalau ``time_budget`` detik terlewati, dan jumlah jalur yang benar-benar
+  dijalankan dilaporkan di hasil
+"""
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+DRAWDOWN_LEVELS = (10, 20, 30, 50)
+
+# resolusi histogram max drawdown (persen)
+_DD_BIN = 0.25
+_DD_BINS = int(100 / _DD_BIN)
+
+
+@dataclass
+class MonteCarloResult:
+    paths: int                       # jumlah jalur yang disimulasikan
+    stats: dict                      # risk of ruin, drawdown, return median, dll.
+    equity_percentiles: pd.DataFrame  # index = trade ke-k, kolom = persentil equity
+    drawdown_hist: pd.Series         # index = max drawdown (%), nilai = peluang
+
+
+def _equity_for_wins(wins, trades, balance, risk_frac, rr, compound):
+    """Equity setelah ``trades`` trade dengan ``wins`` menang (broadcast array)."""
+    losses = trades - wins
+    if compound:
+        return balance * (1 + risk_frac * rr) ** wins * (1 - risk_frac) ** losses
+    return balance * (1 + risk_frac * (rr * wins - losses))
+
+
+def _weighted_percentiles(values, weights, percentiles):
+    """Persentil dari nilai terurut naik + bobot (histogram)."""
+    cdf = np.cumsum(weights)
+    cdf = cdf / cdf[-1]
+    pos = np.searchsorted(cdf, np.asarray(percentiles) / 100.0, side="left")
+    return values[np.minimum(pos, len(values) - 1)]
+
+
+class _ChunkTotals:
+    """Akumulasi histogram & hitungan dari semua potongan."""
+
+    def __init__(self, n_checkpoints, n_trades):
+        self.win_hist = np.zeros((n_checkpoints, n_trades + 1), dtype=np.int64)
+        self.dd_hist = np.zeros(_DD_BINS + 1, dtype=np.int64)
+        self.ruined = 0
+        self.below_start = 0
+        self.paths = 0
+
+    def add(self, size, win_hist, dd_hist, ruined, below_start):
+        self.win_hist += win_hist
+        self.dd_hist += dd_hist
+        self.ruined += ruined
+        self.below_start += below_start
+        self.paths += size
+
+
+def _simulate_chunk(seed, size, params):
+    """Simulasikan ``size`` jalur; return histogram & hitungan potongan ini."""
+    n_trades, win_rate, step_win, step_loss, ruin_threshold, compound, check_at = params
+    rng = np.random.default_rng(seed)
+    wins = rng.random((size, n_trades), dtype=np.float32) < win_rate
+
+    # level setelah trade ke-t = menang_t x (win - loss) + t x loss
+    win_count = np.cumsum(wins, axis=1, dtype=np.int16 if n_trades < 2 ** 15 else np.int32)
+    del wins
+    level = win_count * np.float32(step_win - step_loss)
+    level += np.arange(1, n_trades + 1, dtype=np.float32) * np.float32(step_loss)
+
+    peak = np.maximum.accumulate(level, axis=1)
+    np.maximum(peak, 0.0, out=peak)  # puncak termasuk modal awal
+    if compound:
+        max_dd = -np.expm1(-(peak - level).max(axis=1))
+    else:
+        # drawdown relatif puncak equity
+        max_dd = ((peak - level) / (1.0 + peak)).max(axis=1)
+    del peak
+    dd_hist = np.bincount(
+        np.minimum((np.clip(max_dd, 0, 1) * (100 / _DD_BIN)).astype(np.int64), _DD_BINS),
+        minlength=_DD_BINS + 1,
+    )
+    ruined = int((level.min(axis=1) <= ruin_threshold).sum())
+    below_start = int((level[:, -1] < 0).sum())
+    del level
+
+    # histogram jumlah menang di setiap titik cek (satu bincount gabungan)
+    n_check = len(check_at)
+    flat = win_count[:, check_at - 1] + np.arange(n_check) * (n_trades + 1)
+    win_hist = np.bincount(flat.ravel(), minlength=n_check * (n_trades + 1)).reshape(n_check, n_trades + 1)
+    return size, win_hist, dd_hist, ruined, below_start
+
+
+def simulate_risk_of_ruin(
+    balance: float,
+    risk_pct: float,
+    win_rate: float,
+    rr: float,
+    n_trades: int = 200,
+    n_paths: int = 1_000_000,
+    ruin_pct: float = 50.0,
+    compound: bool = True,
+    percentiles=DEFAULT_PERCENTILES,
+    checkpoints: int = 50,
+    memory_mb: float = 64.0,
+    time_budget=None,
+    seed=None,
+    workers=None,
+) -> MonteCarloResult:
+    """
+    Jalankan ``n_paths`` jalur berisi ``n_trades`` trade.
+
+    - ``win_rate``  : peluang menang per trade (0–1)
+    - ``ruin_pct``  : jalur dianggap "ruin" bila equity pernah turun
+                      ``ruin_pct`` % atau lebih dari modal awal
+    - ``compound``  : risiko dihitung dari equity berjalan (True) atau
+                      selalu dari modal awal (False)
+    - ``memory_mb`` : anggaran memori array per potongan
+    - ``time_budget``: batas waktu (detik); None = jalankan semua jalur
+    - ``workers``   : jumlah thread (default min(4, jumlah CPU))
+
+    Hasil deterministik untuk ``seed`` yang sama (selama semua jalur
+    selesai dalam anggaran waktu).
+    """
+    if not 0 <= win_rate <= 1:
+        raise ValueError("win_rate harus di antara 0 dan 1.")
+    if balance <= 0 or risk_pct <= 0 or rr <= 0 or n_trades <= 0 or n_paths <= 0:
+        raise ValueError("balance, risk_pct, rr, n_trades, dan n_paths harus > 0.")
+
+    risk_frac = risk_pct / 100.0
+    ruin_level = 1.0 - ruin_pct / 100.0
+
+    # perubahan equity per trade (relatif modal awal = 1): log equity untuk
+    # compound, equity linear untuk fixed
+    if compound:
+        step_win, step_loss = np.log1p(risk_frac * rr), np.log1p(-min(risk_frac, 1 - 1e-12))
+        ruin_threshold = np.log(ruin_level) if ruin_level > 0 else -np.inf
+    else:
+        step_win, step_loss = risk_frac * rr, -risk_frac
+        ruin_threshold = ruin_level - 1.0
+
+    check_at = np.unique(np.linspace(1, n_trades, min(checkpoints, n_trades)).astype(np.int64))
+    params = (n_trades, win_rate, step_win, step_loss, ruin_threshold, compound, check_at)
+
+    # byte per sel (jalur x trade) yang hidup bersamaan per potongan:
+    # acak float32, bool, jumlah menang int16/int32, level & puncak float32
+    chunk = int(max(1, min(n_paths, memory_mb * 1e6 / (n_trades * 19))))
+    sizes = [min(chunk, n_paths - lo) for lo in range(0, n_paths, chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    workers = workers or min(4, os.cpu_count() or 1)
+
+    totals = _ChunkTotals(len(check_at), n_trades)
+    started = time.perf_counter()
+    # potongan dijalankan paralel (numpy melepas GIL); potongan baru hanya
+    # dikirim selama anggaran waktu belum habis
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        queue = list(zip(seeds, sizes))
+        running = {pool.submit(_simulate_chunk, *queue.pop(0), params) for _ in range(min(workers, len(queue)))}
+        while running:
+            finished, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                totals.add(*future.result())
+            over_budget = time_budget is not None and time.perf_counter() - started >= time_budget
+            while queue and not over_budget and len(running) < workers:
+                running.add(pool.submit(_simulate_chunk, *queue.pop(0), params))
+    done = totals.paths
+    win_hist, dd_hist = totals.win_hist, totals.dd_hist
+
+    wins_axis = np.arange(n_trades + 1)
+    rows = {}
+    for i, k in enumerate(check_at):
+        equity = _equity_for_wins(wins_axis[: k + 1], k, balance, risk_frac, rr, compound)
+        order = np.argsort(equity, kind="stable")
+        rows[int(k)] = _weighted_percentiles(equity[order], win_hist[i, : k + 1][order], percentiles)
+    equity_percentiles = pd.DataFrame.from_dict(
+        rows, orient="index", columns=[f"P{p}" for p in percentiles]
+    )
+    equity_percentiles.loc[0] = balance
+    equity_percentiles = equity_percentiles.sort_index()
+    equity_percentiles.index.name = "Trade ke-"
+
+    dd_levels = np.arange(_DD_BINS + 1) * _DD_BIN
+    dd_prob = dd_hist / done
+    dd_pct = _weighted_percentiles(dd_levels, dd_hist, percentiles)
+
+    # titik cek terakhir selalu trade ke-n_trades
+    final_equity = _equity_for_wins(wins_axis, n_trades, balance, risk_frac, rr, compound)
+    order = np.argsort(final_equity, kind="stable")
+    median_final = _weighted_percentiles(final_equity[order], win_hist[-1][order], [50])[0]
+    stats = {
+        "paths": done,
+        "risk_of_ruin": totals.ruined / done,
+        "prob_loss": totals.below_start / done,
+        "median_final_equity": float(median_final),
+        "expectancy_r": win_rate * rr - (1 - win_rate),
+        "drawdown_percentiles": dict(zip([f"P{p}" for p in percentiles], map(float, dd_pct))),
+        # peluang max drawdown mencapai >= level tertentu
+        "prob_drawdown": {
+            level: float(dd_hist[int(level / _DD_BIN):].sum() / done) for level in DRAWDOWN_LEVELS
+        },
+        "seconds": time.perf_counter() - started,
+    }
+    drawdown_hist = pd.Series(dd_prob, index=pd.Index(dd_levels, name="Max drawdown (%)"), name="Peluang")
+    return MonteCarloResult(
+        paths=done,
+        stats=stats,
+        equity_percentiles=equity_percentiles,
+        drawdown_hist=drawdown_hist,
+    )
@@ -0,0 +1,112 @@
+"""
+Analisis multi-timeframe dari satu kali download.
+
+Interval paling halus diambil sekali, lalu timeframe yang lebih besar
+dibentuk secara lokal dengan resample OHLCV (open pertama, high tertinggi,
+low terendah, close terakhir, volume dijumlah). Setiap timeframe dianalisis
+dengan pipeline yang sama dengan Mode 1 (trading_core.analyze_frame), lalu
+diringkas dalam matriks konfluensi.
+"""
+import pandas as pd
+
+from ohlcv_store import MAX_LOOKBACK_DAYS, interval_to_seconds, period_to_seconds
+from trading_core import analyze_frame
+
+TIMEFRAMES = ["15m", "30m", "1h", "4h", "1d"]
+
+_RESAMPLE_RULES = {
+    "15m": "15min",
+    "30m": "30min",
+    "1h": "1h",
+    "4h": "4h",
+    "1d": "1D",
+}
+
+# interval yang tidak selalu tersedia langsung di Yahoo diambil dari interval di bawahnya
+_DOWNLOAD_BASE = {"4h": "1h"}
+
+_AGG = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+
+
+def base_interval(timeframes) -> str:
+    """Interval yang perlu diunduh: timeframe terhalus yang dipilih."""
+    finest = min(timeframes, key=interval_to_seconds)
+    return _DOWNLOAD_BASE.get(finest, finest)
+
+
+def period_supported(interval: str, period: str) -> bool:
+    """Apakah Yahoo menyediakan ``period`` histori untuk ``interval`` ini."""
+    limit = MAX_LOOKBACK_DAYS.get(interval)
+    return limit is None or period_to_seconds(period) <= limit * 86400
+
+
+def resample_ohlcv(df: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """
+    Bentuk candle ``interval`` dari candle yang lebih halus. Slot tanpa
+    transaksi (malam, akhir pekan, libur bursa) dibuang.
+    """
+    rule = _RESAMPLE_RULES[interval]
+    out = df.resample(rule, label="left", closed="left").agg(_AGG)
+    return out.dropna(subset=["Close"])
+
+
+def multi_timeframe_analysis(base_df: pd.DataFrame, base: str, timeframes):
+    """
+    Jalankan EMA + RSI + sinyal di setiap timeframe.
+    Return {timeframe: (data_ind, signal, reason)} urut dari kecil ke besar.
+    """
+    results = {}
+    for tf in sorted(timeframes, key=interval_to_seconds):
+        frame = base_df[list(_AGG)].copy() if tf == base else resample_ohlcv(base_df, tf)
+        results[tf] = analyze_frame(frame)
+    return results
+
+
+def confluence_matrix(results) -> pd.DataFrame:
+    """Tabel satu baris per timeframe: sinyal + kondisi trend/momentum/harga/RSI."""
+    rows = []
+    for tf, (data_ind, signal, _) in results.items():
+        if data_ind.empty:
+            rows.append({"Timeframe": tf, "Sinyal": "DATA KURANG", "Jumlah bar": 0})
+            continue
+
+        last = data_ind.iloc[-1]
+        prev = data_ind.iloc[-2] if len(data_ind) > 1 else last
+        if last["EMA10"] > last["EMA20"] and prev["EMA10"] <= prev["EMA20"]:
+            momentum = "Cross up"
+        elif last["EMA10"] < last["EMA20"] and prev["EMA10"] >= prev["EMA20"]:
+            momentum = "Cross down"
+        else:
+            momentum = "Naik" if last["EMA10"] > last["EMA20"] else "Turun"
+
+        rows.append({
+            "Timeframe": tf,
+            "Sinyal": signal,
+            "Trend (EMA50 vs EMA200)": "Bullish" if last["EMA50"] > last["EMA200"] else "Bearish",
+            "Momentum (EMA10 vs EMA20)": momentum,
+            "Harga vs EMA20": "Di atas" if last["Close"] > last["EMA20"] else "Di bawah",
+            "RSI": round(float(last["RSI"]), 2),
+            "Jumlah bar": len(data_ind),
+        })
+    return pd.DataFrame(rows).set_index("Timeframe")
+
+
+def confluence_summary(matrix: pd.DataFrame) -> str:
+    """Ringkasan satu kalimat seberapa searah timeframe-timeframe itu."""
+    valid = matrix[matrix["Sinyal"] != "DATA KURANG"]
+    if valid.empty:
+        return "Belum ada timeframe dengan data yang cukup."
+
+    trend = valid["Trend (EMA50 vs EMA200)"]
+    bull, bear, total = int((trend == "Bullish").sum()), int((trend == "Bearish").sum()), len(valid)
+    signals = valid["Sinyal"].value_counts()
+
+    if bull == total:
+        text = f"Semua {total} timeframe trend bullish."
+    elif bear == total:
+        text = f"Semua {total} timeframe trend bearish."
+    else:
+        text = f"Trend campuran: {bull} bullish, {bear} bearish dari {total} timeframe."
+
+    active = ", ".join(f"{k} di {v} timeframe" for k, v in signals.items() if k in ("BUY", "SELL"))
+    return text + (f" Sinyal aktif: {active}." if active else " Belum ada sinyal BUY/SELL aktif.")
@@ -0,0 +1,474 @@
+"""
+Penyimpanan candle OHLCV lokal (on-disk) di belakang yf.download.
+
+Setiap pasangan (ticker Yahoo, interval) disimpan sebagai satu file .npy
+berisi structured array kolumnar yang bisa dibuka dengan memory-map. Request
+berikutnya hanya mengunduh "ekor" yang belum ada lalu digabung ke file lama,
+dan request berulang dalam jangka pendek dijawab langsung dari disk.
+
+Rentang intraday yang panjang diunduh per jendela secara paralel dan
+digabung (lihat backfill.py); bar lama tidak pernah dibuang, jadi histori
+lokal bisa lebih panjang dari batas histori Yahoo.
+
+Sumber data dibuat pluggable lewat objek fetcher dengan method
+``fetch(ticker, interval, period=None, start=None, end=None)`` dan
+``fetch_many(tickers, interval, period)``:
+- ``YahooFetcher`` : memanggil yf.download (yfinance di-import saat dipakai).
+- ``FakeFetcher``  : data sintetis deterministik, untuk tes / jalan offline.
+"""
+import json
+import os
+import re
+import threading
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+DEFAULT_STORE_DIR = os.environ.get("TRADING_ANALISA_STORE", ".ohlcv_store")
+
+# naikkan bila isi bar berubah arti; entri versi lain diunduh ulang
+# (2: harga disesuaikan dividen/split seperti default yf.download)
+STORE_VERSION = 2
+
+_STORE_DTYPE = np.dtype([
+    ("ts", "<i8"),  # timestamp UTC dalam nanodetik
+    ("Open", "<f8"),
+    ("High", "<f8"),
+    ("Low", "<f8"),
+    ("Close", "<f8"),
+    ("Volume", "<i8"),
+])
+
+_PERIOD_SECONDS = {
+    "1d": 86400,
+    "5d": 5 * 86400,
+    "1mo": 31 * 86400,
+    "3mo": 92 * 86400,
+    "6mo": 183 * 86400,
+    "1y": 366 * 86400,
+    "2y": 731 * 86400,
+    "5y": 1827 * 86400,
+    "10y": 3653 * 86400,
+}
+
+_INTERVAL_SECONDS = {
+    "1m": 60,
+    "2m": 120,
+    "5m": 300,
+    "15m": 900,
+    "30m": 1800,
+    "60m": 3600,
+    "90m": 5400,
+    "1h": 3600,
+    "4h": 4 * 3600,
+    "1d": 86400,
+    "5d": 5 * 86400,
+    "1wk": 7 * 86400,
+    "1mo": 30 * 86400,
+}
+
+# Batas histori Yahoo untuk interval intraday (hari ke belakang dari sekarang)
+MAX_LOOKBACK_DAYS = {
+    "1m": 30,
+    "2m": 60,
+    "5m": 60,
+    "15m": 60,
+    "30m": 60,
+    "60m": 730,
+    "90m": 60,
+    "1h": 730,
+    "4h": 730,
+}
+
+
+def store_root(store_dir=None, fake: bool = False) -> str:
+    """
+    Folder store untuk entrypoint CLI. Data sintetis (``--fake``) disimpan
+    di subfolder ``_fake`` supaya tidak tercampur dengan candle asli.
+    """
+    root = store_dir or DEFAULT_STORE_DIR
+    return os.path.join(root, "_fake") if fake else root
+
+
+def period_to_seconds(period: str) -> int:
+    """Ubah kode periode Yahoo (1mo, 3mo, 1y, ...) jadi detik."""
+    if period not in _PERIOD_SECONDS:
+        raise ValueError(f"Periode tidak dikenal: {period!r}")
+    return _PERIOD_SECONDS[period]
+
+
+def interval_to_seconds(interval: str) -> int:
+    """Ubah kode interval Yahoo (15m, 1h, 1d, ...) jadi detik."""
+    if interval not in _INTERVAL_SECONDS:
+        raise ValueError(f"Interval tidak dikenal: {interval!r}")
+    return _INTERVAL_SECONDS[interval]
+
+
+def normalize_ohlcv(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Rapikan hasil download jadi frame OHLCV standar:
+    kolom datar (tanpa MultiIndex), hanya Open/High/Low/Close/Volume,
+    index terurut dan tanpa duplikat.
+    """
+    if data is None or data.empty:
+        return pd.DataFrame(columns=OHLCV_COLUMNS)
+
+    if isinstance(data.columns, pd.MultiIndex):
+        data = data.copy()
+        data.columns = data.columns.get_level_values(0)
+
+    data = data[[c for c in OHLCV_COLUMNS if c in data.columns]]
+    data = data.dropna(subset=["Close"])
+    data = data[~data.index.duplicated(keep="last")].sort_index()
+    return data
+
+
+# =========================
+# FETCHER (SUMBER DATA)
+# =========================
+class YahooFetcher:
+    """Fetcher asli: yf.download untuk satu ticker."""
+
+    def fetch(self, ticker, interval, period=None, start=None, end=None):
+        import yfinance as yf
+
+        # auto_adjust dibiarkan default yf.download (harga disesuaikan dividen/split)
+        kwargs = {"interval": interval, "progress": False}
+        if start is not None:
+            kwargs["start"] = start
+            if end is not None:
+                kwargs["end"] = end
+        else:
+            kwargs["period"] = period
+
+        data = yf.download(ticker, **kwargs)
+        return normalize_ohlcv(data)
+
+    def fetch_many(self, tickers, interval, period):
+        """Satu yf.download untuk banyak ticker sekaligus -> {ticker: frame}."""
+        import yfinance as yf
+
+        tickers = list(tickers)
+        if not tickers:
+            return {}
+
+        data = yf.download(
+            tickers,
+            period=period,
+            interval=interval,
+            group_by="ticker",
+            progress=False,
+            threads=True,
+        )
+        frames = {}
+        for t in tickers:
+            if isinstance(data.columns, pd.MultiIndex) and t in data.columns.get_level_values(0):
+                frames[t] = normalize_ohlcv(data[t])
+            else:
+                frames[t] = normalize_ohlcv(None)
+        return frames
+
+
+class FakeFetcher:
+    """
+    Fetcher offline pengganti Yahoo: deret harga sintetis deterministik per ticker
+    pada grid waktu interval yang berakhir di candle yang sedang berjalan.
+    ``calls`` mencatat setiap pemanggilan supaya tes bisa memeriksa
+    berapa kali "upstream" dihubungi.
+    """
+
+    def __init__(self, clock=time.time, start_price=100.0, volatility=0.01):
+        self.clock = clock
+        self.start_price = start_price
+        self.volatility = volatility
+        self.calls = []
+
+    def fetch(self, ticker, interval, period=None, start=None, end=None):
+        self.calls.append((ticker, interval, period, start, end))
+
+        step = interval_to_seconds(interval)
+        now = self.clock()
+        last_open = int(now // step) * step
+
+        if start is not None:
+            begin = int(pd.Timestamp(start).timestamp())
+        else:
+            begin = int(now - period_to_seconds(period))
+        stop = last_open if end is None else min(last_open, int(pd.Timestamp(end).timestamp()) - 1)
+
+        first_open = -(-begin // step) * step
+        if first_open > stop:
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+
+        bar_ids = np.arange(first_open // step, stop // step + 1, dtype=np.int64)
+        return self._bars(ticker, step, bar_ids)
+
+    def fetch_many(self, tickers, interval, period):
+        return {t: self.fetch(t, interval, period=period) for t in tickers}
+
+    def _bars(self, ticker, step, bar_ids):
+        # harga tiap bar hanya bergantung pada (ticker, nomor bar),
+        # jadi potongan yang diambil terpisah tetap konsisten satu sama lain
+        seed = zlib.crc32(ticker.encode("utf-8"))
+        base = (bar_ids * 2654435761 + seed) % (2 ** 32)
+        u1 = ((base * 1103515245 + 12345) % (2 ** 31)) / 2 ** 31
+        u2 = ((base * 22695477 + 1) % (2 ** 31)) / 2 ** 31
+
+        wave = np.sin(bar_ids / 50.0) * 0.15 + np.sin(bar_ids / 377.0) * 0.35
+        close = self.start_price * np.exp(wave + (u1 - 0.5) * self.volatility)
+        open_ = close * (1 + (u2 - 0.5) * self.volatility)
+        high = np.maximum(open_, close) * (1 + u1 * self.volatility / 2)
+        low = np.minimum(open_, close) * (1 - u2 * self.volatility / 2)
+        volume = (1000 + u1 * 9000).astype(np.int64)
+
+        index = pd.to_datetime(bar_ids * step, unit="s", utc=True)
+        return pd.DataFrame(
+            {"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume},
+            index=index,
+        )
+
+
+# =========================
+# STORE LOKAL
+# =========================
+class OHLCVStore:
+    """
+    Cache candle on-disk per (ticker Yahoo, interval).
+
+    ``get`` mengembalikan frame OHLCV untuk periode yang diminta:
+    - belum ada di disk / jendela yang diminta lebih panjang dari yang
+      tersimpan -> unduh penuh sesuai periode, lalu gabung
+    - sudah ada tapi lewat ``max_age`` -> unduh ekor mulai candle terakhir
+      (candle terakhir ikut diunduh ulang karena mungkin belum close)
+    - masih segar -> langsung dari disk tanpa network
+    """
+
+    def __init__(self, root=DEFAULT_STORE_DIR, fetcher=None, clock=time.time, max_age=None):
+        self.root = root
+        self.fetcher = fetcher if fetcher is not None else YahooFetcher()
+        self.clock = clock
+        self.max_age = max_age
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    # ---------- path & lock ----------
+    def _key_dir(self, ticker, interval):
+        safe = re.sub(r"[^A-Za-z0-9._-]", "_", f"{ticker}__{interval}")
+        return os.path.join(self.root, safe)
+
+    def _lock(self, ticker, interval):
+        with self._locks_guard:
+            return self._locks.setdefault((ticker, interval), threading.Lock())
+
+    # ---------- baca / tulis ----------
+    def _read_meta(self, key_dir):
+        try:
+            with open(os.path.join(key_dir, "meta.json"), encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return meta if meta.get("version") == STORE_VERSION else None
+
+    def _read_bars(self, key_dir):
+        path = os.path.join(key_dir, "bars.npy")
+        if not os.path.exists(path):
+            return None
+        return np.load(path, mmap_mode="r")
+
+    def _write(self, key_dir, bars, meta):
+        os.makedirs(key_dir, exist_ok=True)
+        # tulis ke file sementara lalu os.replace supaya pembaca
+        # tidak pernah melihat file yang setengah jadi
+        tmp = os.path.join(key_dir, f"bars.{os.getpid()}.{threading.get_ident()}.tmp.npy")
+        np.save(tmp, bars)
+        os.replace(tmp, os.path.join(key_dir, "bars.npy"))
+
+        tmp_meta = os.path.join(key_dir, f"meta.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump(dict(meta, version=STORE_VERSION), f)
+        os.replace(tmp_meta, os.path.join(key_dir, "meta.json"))
+
+    @staticmethod
+    def _frame_to_bars(df):
+        df = normalize_ohlcv(df)
+        index = pd.DatetimeIndex(df.index)
+        if index.tz is None:
+            index = index.tz_localize("UTC")
+
+        bars = np.empty(len(df), dtype=_STORE_DTYPE)
+        bars["ts"] = index.tz_convert("UTC").as_unit("ns").asi8
+        for col in OHLCV_COLUMNS[:4]:
+            bars[col] = df[col].to_numpy(dtype=np.float64)
+        bars["Volume"] = df["Volume"].fillna(0).to_numpy(dtype=np.int64)
+        return bars
+
+    @staticmethod
+    def _bars_to_frame(bars, tz):
+        index = pd.to_datetime(np.asarray(bars["ts"]), unit="ns", utc=True)
+        if tz is None:
+            index = index.tz_convert(None)
+        elif tz != "UTC":
+            index = index.tz_convert(tz)
+        return pd.DataFrame(
+            {col: np.array(bars[col]) for col in OHLCV_COLUMNS},
+            index=index,
+        )
+
+    @staticmethod
+    def _merge(old, new):
+        if old is None or len(old) == 0:
+            return new
+        if len(new) == 0:
+            return np.array(old)
+        merged = np.concatenate([np.asarray(old), new])
+        # stable sort + ambil kemunculan terakhir -> data baru menang saat overlap
+        order = np.argsort(merged["ts"], kind="stable")
+        merged = merged[order]
+        keep = np.ones(len(merged), dtype=bool)
+        keep[:-1] = merged["ts"][1:] != merged["ts"][:-1]
+        return merged[keep]
+
+    def _backfill(self, ticker, interval, key_dir, bars, meta, want_start, now, max_age):
+        """
+        Rentang panjang intraday (lihat backfill.py): hanya bagian yang belum
+        tercakup diunduh per jendela secara paralel, digabung, lalu ditulis.
+
+        ``covered_from`` hanya dimundurkan melewati jendela yang benar-benar
+        berisi bar, berurutan dari yang terbaru: jendela kosong (yfinance
+        sering mengembalikan frame kosong saat rate limit / error sementara)
+        tidak dianggap tercakup, jadi request berikutnya mengunduhnya lagi
+        dan tidak ada lubang permanen. Bagian di luar batas lookback Yahoo
+        baru dianggap tercakup kalau semua jendela di depannya berhasil.
+        """
+        from backfill import fetch_windows, plan_windows
+
+        have = bars is not None and len(bars) > 0
+        step = interval_to_seconds(interval)
+        refresh_tail = not have or now - meta["fetched_at"] >= max_age
+
+        # kepala: dari want_start sampai awal rentang yang sudah tercakup
+        head = plan_windows(interval, want_start, meta["covered_from"] + step if have else now, now)
+        tail = plan_windows(interval, bars["ts"][-1] / 1e9, now, now) if have and refresh_tail else []
+        results = fetch_windows(self.fetcher, ticker, interval, head + tail)
+        frames = [f for f in results if not f.empty]
+        if not frames and not have:
+            return None, None
+
+        covered_from = meta["covered_from"] if have else now
+        for (lo, _), frame in zip(reversed(head), reversed(results[:len(head)])):
+            if frame.empty:
+                break
+            covered_from = lo
+        else:
+            covered_from = want_start
+
+        if frames:
+            # jendela bertumpuk: gabung dulu antar jendela (tanpa duplikat), lalu ke data lama
+            parts = [self._frame_to_bars(f) for f in frames]
+            new = self._merge(parts[0], np.concatenate(parts[1:])) if len(parts) > 1 else parts[0]
+            bars = self._merge(bars, new)
+        tz = meta["tz"] if have else _index_tz(frames[0].index)
+        meta = {
+            "tz": tz,
+            "covered_from": min(covered_from, meta["covered_from"]) if have else covered_from,
+            "fetched_at": now if refresh_tail else meta["fetched_at"],
+        }
+        self._write(key_dir, bars, meta)
+        return bars, meta
+
+    def _max_age(self, interval):
+        return self.max_age if self.max_age is not None else max(60, interval_to_seconds(interval))
+
+    def _store_period(self, key_dir, bars, meta, fresh, want_start, now):
+        """Gabung hasil unduhan satu periode penuh (tidak kosong) ke data lama lalu tulis."""
+        tz = _index_tz(fresh.index)
+        bars = self._merge(bars, self._frame_to_bars(fresh))
+        covered_from = want_start if meta is None else min(meta["covered_from"], want_start)
+        meta = {"tz": tz, "covered_from": covered_from, "fetched_at": now}
+        self._write(key_dir, bars, meta)
+        return bars, meta
+
+    # ---------- API utama ----------
+    def get(self, ticker, period, interval):
+        """
+        Frame OHLCV untuk ``ticker`` selama ``period`` terakhir pada ``interval``.
+        Rentang intraday yang lebih panjang dari satu request Yahoo diisi
+        per jendela (backfill.py).
+        """
+        from backfill import needs_backfill
+
+        now = self.clock()
+        want_start = now - period_to_seconds(period)
+        max_age = self._max_age(interval)
+        key_dir = self._key_dir(ticker, interval)
+
+        with self._lock(ticker, interval):
+            meta = self._read_meta(key_dir)
+            bars = self._read_bars(key_dir) if meta is not None else None
+
+            missing = bars is None or len(bars) == 0 or meta["covered_from"] > want_start
+            if missing and needs_backfill(interval, want_start, now):
+                bars, meta = self._backfill(ticker, interval, key_dir, bars, meta, want_start, now, max_age)
+                if bars is None:
+                    return normalize_ohlcv(None)
+
+            elif missing:
+                fresh = self.fetcher.fetch(ticker, interval, period=period)
+                if not fresh.empty:
+                    bars, meta = self._store_period(key_dir, bars, meta, fresh, want_start, now)
+                elif bars is None or len(bars) == 0:
+                    return normalize_ohlcv(fresh)
+                # frame kosong (error / rate limit): layani bar lama, meta tidak
+                # diubah supaya request berikutnya mencoba periode penuh lagi
+
+            elif now - meta["fetched_at"] >= max_age:
+                last_ts = pd.Timestamp(int(bars["ts"][-1]), unit="ns", tz="UTC")
+                tail = self.fetcher.fetch(ticker, interval, start=last_ts)
+                bars = self._merge(bars, self._frame_to_bars(tail))
+                meta = dict(meta, fetched_at=now)
+                self._write(key_dir, bars, meta)
+
+            start_ns = int(want_start * 1e9)
+            first = int(np.searchsorted(bars["ts"], start_ns, side="left"))
+            return self._bars_to_frame(bars[first:], meta["tz"])
+
+    def get_many(self, tickers, period, interval):
+        """
+        {ticker: frame} untuk banyak ticker. Ticker yang sudah tercakup dan
+        masih segar dilayani dari disk; sisanya diunduh dalam satu
+        ``fetch_many``. Rentang yang perlu backfill, atau ticker yang tidak
+        ikut terisi batch, jatuh ke ``get`` per ticker.
+        """
+        from backfill import needs_backfill
+
+        tickers = list(dict.fromkeys(tickers))
+        now = self.clock()
+        want_start = now - period_to_seconds(period)
+        max_age = self._max_age(interval)
+
+        if not needs_backfill(interval, want_start, now):
+            stale = []
+            for t in tickers:
+                meta = self._read_meta(self._key_dir(t, interval))
+                if meta is None or meta["covered_from"] > want_start or now - meta["fetched_at"] >= max_age:
+                    stale.append(t)
+            fresh = self.fetcher.fetch_many(stale, interval, period) if stale else {}
+            for t, frame in fresh.items():
+                if frame is None or frame.empty:
+                    continue
+                key_dir = self._key_dir(t, interval)
+                with self._lock(t, interval):
+                    meta = self._read_meta(key_dir)
+                    bars = self._read_bars(key_dir) if meta is not None else None
+                    self._store_period(key_dir, bars, meta, frame, want_start, now)
+
+        return {t: self.get(t, period, interval) for t in tickers}
+
+
+def _index_tz(index):
+    tz = getattr(index, "tz", None)
+    return None if tz is None else str(tz)
@@ -0,0 +1,292 @@
+"""
+Optimizer parameter strategi EMA + RSI (grid / random search) secara paralel.
+
+Yang dicari: span EMA momentum (fast/slow) dan trend (trend_fast/trend_slow),
+periode RSI, band RSI untuk BUY/SELL, serta stop % untuk SL/TP 1:2.
+Setiap kombinasi dibacktest (backtest.simulate) di semua ticker, lalu
+hasilnya diringkas jadi tabel peringkat yang bisa diekspor menjadi preset
+gaya trading baru.
+
+Supaya cepat untuk ribuan kombinasi:
+- harga OHLC setiap ticker ditaruh di shared memory satu kali; worker di
+  process pool hanya menempel (attach) ke blok itu, tidak ada pickle array
+- kombinasi dikelompokkan per ticker, dan setiap worker menyimpan cache
+  EMA per span dan RSI per periode sehingga dipakai ulang antar kombinasi
+
+Contoh CLI (data sintetis, offline):
+    python optimizer.py BTC-USD ETH-USD --interval 1h --period 1y --fake --samples 500
+"""
+import argparse
+import itertools
+import json
+import random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from backtest import simulate, warmup_bars
+from scanner import ema_2d, rsi_2d
+from signal_rules import CODE_DATA_KURANG, evaluate_signal_codes
+
+# Ruang parameter default (nilai strategi sekarang ada di dalamnya)
+DEFAULT_SPACE = {
+    "fast": [5, 8, 10, 12],
+    "slow": [20, 26, 30],
+    "trend_fast": [50],
+    "trend_slow": [100, 150, 200],
+    "rsi_period": [9, 14, 21],
+    "buy_low": [40, 45, 50],
+    "buy_high": [70, 80],
+    "sell_low": [20, 30],
+    "sell_high": [50, 55, 60],
+    "stop_pct": [1.0, 2.0, 3.0, 4.0],
+}
+
+PARAM_NAMES = tuple(DEFAULT_SPACE)
+
+# ukuran kelompok kombinasi per task di process pool
+_TASK_SIZE = 64
+
+
+def _valid(params) -> bool:
+    return (
+        params["fast"] < params["slow"]
+        and params["trend_fast"] < params["trend_slow"]
+        and params["buy_low"] < params["buy_high"]
+        and params["sell_low"] < params["sell_high"]
+    )
+
+
+def grid_search_space(space=None):
+    """Semua kombinasi valid dari ``space`` (default DEFAULT_SPACE)."""
+    space = DEFAULT_SPACE if space is None else space
+    names = list(space)
+    combos = (dict(zip(names, values)) for values in itertools.product(*space.values()))
+    return [c for c in combos if _valid(c)]
+
+
+def random_search_space(n_samples: int, space=None, seed: int = 0):
+    """``n_samples`` kombinasi valid acak (tanpa duplikat) dari ``space``."""
+    space = DEFAULT_SPACE if space is None else space
+    rng = random.Random(seed)
+    seen = set()
+    combos = []
+    total = int(np.prod([len(v) for v in space.values()]))
+    attempts = 0
+    while len(combos) < n_samples and attempts < total * 4:
+        attempts += 1
+        c = {name: rng.choice(values) for name, values in space.items()}
+        key = tuple(c.values())
+        if key in seen or not _valid(c):
+            continue
+        seen.add(key)
+        combos.append(c)
+    return combos
+
+
+# =========================
+# SHARED MEMORY
+# =========================
+def _share_frames(frames: dict):
+    """Salin OHLC tiap ticker ke satu blok shared memory (4 x n float64)."""
+    blocks, specs = [], []
+    for ticker, df in frames.items():
+        arr = df[["Open", "High", "Low", "Close"]].to_numpy(dtype=np.float64).T
+        shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+        np.ndarray(arr.shape, dtype=np.float64, buffer=shm.buf)[:] = arr
+        blocks.append(shm)
+        specs.append((ticker, shm.name, arr.shape))
+    return blocks, specs
+
+
+# state milik proses worker
+_WORKER = {"blocks": [], "arrays": {}, "cache": {}}
+
+
+def _attach(specs):
+    """Initializer worker: tempel ke blok shared memory milik proses induk."""
+    for ticker, name, shape in specs:
+        # blok dimiliki (dan di-unlink) oleh proses induk; worker hanya membaca
+        shm = shared_memory.SharedMemory(name=name)
+        _WORKER["blocks"].append(shm)
+        _WORKER["arrays"][ticker] = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+
+
+def _cached(kind, ticker, param, compute):
+    cache = _WORKER["cache"]
+    key = (kind, ticker, param)
+    if key not in cache:
+        # cache dibatasi supaya worker tidak menimbun array dari banyak ticker
+        if len(cache) >= 64:
+            cache.pop(next(iter(cache)))
+        cache[key] = compute()
+    return cache[key]
+
+
+def _evaluate_task(task):
+    """Backtest sekelompok kombinasi untuk satu ticker. Return list dict hasil."""
+    ticker, combos, balance, risk_pct, rr = task
+    open_, high, low, close = _WORKER["arrays"][ticker]
+    closes = close[:, None]
+    lengths = np.array([len(close)])
+
+    rows = []
+    for params in combos:
+        ema = {
+            span: _cached("ema", ticker, span, lambda s=span: ema_2d(closes, s)[:, 0])
+            for span in {params["fast"], params["slow"], params["trend_fast"], params["trend_slow"]}
+        }
+        rsi = _cached(
+            "rsi", ticker, params["rsi_period"],
+            lambda p=params["rsi_period"]: rsi_2d(closes, lengths, period=p)[:, 0],
+        )
+        codes = evaluate_signal_codes(
+            close,
+            ema[params["fast"]],
+            ema[params["slow"]],
+            ema[params["trend_fast"]],
+            ema[params["trend_slow"]],
+            rsi,
+            buy_band=(params["buy_low"], params["buy_high"]),
+            sell_band=(params["sell_low"], params["sell_high"]),
+        )
+        codes[: warmup_bars(params["rsi_period"])] = CODE_DATA_KURANG
+        _, _, stats = simulate(
+            open_, high, low, close, codes, params["stop_pct"],
+            rr=rr, balance=balance, risk_pct=risk_pct,
+        )
+        rows.append(dict(params, ticker=ticker, **stats))
+    return rows
+
+
+# =========================
+# API UTAMA
+# =========================
+def optimize(
+    frames: dict,
+    combos,
+    balance: float = 1000.0,
+    risk_pct: float = 1.0,
+    rr: float = 2.0,
+    max_workers=None,
+    min_trades: int = 5,
+):
+    """
+    Backtest setiap kombinasi di setiap ticker ``frames`` ({ticker: OHLC}).
+    Return (ranking, detail):
+    - detail  : satu baris per (kombinasi, ticker)
+    - ranking : satu baris per kombinasi, rata-rata antar ticker, terurut
+                dari skor tertinggi (return / max drawdown). Kombinasi dengan
+                total trade < ``min_trades`` ditaruh di bawah.
+    """
+    frames = {t: df for t, df in frames.items() if len(df)}
+    combos = list(combos)
+    if not frames or not combos:
+        return pd.DataFrame(), pd.DataFrame()
+
+    tasks = [
+        (ticker, combos[i:i + _TASK_SIZE], balance, risk_pct, rr)
+        for ticker in frames
+        for i in range(0, len(combos), _TASK_SIZE)
+    ]
+
+    blocks, specs = _share_frames(frames)
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_attach, initargs=(specs,)) as pool:
+            rows = [row for chunk in pool.map(_evaluate_task, tasks) for row in chunk]
+    finally:
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+
+    detail = pd.DataFrame(rows)
+    ranking = (
+        detail.groupby(list(PARAM_NAMES), sort=False)
+        .agg(
+            tickers=("ticker", "nunique"),
+            trades=("trades", "sum"),
+            win_rate=("win_rate", "mean"),
+            avg_return_pct=("total_return_pct", "mean"),
+            worst_drawdown_pct=("max_drawdown_pct", "max"),
+            avg_r=("avg_r", "mean"),
+        )
+        .reset_index()
+    )
+    ranking["score"] = ranking["avg_return_pct"] / ranking["worst_drawdown_pct"].clip(lower=1.0)
+    ranking["enough_trades"] = ranking["trades"] >= min_trades
+    ranking = ranking.sort_values(["enough_trades", "score"], ascending=[False, False])
+    return ranking.reset_index(drop=True), detail
+
+
+def results_to_presets(ranking: pd.DataFrame, top: int = 3, risk_pct: float = 1.0, prefix: str = "Optimized"):
+    """
+    Ubah baris teratas ranking jadi preset gaya trading (dict siap JSON),
+    dengan field yang sama dengan preset di sidebar plus parameter sinyal.
+    """
+    presets = []
+    for i, row in enumerate(ranking.head(top).itertuples(index=False), start=1):
+        presets.append({
+            "name": f"{prefix} #{i}",
+            "default_risk_pct": float(risk_pct),
+            "default_stop_pct": float(row.stop_pct),
+            "tf_hint": (
+                f"EMA{row.fast}/EMA{row.slow} momentum, EMA{row.trend_fast}/EMA{row.trend_slow} trend, "
+                f"RSI{row.rsi_period} BUY {row.buy_low}–{row.buy_high}, SELL {row.sell_low}–{row.sell_high}."
+            ),
+            "signal_params": {name: _plain(getattr(row, name)) for name in PARAM_NAMES if name != "stop_pct"},
+            "backtest": {
+                "avg_return_pct": float(row.avg_return_pct),
+                "worst_drawdown_pct": float(row.worst_drawdown_pct),
+                "win_rate": float(row.win_rate),
+                "trades": int(row.trades),
+            },
+        })
+    return presets
+
+
+def _plain(value):
+    """Skalar numpy -> tipe Python biasa supaya bisa di-json-kan."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def main(argv=None):
+    from ohlcv_store import FakeFetcher, OHLCVStore, store_root
+
+    parser = argparse.ArgumentParser(description="Optimizer parameter EMA + RSI (paralel).")
+    parser.add_argument("tickers", nargs="+", help="Kode Yahoo, mis. BTC-USD EURUSD=X BBCA.JK")
+    parser.add_argument("--period", default="1y")
+    parser.add_argument("--interval", default="1d")
+    parser.add_argument("--samples", type=int, default=0, help="random search N kombinasi (0 = grid penuh)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--balance", type=float, default=1000.0)
+    parser.add_argument("--risk-pct", type=float, default=1.0)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--out", help="simpan ranking ke CSV")
+    parser.add_argument("--presets", help="simpan preset teratas ke JSON")
+    parser.add_argument("--fake", action="store_true", help="pakai data sintetis (offline)")
+    args = parser.parse_args(argv)
+
+    if args.fake:
+        store = OHLCVStore(store_root(fake=True), fetcher=FakeFetcher())
+    else:
+        store = OHLCVStore()
+    frames = {t: store.get(t, args.period, args.interval) for t in args.tickers}
+
+    combos = random_search_space(args.samples) if args.samples else grid_search_space()
+    ranking, _ = optimize(
+        frames, combos, balance=args.balance, risk_pct=args.risk_pct, max_workers=args.workers
+    )
+    with pd.option_context("display.width", 200, "display.max_columns", 30):
+        print(ranking.head(args.top).to_string(index=False))
+
+    if args.out:
+        ranking.to_csv(args.out, index=False)
+    if args.presets:
+        with open(args.presets, "w", encoding="utf-8") as f:
+            json.dump(results_to_presets(ranking, risk_pct=args.risk_pct), f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
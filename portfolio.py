@@ -0,0 +1,160 @@
+"""
+Mesin risiko portofolio: banyak posisi dihitung sekaligus sebagai array.
+
+- size_positions  : versi array dari compute_position_sizing (long & short)
+- cap_exposure    : perkecil semua posisi secara proporsional supaya total
+                    nilai posisi dan total risiko ke SL tidak melewati batas
+- return_matrix   : log return yang diselaraskan per tanggal dari frame OHLCV
+                    (mis. hasil OHLCVStore / FetchService.fetch_many)
+- PortfolioBook   : posisi terbuka + matriks kovarians; ``reprice(prices)``
+                    menghitung ulang seluruh buku (PnL, risiko ke SL,
+                    exposure, volatilitas & VaR parametrik) dalam hitungan
+                    milidetik setiap kali harga bergerak
+"""
+import numpy as np
+import pandas as pd
+
+# z-score VaR parametrik satu sisi
+_VAR_Z = {0.95: 1.6449, 0.99: 2.3263}
+
+
+def size_positions(balance, risk_pct, stop_pct, prices, direction=1.0, rr: float = 2.0):
+    """
+    Ukuran posisi untuk banyak harga sekaligus. ``risk_pct``, ``stop_pct``
+    dan ``direction`` (+1 long / -1 short) boleh skalar atau array.
+    Return dict array: risk_amount, qty, sl, tp; baris yang input-nya tidak
+    valid (<= 0) bernilai NaN, sama seperti None di compute_position_sizing.
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    risk_pct = np.broadcast_to(np.asarray(risk_pct, dtype=np.float64), prices.shape)
+    stop_pct = np.broadcast_to(np.asarray(stop_pct, dtype=np.float64), prices.shape)
+    direction = np.broadcast_to(np.asarray(direction, dtype=np.float64), prices.shape)
+
+    valid = (balance > 0) & (risk_pct > 0) & (stop_pct > 0) & (prices > 0)
+    risk_amount = np.where(valid, balance * risk_pct / 100.0, np.nan)
+    stop_dist = np.where(valid, prices * stop_pct / 100.0, np.nan)
+    return {
+        "risk_amount": risk_amount,
+        "qty": risk_amount / stop_dist,
+        "sl": prices - direction * stop_dist,
+        "tp": prices + direction * stop_dist * rr,
+    }
+
+
+def cap_exposure(qty, prices, risk_per_unit, balance, max_exposure_pct=None, max_risk_pct=None):
+    """
+    Skala semua ``qty`` dengan faktor yang sama (<= 1) supaya:
+    - total nilai posisi (gross) <= ``max_exposure_pct`` % modal
+    - total risiko ke SL         <= ``max_risk_pct`` % modal
+    Return (qty_baru, faktor).
+    """
+    qty = np.asarray(qty, dtype=np.float64)
+    gross = np.nansum(np.abs(qty) * prices)
+    total_risk = np.nansum(np.abs(qty) * risk_per_unit)
+
+    scale = 1.0
+    if max_exposure_pct is not None and gross > 0:
+        scale = min(scale, balance * max_exposure_pct / 100.0 / gross)
+    if max_risk_pct is not None and total_risk > 0:
+        scale = min(scale, balance * max_risk_pct / 100.0 / total_risk)
+    return qty * scale, scale
+
+
+def return_matrix(frames: dict, lookback=None) -> pd.DataFrame:
+    """
+    Log return Close per ticker, diselaraskan per tanggal lokal bursa
+    (kolom = ticker). Ticker dengan kalender berbeda (crypto vs saham)
+    tetap bisa dipasangkan; tanggal yang hilang dibiarkan NaN dan
+    kovarians dihitung berpasangan.
+    """
+    columns = {}
+    for ticker, df in frames.items():
+        if df is None or len(df) < 2:
+            continue
+        close = df["Close"]
+        index = close.index
+        if getattr(index, "tz", None) is not None:
+            index = index.tz_localize(None)
+        close = pd.Series(close.to_numpy(dtype=np.float64), index=index.normalize())
+        close = close[~close.index.duplicated(keep="last")]
+        columns[ticker] = np.log(close).diff().iloc[1:]
+    returns = pd.DataFrame(columns)
+    if lookback is not None:
+        returns = returns.iloc[-lookback:]
+    return returns
+
+
+class PortfolioBook:
+    """
+    Posisi terbuka sebagai array (satu elemen per posisi) + kovarians
+    return per bar. Buku dibuat sekali; ``reprice`` hanya operasi array.
+    """
+
+    def __init__(self, tickers, direction, entry, qty, sl, balance: float, cov=None):
+        self.tickers = list(tickers)
+        self.direction = np.asarray(direction, dtype=np.float64)
+        self.entry = np.asarray(entry, dtype=np.float64)
+        self.qty = np.asarray(qty, dtype=np.float64)
+        self.sl = np.asarray(sl, dtype=np.float64)
+        self.balance = float(balance)
+        if cov is None:
+            self.cov = np.full((len(self.tickers), len(self.tickers)), np.nan)
+        else:
+            # kovarians diurutkan sesuai posisi (ticker yang sama boleh muncul dua kali)
+            cov = cov.reindex(index=self.tickers, columns=self.tickers)
+            self.cov = cov.to_numpy(dtype=np.float64)
+        # ticker tanpa histori: dianggap tidak berkorelasi (varians 0)
+        self._cov_filled = np.nan_to_num(self.cov)
+
+    def reprice(self, prices, confidence: float = 0.95):
+        """
+        Hitung ulang buku pada ``prices`` (array sejajar posisi).
+        Return (tabel per posisi, ringkasan dict).
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        value = self.qty * prices
+        exposure = self.direction * value
+        pnl = self.direction * (prices - self.entry) * self.qty
+        # kerugian tambahan kalau SL kena dari harga sekarang (0 jika SL sudah lewat profit)
+        risk_to_sl = np.maximum(self.direction * (prices - self.sl), 0.0) * self.qty
+
+        exp_clean = np.nan_to_num(exposure)
+        cov_exp = self._cov_filled @ exp_clean
+        variance = float(exp_clean @ cov_exp)
+        sigma = float(np.sqrt(max(variance, 0.0)))
+        contribution = exp_clean * cov_exp / variance if variance > 0 else np.zeros_like(exp_clean)
+
+        table = pd.DataFrame({
+            "Ticker": self.tickers,
+            "Arah": np.where(self.direction > 0, "BUY", "SELL"),
+            "Qty": self.qty,
+            "Entry": self.entry,
+            "Harga": prices,
+            "SL": self.sl,
+            "Nilai posisi": value,
+            "PnL": pnl,
+            "Risiko ke SL": risk_to_sl,
+            "Kontribusi risiko (%)": contribution * 100,
+        })
+
+        summary = {
+            "positions": len(self.tickers),
+            "gross_exposure": float(np.nansum(value)),
+            "net_exposure": float(np.nansum(exposure)),
+            "gross_exposure_pct": float(np.nansum(value) / self.balance * 100),
+            "capital_at_risk": float(np.nansum(risk_to_sl)),
+            "capital_at_risk_pct": float(np.nansum(risk_to_sl) / self.balance * 100),
+            "unrealized_pnl": float(np.nansum(pnl)),
+            "volatility": sigma,
+            "var": _VAR_Z[confidence] * sigma,
+            "confidence": confidence,
+        }
+        return table, summary
+
+
+def correlation_from_cov(cov: pd.DataFrame) -> pd.DataFrame:
+    """Matriks korelasi dari kovarians (NaN untuk ticker tanpa varians)."""
+    std = np.sqrt(np.diag(cov.to_numpy()))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = cov.to_numpy() / np.outer(std, std)
+    return pd.DataFrame(corr, index=cov.index, columns=cov.columns)
@@ -0,0 +1,137 @@
+"""
+Scanner watchlist: analisis EMA + RSI untuk ratusan ticker sekaligus.
+
+Close semua ticker dikemas ke satu array 2-D (waktu x ticker) yang
+diratakan kanan: bar terakhir setiap ticker berada di baris terakhir,
+sisa di atasnya diisi NaN. Dengan begitu setiap kolom identik dengan
+seri ticker itu sendiri (seperti di Mode 1), sementara EMA dan RSI
+dihitung untuk semua kolom dalam satu panggilan per indikator.
+"""
+import numpy as np
+import pandas as pd
+
+from signal_rules import (
+    CODE_DATA_KURANG,
+    MIN_SIGNAL_BARS,
+    SIGNAL_LABELS,
+    SIGNAL_REASONS,
+    evaluate_signal_codes,
+)
+
+EMA_SPANS = (10, 20, 50, 100, 200)
+
+# urutan tampilan tabel: sinyal aktif dulu
+_SIGNAL_ORDER = {"BUY": 0, "SELL": 1, "WAIT": 2, "DATA KURANG": 3}
+
+
+def pack_closes(frames: dict):
+    """
+    Kemas kolom Close dari {ticker: frame} ke array 2-D rata kanan.
+
+    Return (tickers, closes, lengths, last_times):
+    - closes     : float64 (T, N), T = seri terpanjang
+    - lengths    : jumlah bar valid per ticker
+    - last_times : timestamp bar terakhir per ticker (NaT jika kosong)
+    """
+    tickers = list(frames)
+    series = [frames[t]["Close"].to_numpy(dtype=np.float64) if len(frames[t]) else np.empty(0) for t in tickers]
+    lengths = np.array([len(s) for s in series], dtype=np.int64)
+    # minimal 2 baris supaya bar terakhir & sebelumnya selalu ada
+    depth = max(int(lengths.max()) if len(lengths) else 0, 2)
+
+    closes = np.full((depth, len(tickers)), np.nan)
+    for j, s in enumerate(series):
+        if len(s):
+            closes[depth - len(s):, j] = s
+
+    last_times = [frames[t].index[-1] if len(frames[t]) else pd.NaT for t in tickers]
+    return tickers, closes, lengths, last_times
+
+
+def ema_2d(closes, span: int):
+    """EMA (adjust=False) untuk semua kolom sekaligus; NaN di awal kolom dilewati."""
+    return pd.DataFrame(closes).ewm(span=span, adjust=False).mean().to_numpy()
+
+
+def rsi_2d(closes, lengths, period: int = 14):
+    """
+    RSI (rata-rata sederhana, sama dengan compute_rsi) untuk semua kolom.
+    Baris sebelum warm-up tiap ticker di-NaN-kan supaya padding tidak
+    ikut masuk ke jendela rolling.
+    """
+    delta = np.diff(closes, axis=0, prepend=np.nan)
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+
+    gain_rol = pd.DataFrame(gain).rolling(window=period).mean().to_numpy()
+    loss_rol = pd.DataFrame(loss).rolling(window=period).mean().to_numpy()
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = gain_rol / loss_rol
+        rsi = 100 - (100 / (1 + rs))
+
+    depth = closes.shape[0]
+    first_valid = depth - lengths + (period - 1)
+    rows = np.arange(depth)[:, None]
+    rsi[rows < first_valid[None, :]] = np.nan
+    return rsi
+
+
+def scan_closes(tickers, closes, lengths, last_times=None, rsi_period: int = 14):
+    """
+    Hitung EMA/RSI/sinyal di bar terakhir untuk semua ticker.
+    Return DataFrame satu baris per ticker, terurut BUY → SELL → WAIT.
+    """
+    emas = {span: ema_2d(closes, span) for span in EMA_SPANS}
+    rsi = rsi_2d(closes, lengths, period=rsi_period)
+
+    # cukup 2 bar terakhir (bar terakhir + sebelumnya untuk crossover)
+    tail = slice(-2, None)
+    codes = evaluate_signal_codes(
+        closes[tail],
+        emas[10][tail],
+        emas[20][tail],
+        emas[50][tail],
+        emas[200][tail],
+        rsi[tail],
+    )[-1]
+
+    # sama dengan cek len(data_ind) < 60 di generate_smart_signal
+    enough = (lengths - (rsi_period - 1)) >= MIN_SIGNAL_BARS
+    codes = np.where(enough, codes, CODE_DATA_KURANG)
+
+    table = pd.DataFrame({
+        "Ticker": tickers,
+        "Sinyal": [SIGNAL_LABELS[c] for c in codes],
+        "Close": closes[-1],
+        "EMA10": emas[10][-1],
+        "EMA20": emas[20][-1],
+        "EMA50": emas[50][-1],
+        "EMA100": emas[100][-1],
+        "EMA200": emas[200][-1],
+        "RSI": rsi[-1],
+        "Trend": np.where(
+            emas[50][-1] > emas[200][-1], "Bullish",
+            np.where(emas[50][-1] < emas[200][-1], "Bearish", "-"),
+        ),
+        "Jumlah bar": lengths,
+        "Bar terakhir": last_times if last_times is not None else pd.NaT,
+        "Alasan": [SIGNAL_REASONS[c] for c in codes],
+    })
+
+    table["_order"] = table["Sinyal"].map(_SIGNAL_ORDER)
+    table = table.sort_values(["_order", "Ticker"], kind="stable").drop(columns="_order")
+    return table.reset_index(drop=True)
+
+
+def scan_watchlist(tickers, period: str, interval: str, store):
+    """
+    Ambil semua ticker (sudah dalam kode Yahoo) lewat ``store.get_many``
+    (OHLCVStore: yang masih segar dari disk, sisanya satu batch
+    ``fetch_many``) lalu jalankan scan_closes.
+    Ticker tanpa data tetap muncul di tabel sebagai DATA KURANG.
+    """
+    tickers = list(dict.fromkeys(tickers))
+    frames = store.get_many(tickers, period, interval)
+    packed = pack_closes({t: frames.get(t, pd.DataFrame(columns=["Close"])) for t in tickers})
+    return scan_closes(*packed)
@@ -0,0 +1,117 @@
+"""
+Aturan sinyal EMA + RSI (sama dengan generate_smart_signal) dalam bentuk
+operasi array, supaya bisa dievaluasi untuk banyak bar dan/atau banyak
+ticker sekaligus tanpa loop per baris.
+
+Semua input berbentuk array dengan sumbu 0 = waktu. Array 2-D (waktu x ticker)
+juga didukung; hasilnya berupa kode sinyal int8 dengan bentuk yang sama.
+"""
+import numpy as np
+
+# Kode sinyal per bar
+CODE_DATA_KURANG = 0
+CODE_BUY = 1
+CODE_SELL = 2
+CODE_WAIT_BULL = 3  # trend bullish, momentum belum konfirmasi
+CODE_WAIT_BEAR = 4  # trend bearish, momentum belum konfirmasi
+CODE_WAIT = 5       # kondisi belum searah
+
+SIGNAL_LABELS = {
+    CODE_DATA_KURANG: "DATA KURANG",
+    CODE_BUY: "BUY",
+    CODE_SELL: "SELL",
+    CODE_WAIT_BULL: "WAIT",
+    CODE_WAIT_BEAR: "WAIT",
+    CODE_WAIT: "WAIT",
+}
+
+SIGNAL_REASONS = {
+    CODE_DATA_KURANG: "Data belum cukup panjang untuk analisis EMA & RSI.",
+    CODE_BUY: (
+        "Trend besar bullish (EMA50 > EMA200), momentum baru menguat "
+        "(EMA10 cross up EMA20), harga di atas EMA20, dan RSI mendukung (45–80)."
+    ),
+    CODE_SELL: (
+        "Trend besar bearish (EMA50 < EMA200), momentum baru melemah "
+        "(EMA10 cross down EMA20), harga di bawah EMA20, dan RSI mendukung (20–55)."
+    ),
+    CODE_WAIT_BULL: (
+        "Trend besar masih bullish (EMA50 > EMA200), namun momentum belum memberi sinyal kuat "
+        "(EMA10 belum cross up EMA20) atau harga belum cukup kuat di atas EMA20."
+    ),
+    CODE_WAIT_BEAR: (
+        "Trend besar masih bearish (EMA50 < EMA200), namun momentum belum memberi sinyal kuat "
+        "(EMA10 belum cross down EMA20) atau harga belum cukup lemah di bawah EMA20."
+    ),
+    CODE_WAIT: (
+        "Kondisi EMA dan RSI belum searah untuk setup BUY/SELL yang rapi. "
+        "Lebih aman menunggu struktur yang lebih jelas."
+    ),
+}
+
+# Panjang minimum data (setelah warm-up indikator) untuk generate_smart_signal
+MIN_SIGNAL_BARS = 60
+
+
+def _previous(arr):
+    """Geser satu bar ke belakang; bar pertama tidak punya bar sebelumnya (NaN)."""
+    prev = np.empty_like(arr, dtype=np.float64)
+    prev[0] = np.nan
+    prev[1:] = arr[:-1]
+    return prev
+
+
+def evaluate_signal_codes(
+    close,
+    ema_fast,
+    ema_slow,
+    ema_trend_fast,
+    ema_trend_slow,
+    rsi,
+    buy_band=(45, 80),
+    sell_band=(20, 55),
+):
+    """
+    Kode sinyal untuk setiap bar.
+
+    Default parameter = aturan generate_smart_signal:
+    ema_fast/ema_slow = EMA10/EMA20 (momentum), ema_trend_fast/ema_trend_slow
+    = EMA50/EMA200 (trend besar), band RSI BUY 45–80 dan SELL 20–55.
+    Perbandingan dengan NaN bernilai False, sama seperti versi per-baris.
+    Cek panjang data minimum (DATA KURANG) dilakukan oleh pemanggil.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    ema_fast = np.asarray(ema_fast, dtype=np.float64)
+    ema_slow = np.asarray(ema_slow, dtype=np.float64)
+    ema_trend_fast = np.asarray(ema_trend_fast, dtype=np.float64)
+    ema_trend_slow = np.asarray(ema_trend_slow, dtype=np.float64)
+    rsi = np.asarray(rsi, dtype=np.float64)
+
+    prev_fast = _previous(ema_fast)
+    prev_slow = _previous(ema_slow)
+
+    trend_bull = ema_trend_fast > ema_trend_slow
+    trend_bear = ema_trend_fast < ema_trend_slow
+
+    mom_bull = (ema_fast > ema_slow) & (prev_fast <= prev_slow)
+    mom_bear = (ema_fast < ema_slow) & (prev_fast >= prev_slow)
+
+    buy = (
+        trend_bull
+        & mom_bull
+        & (close > ema_slow)
+        & (rsi >= buy_band[0]) & (rsi <= buy_band[1])
+    )
+    sell = (
+        trend_bear
+        & mom_bear
+        & (close < ema_slow)
+        & (rsi >= sell_band[0]) & (rsi <= sell_band[1])
+    )
+
+    # urutan np.select mengikuti urutan if di generate_smart_signal
+    return np.select(
+        [buy, sell, trend_bull & ~mom_bull, trend_bear & ~mom_bear],
+        [CODE_BUY, CODE_SELL, CODE_WAIT_BULL, CODE_WAIT_BEAR],
+        default=CODE_WAIT,
+    ).astype(np.int8)
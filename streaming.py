@@ -0,0 +1,191 @@
+"""
+Indikator streaming: state EMA10/20/50/100/200 dan RSI-14 yang diperbarui
+O(1) per candle baru, untuk banyak ticker sekaligus.
+
+State disimpan sebagai array per ticker (panjang N), jadi satu update
+memproses candle baru semua ticker dengan beberapa operasi array saja.
+Hasilnya identik dengan compute_emas + compute_rsi + generate_smart_signal
+yang dihitung ulang dari nol pada frame lengkap.
+
+Contoh:
+    ind = StreamingIndicators.from_frames({"BTC-USD": df_btc, "ETH-USD": df_eth})
+    ind.update([64150.0, 3120.5])          # candle baru untuk kedua ticker
+    ind.update([64180.0, np.nan])          # hanya BTC yang punya candle baru
+    ind.update([64200.0, 3125.0], replace_last=True)  # candle berjalan berubah
+    label, reason = ind.signal("BTC-USD")
+"""
+import numpy as np
+import pandas as pd
+
+from scanner import EMA_SPANS, ema_2d, pack_closes
+from signal_rules import (
+    CODE_DATA_KURANG,
+    MIN_SIGNAL_BARS,
+    SIGNAL_LABELS,
+    SIGNAL_REASONS,
+    evaluate_signal_codes,
+)
+
+# state per ticker yang diubah satu candle (ring buffer RSI dicatat per slot)
+_UNDO_FIELDS = ("prev_fast", "prev_slow", "last_close", "pos", "bars")
+
+
+class StreamingIndicators:
+    """State indikator inkremental untuk daftar ``symbols``."""
+
+    def __init__(self, symbols, rsi_period: int = 14, spans=EMA_SPANS):
+        self.symbols = list(symbols)
+        self.rsi_period = rsi_period
+        self.spans = tuple(spans)
+        self._col = {s: i for i, s in enumerate(self.symbols)}
+
+        n = len(self.symbols)
+        self.alphas = np.array([2.0 / (span + 1.0) for span in self.spans])
+        self.ema = np.full((len(self.spans), n), np.nan)
+        self.prev_fast = np.full(n, np.nan)   # EMA10 bar sebelumnya
+        self.prev_slow = np.full(n, np.nan)   # EMA20 bar sebelumnya
+        self.last_close = np.full(n, np.nan)
+        self.gains = np.zeros((n, rsi_period))   # ring buffer gain/loss
+        self.losses = np.zeros((n, rsi_period))
+        self.pos = np.zeros(n, dtype=np.int64)   # slot ring buffer berikutnya per ticker
+        self.bars = np.zeros(n, dtype=np.int64)  # jumlah candle yang sudah masuk
+
+        # state sebelum candle terakhir tiap ticker, untuk replace_last
+        self._undo = {f: np.empty_like(getattr(self, f)) for f in _UNDO_FIELDS}
+        self._undo_ema = np.empty_like(self.ema)
+        self._undo_gain = np.zeros(n)
+        self._undo_loss = np.zeros(n)
+        self._can_replace = np.zeros(n, dtype=bool)
+
+    # ---------- seed dari histori ----------
+    @classmethod
+    def from_frames(cls, frames: dict, rsi_period: int = 14, spans=EMA_SPANS):
+        """Seed state dari {ticker: frame OHLCV} (dihitung sekali secara batch)."""
+        tickers, closes, lengths, _ = pack_closes(frames)
+        ind = cls(tickers, rsi_period=rsi_period, spans=spans)
+        if not len(tickers):
+            return ind
+
+        for k, span in enumerate(ind.spans):
+            ema = ema_2d(closes, span)
+            ind.ema[k] = ema[-1]
+            if span == 10:
+                ind.prev_fast = ema[-2].copy()
+            elif span == 20:
+                ind.prev_slow = ema[-2].copy()
+
+        delta = np.diff(closes, axis=0, prepend=np.nan)
+        window = delta[-rsi_period:]
+        if window.shape[0] < rsi_period:
+            pad = np.full((rsi_period - window.shape[0], window.shape[1]), np.nan)
+            window = np.vstack([pad, window])
+        ind.gains = np.where(window > 0, window, 0.0).T.copy()
+        ind.losses = np.where(window < 0, -window, 0.0).T.copy()
+        ind.last_close = closes[-1].copy()
+        ind.bars = lengths.copy()
+        return ind
+
+    @classmethod
+    def from_frame(cls, symbol, df: pd.DataFrame, rsi_period: int = 14, spans=EMA_SPANS):
+        return cls.from_frames({symbol: df}, rsi_period=rsi_period, spans=spans)
+
+    # ---------- update ----------
+    def _save(self, cols):
+        """Catat state kolom ``cols`` sebelum candle baru masuk (hanya kolom itu)."""
+        for f in _UNDO_FIELDS:
+            self._undo[f][cols] = getattr(self, f)[cols]
+        self._undo_ema[:, cols] = self.ema[:, cols]
+        slot = self.pos[cols]
+        self._undo_gain[cols] = self.gains[cols, slot]
+        self._undo_loss[cols] = self.losses[cols, slot]
+        self._can_replace[cols] = True
+
+    def _restore(self, cols):
+        """Kembalikan kolom ``cols`` ke state sebelum candle terakhirnya."""
+        for f in _UNDO_FIELDS:
+            getattr(self, f)[cols] = self._undo[f][cols]
+        self.ema[:, cols] = self._undo_ema[:, cols]
+        slot = self.pos[cols]
+        self.gains[cols, slot] = self._undo_gain[cols]
+        self.losses[cols, slot] = self._undo_loss[cols]
+
+    def update(self, closes, replace_last: bool = False):
+        """
+        Masukkan satu candle per ticker (array panjang N, urutan ``symbols``).
+        NaN = ticker itu tidak punya candle baru. ``replace_last=True``
+        mengganti candle terakhir (candle berjalan yang belum close) hanya
+        untuk ticker yang diberi harga; ticker NaN tidak berubah.
+        Return kode sinyal terbaru untuk semua ticker.
+        """
+        closes = np.asarray(closes, dtype=np.float64).reshape(len(self.symbols))
+        cols = np.nonzero(~np.isnan(closes))[0]
+        x = closes[cols]
+        if replace_last:
+            if not self._can_replace[cols].all():
+                raise ValueError("Belum ada candle yang bisa diganti.")
+            self._restore(cols)
+        else:
+            self._save(cols)
+
+        # EMA: bar pertama = harga itu sendiri (adjust=False)
+        fast = self.spans.index(10)
+        slow = self.spans.index(20)
+        self.prev_fast[cols] = self.ema[fast, cols]
+        self.prev_slow[cols] = self.ema[slow, cols]
+        old = self.ema[:, cols]
+        new = self.alphas[:, None] * x[None, :] + (1.0 - self.alphas[:, None]) * old
+        self.ema[:, cols] = np.where(np.isnan(old), x[None, :], new)
+
+        # RSI: gain/loss bar ini masuk ring buffer (bar pertama = 0, seperti diff() NaN)
+        delta = x - self.last_close[cols]
+        slot = self.pos[cols]
+        self.gains[cols, slot] = np.where(delta > 0, delta, 0.0)
+        self.losses[cols, slot] = np.where(delta < 0, -delta, 0.0)
+        self.pos[cols] = (slot + 1) % self.rsi_period
+
+        self.last_close[cols] = x
+        self.bars[cols] += 1
+        return self.codes()
+
+    def update_batch(self, closes_2d):
+        """Micro-batch: baris = candle berurutan, kolom = ticker. Return kode per baris."""
+        return np.vstack([self.update(row) for row in np.atleast_2d(closes_2d)])
+
+    # ---------- nilai & sinyal ----------
+    def rsi(self):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rs = self.gains.mean(axis=1) / self.losses.mean(axis=1)
+            rsi = 100 - (100 / (1 + rs))
+        return np.where(self.bars >= self.rsi_period, rsi, np.nan)
+
+    def codes(self):
+        """Kode sinyal (signal_rules) di candle terakhir untuk semua ticker."""
+        fast, slow = self.ema[self.spans.index(10)], self.ema[self.spans.index(20)]
+        trend_fast, trend_slow = self.ema[self.spans.index(50)], self.ema[self.spans.index(200)]
+        rsi = self.rsi()
+        nan = np.full_like(rsi, np.nan)
+
+        codes = evaluate_signal_codes(
+            np.vstack([nan, self.last_close]),
+            np.vstack([self.prev_fast, fast]),
+            np.vstack([self.prev_slow, slow]),
+            np.vstack([nan, trend_fast]),
+            np.vstack([nan, trend_slow]),
+            np.vstack([nan, rsi]),
+        )[-1]
+        enough = (self.bars - (self.rsi_period - 1)) >= MIN_SIGNAL_BARS
+        return np.where(enough, codes, CODE_DATA_KURANG).astype(np.int8)
+
+    def signal(self, symbol):
+        """(label, alasan) seperti generate_smart_signal untuk satu ticker."""
+        code = int(self.codes()[self._col[symbol]])
+        return SIGNAL_LABELS[code], SIGNAL_REASONS[code]
+
+    def snapshot(self) -> pd.DataFrame:
+        """Nilai indikator terbaru semua ticker sebagai tabel."""
+        table = pd.DataFrame({"Close": self.last_close}, index=pd.Index(self.symbols, name="Ticker"))
+        for k, span in enumerate(self.spans):
+            table[f"EMA{span}"] = self.ema[k]
+        table["RSI"] = self.rsi()
+        table["Sinyal"] = [SIGNAL_LABELS[int(c)] for c in self.codes()]
+        return table
@@ -0,0 +1,231 @@
+"""
+Indeks simbol offline per jenis pasar: autocomplete, validasi, dan alias
+ticker tanpa network, sehingga typo ketahuan sebelum request ke Yahoo.
+
+- Data    : file CSV bawaan (symbol_universe.csv: market_type, symbol,
+            yahoo, name, aliases dipisah "|"); bisa diganti lewat env
+            TRADING_ANALISA_SYMBOLS dan dimuat ulang dengan ``refresh()``.
+- Struktur: per pasar satu array kunci terurut (simbol + alias) untuk
+            prefix search dengan bisect, plus dict untuk lookup persis.
+- Resolve : simbol / alias yang dikenal -> kode Yahoo dari file; yang
+            tidak dikenal tapi formatnya masuk akal -> "unverified"
+            (kode dari map_ticker_to_yahoo, ditolak jika ``strict``);
+            format tidak valid -> "invalid" + saran simbol terdekat.
+
+Modul ini hanya memakai standard library.
+"""
+import bisect
+import csv
+import difflib
+import os
+import re
+import threading
+from dataclasses import dataclass
+
+from trading_core import map_ticker_to_yahoo
+
+DEFAULT_UNIVERSE_PATH = os.environ.get(
+    "TRADING_ANALISA_SYMBOLS", os.path.join(os.path.dirname(os.path.abspath(__file__)), "symbol_universe.csv")
+)
+
+# kode mata uang untuk validasi pasangan Forex (XAU/XAG = logam)
+CURRENCIES = frozenset(
+    "USD EUR GBP JPY CHF AUD NZD CAD IDR SGD HKD CNY CNH KRW INR MYR THB PHP TWD VND "
+    "SEK NOK DKK PLN CZK HUF TRY ZAR MXN BRL RUB SAR AED ILS XAU XAG".split()
+)
+
+_FORMATS = {
+    "Crypto": re.compile(r"[A-Z0-9]{2,15}-[A-Z]{3,4}"),
+    "Saham US": re.compile(r"\^?[A-Z]{1,5}([.-][A-Z]{1,2})?"),
+    "Saham Indonesia": re.compile(r"[A-Z]{4}|\^[A-Z0-9]{2,10}"),
+}
+
+STATUS_KNOWN = "known"
+STATUS_UNVERIFIED = "unverified"
+STATUS_INVALID = "invalid"
+
+
+@dataclass(frozen=True)
+class Symbol:
+    market_type: str
+    symbol: str
+    yahoo: str
+    name: str
+
+
+@dataclass(frozen=True)
+class Resolution:
+    ticker: str
+    market_type: str
+    status: str
+    yahoo: str = None
+    symbol: Symbol = None
+    suggestions: tuple = ()
+    other_markets: tuple = ()  # pasar lain yang mengenal ticker ini
+
+    @property
+    def ok(self) -> bool:
+        return self.status != STATUS_INVALID
+
+    def message(self) -> str:
+        if self.status == STATUS_KNOWN:
+            return f"{self.symbol.symbol} – {self.symbol.name} ({self.yahoo})"
+        hints = []
+        if self.other_markets:
+            hints.append(f"ticker ini dikenal di pasar {', '.join(self.other_markets)}")
+        if self.suggestions:
+            hints.append(f"mungkin maksud kamu: {', '.join(self.suggestions)}")
+        hint = f" ({'; '.join(hints)})" if hints else ""
+        if self.status == STATUS_UNVERIFIED:
+            return f"'{self.ticker}' tidak ada di daftar simbol {self.market_type}, tetap dicoba sebagai {self.yahoo}{hint}."
+        return f"'{self.ticker}' bukan ticker {self.market_type} yang valid{hint}."
+
+
+def normalize_key(ticker: str, market_type: str) -> str:
+    """Bentuk kunci: huruf besar, tanpa spasi / '/', tanpa akhiran =X (Forex) atau .JK (IDX)."""
+    key = re.sub(r"[\s/]", "", (ticker or "").upper())
+    if market_type == "Forex" and key.endswith("=X"):
+        key = key[:-2]
+    elif market_type == "Saham Indonesia" and key.endswith(".JK"):
+        key = key[:-3]
+    return key
+
+
+def plausible(key: str, market_type: str) -> bool:
+    """Apakah format kunci masuk akal untuk pasar ini (tanpa melihat daftar)."""
+    if market_type == "Forex":
+        return len(key) == 6 and key[:3] in CURRENCIES and key[3:] in CURRENCIES and key[:3] != key[3:]
+    pattern = _FORMATS.get(market_type)
+    return bool(pattern and pattern.fullmatch(key))
+
+
+def load_universe(path):
+    """Baca file CSV universe -> list Symbol dan {(pasar, simbol): alias}."""
+    symbols, aliases = [], {}
+    with open(path, encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            market = row["market_type"].strip()
+            sym = Symbol(market, row["symbol"].strip().upper(), row["yahoo"].strip(), row["name"].strip())
+            symbols.append(sym)
+            aliases[(market, sym.symbol)] = [a.strip() for a in (row.get("aliases") or "").split("|") if a.strip()]
+    return symbols, aliases
+
+
+class _MarketTable:
+    """Kunci terurut + target per pasar (immutable setelah dibuat)."""
+
+    def __init__(self, entries):
+        pairs = sorted(entries.items())
+        self.keys = [k for k, _ in pairs]
+        self.targets = [s for _, s in pairs]
+        self.exact = entries
+        self.symbols = sorted({s.symbol for s in entries.values()})
+
+
+class SymbolIndex:
+    """Indeks simbol per jenis pasar; semua operasi lokal (mikrodetik)."""
+
+    def __init__(self, symbols=(), aliases=None, path=None):
+        self.path = path
+        self._mtime = None
+        self._lock = threading.Lock()
+        self._tables = self._build(symbols, aliases or {})
+
+    @classmethod
+    def from_file(cls, path=DEFAULT_UNIVERSE_PATH):
+        index = cls(path=path)
+        index.refresh(force=True)
+        return index
+
+    @staticmethod
+    def _build(symbols, aliases):
+        entries = {}
+        for sym in symbols:
+            table = entries.setdefault(sym.market_type, {})
+            for key in [sym.symbol] + aliases.get((sym.market_type, sym.symbol), []):
+                table.setdefault(normalize_key(key, sym.market_type), sym)
+        return {market: _MarketTable(table) for market, table in entries.items()}
+
+    def refresh(self, force: bool = False) -> bool:
+        """Muat ulang dari ``path`` jika file berubah; return True jika dimuat ulang."""
+        if self.path is None:
+            return False
+        mtime = os.stat(self.path).st_mtime_ns
+        if not force and mtime == self._mtime:
+            return False
+        tables = self._build(*load_universe(self.path))
+        with self._lock:
+            self._tables, self._mtime = tables, mtime
+        return True
+
+    def markets(self):
+        return sorted(self._tables)
+
+    def __len__(self):
+        return sum(len(t.symbols) for t in self._tables.values())
+
+    # ---------- query ----------
+    def lookup(self, ticker: str, market_type: str):
+        """Symbol untuk simbol / alias persis, atau None."""
+        table = self._tables.get(market_type)
+        return table.exact.get(normalize_key(ticker, market_type)) if table else None
+
+    def complete(self, prefix: str, market_type: str, limit: int = 10):
+        """Simbol yang simbol / aliasnya diawali ``prefix`` (urut abjad kunci, tanpa duplikat)."""
+        table = self._tables.get(market_type)
+        if table is None:
+            return []
+        key = normalize_key(prefix, market_type)
+        out, seen = [], set()
+        for i in range(bisect.bisect_left(table.keys, key), len(table.keys)):
+            if not table.keys[i].startswith(key) or len(out) >= limit:
+                break
+            sym = table.targets[i]
+            if sym.symbol not in seen:
+                seen.add(sym.symbol)
+                out.append(sym)
+        return out
+
+    def suggest(self, ticker: str, market_type: str, limit: int = 5):
+        """Simbol terdekat untuk ticker yang tidak dikenal (prefix dulu, lalu kemiripan ejaan)."""
+        table = self._tables.get(market_type)
+        if table is None:
+            return ()
+        key = normalize_key(ticker, market_type)
+        found = [s.symbol for s in self.complete(key, market_type, limit)]
+        if len(found) < limit:
+            for close in difflib.get_close_matches(key, table.keys, n=limit, cutoff=0.6):
+                sym = table.exact[close].symbol
+                if sym not in found:
+                    found.append(sym)
+        return tuple(found[:limit])
+
+    def resolve(self, ticker: str, market_type: str, strict: bool = False) -> Resolution:
+        """Validasi + alias -> Resolution (lihat docstring modul)."""
+        raw = (ticker or "").strip()
+        sym = self.lookup(raw, market_type)
+        if sym is not None:
+            return Resolution(raw, market_type, STATUS_KNOWN, sym.yahoo, sym)
+
+        key = normalize_key(raw, market_type)
+        suggestions = self.suggest(raw, market_type) if key else ()
+        others = tuple(m for m in self.markets() if m != market_type and self.lookup(raw, m) is not None)
+        if key and plausible(key, market_type) and not strict:
+            return Resolution(
+                raw, market_type, STATUS_UNVERIFIED, map_ticker_to_yahoo(raw, market_type),
+                suggestions=suggestions, other_markets=others,
+            )
+        return Resolution(raw, market_type, STATUS_INVALID, suggestions=suggestions, other_markets=others)
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_index() -> SymbolIndex:
+    """Indeks bersama dari DEFAULT_UNIVERSE_PATH (dimuat sekali)."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = SymbolIndex.from_file(DEFAULT_UNIVERSE_PATH)
+        return _default
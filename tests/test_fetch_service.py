@@ -0,0 +1,44 @@
+import pandas as pd
+
+from fetch_service import FetchService
+from ohlcv_store import OHLCV_COLUMNS, FakeFetcher
+
+NOW = 1_700_000_000.0
+
+
+class EmptyFirstFetcher(FakeFetcher):
+    """Seperti yf.download saat rate limit: ``empty`` panggilan pertama kosong, tanpa exception."""
+
+    def __init__(self, empty, **kwargs):
+        super().__init__(**kwargs)
+        self.empty = empty
+
+    def fetch(self, ticker, interval, period=None, start=None, end=None):
+        frame = super().fetch(ticker, interval, period=period, start=start, end=end)
+        if len(self.calls) <= self.empty:
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+        return frame
+
+
+def test_empty_result_is_retried():
+    upstream = EmptyFirstFetcher(empty=2, clock=lambda: NOW)
+    service = FetchService(upstream, retries=3, sleep=lambda s: None)
+    try:
+        frame = service.fetch("BTC-USD", "1d", period="1mo")
+    finally:
+        service.shutdown()
+    assert not frame.empty
+    assert service.upstream_calls == 3
+
+
+def test_empty_result_is_returned_after_retries():
+    upstream = EmptyFirstFetcher(empty=10, clock=lambda: NOW)
+    service = FetchService(upstream, retries=2, sleep=lambda s: None)
+    try:
+        frame = service.fetch("BTC-USD", "1d", period="1mo")
+        frames = service.fetch_many(["BTC-USD", "ETH-USD"], "1d", "1mo")
+    finally:
+        service.shutdown()
+    assert frame.empty
+    assert all(f.empty for f in frames.values())
+    assert service.upstream_calls == 6
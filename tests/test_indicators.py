@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from indicators import IndicatorCache, LazyIndicators, data_version
+
+
+def _frame(close):
+    index = pd.date_range("2024-01-01", periods=len(close), freq="1D", tz="UTC")
+    return pd.DataFrame({"Close": close}, index=index)
+
+
+def test_frames_differing_only_in_the_middle_do_not_share_memo():
+    base = np.full(300, 50.0)  # mis. saham IDX tertahan di harga Rp50
+    other = base.copy()
+    other[100:150] = 80.0
+    a, b = _frame(base), _frame(other)
+    assert data_version(a) != data_version(b)
+
+    cache = IndicatorCache()
+    ema_a = LazyIndicators(a, cache=cache).get("EMA50")
+    lazy_b = LazyIndicators(b, cache=cache)
+    ema_b = lazy_b.get("EMA50")
+
+    assert ("EMA", (50,)) in lazy_b.computed
+    expected = b["Close"].ewm(span=50, adjust=False).mean().to_numpy()
+    np.testing.assert_allclose(ema_b, expected)
+    assert not np.allclose(ema_a, ema_b)
+
+
+def test_same_data_is_served_from_memo():
+    close = np.linspace(100.0, 120.0, 200)
+    cache = IndicatorCache()
+    LazyIndicators(_frame(close), cache=cache).get("RSI")
+    again = LazyIndicators(_frame(close.copy()), cache=cache)
+    again.get("RSI")
+    assert again.computed == []
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+from ohlcv_store import OHLCV_COLUMNS, FakeFetcher, OHLCVStore
+
+NOW = 1_700_000_000.0
+
+
+class FlakyFetcher(FakeFetcher):
+    """FakeFetcher yang mengembalikan frame kosong untuk jendela yang mulai di [lo, hi)."""
+
+    def __init__(self, lo, hi, **kwargs):
+        super().__init__(**kwargs)
+        self.lo, self.hi = lo, hi
+
+    def fetch(self, ticker, interval, period=None, start=None, end=None):
+        frame = super().fetch(ticker, interval, period=period, start=start, end=end)
+        if start is not None and self.lo <= pd.Timestamp(start).timestamp() < self.hi:
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+        return frame
+
+
+def test_empty_backfill_window_is_not_marked_covered(tmp_path):
+    clock = lambda: NOW
+    # jendela kedua dari lima (mulai ~549 hari lalu) gagal diam-diam
+    flaky = FlakyFetcher(NOW - 600 * 86400, NOW - 500 * 86400, clock=clock)
+    store = OHLCVStore(root=str(tmp_path), fetcher=flaky, clock=clock)
+
+    holey = store.get("BTC-USD", "2y", "1h")
+    gaps = np.diff(holey.index.asi8) // 10**9
+    assert gaps.max() > 3600
+
+    healthy = FakeFetcher(clock=clock)
+    store = OHLCVStore(root=str(tmp_path), fetcher=healthy, clock=clock)
+    repaired = store.get("BTC-USD", "2y", "1h")
+
+    assert healthy.calls  # lubang diunduh ulang, bukan dianggap sudah tercakup
+    assert (np.diff(repaired.index.asi8) // 10**9).max() == 3600
+    assert repaired.index[0] == holey.index[0]
+
+
+def test_get_many_serves_fresh_tickers_from_disk(tmp_path):
+    clock = lambda: NOW
+    fetcher = FakeFetcher(clock=clock)
+    store = OHLCVStore(root=str(tmp_path), fetcher=fetcher, clock=clock)
+
+    first = store.get_many(["AAA", "BBB", "AAA"], "1y", "1d")
+    assert list(first) == ["AAA", "BBB"]
+    assert len(fetcher.calls) == 2  # dari satu fetch_many
+
+    again = store.get_many(["AAA", "BBB"], "1y", "1d")
+    assert len(fetcher.calls) == 2
+    pd.testing.assert_frame_equal(again["BBB"], first["BBB"])
+
+
+class EmptyOnceFetcher(FakeFetcher):
+    """FakeFetcher yang mengembalikan frame kosong untuk ``fail`` request pertama."""
+
+    def __init__(self, fail=1, **kwargs):
+        super().__init__(**kwargs)
+        self.fail = fail
+
+    def fetch(self, ticker, interval, period=None, start=None, end=None):
+        frame = super().fetch(ticker, interval, period=period, start=start, end=end)
+        if len(self.calls) <= self.fail:
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+        return frame
+
+
+def test_empty_full_period_fetch_is_not_marked_covered(tmp_path):
+    clock = lambda: NOW
+    store = OHLCVStore(root=str(tmp_path), fetcher=FakeFetcher(clock=clock), clock=clock)
+    short = store.get("BTC-USD", "1mo", "1d")
+
+    store = OHLCVStore(root=str(tmp_path), fetcher=EmptyOnceFetcher(clock=clock), clock=clock)
+    served = store.get("BTC-USD", "1y", "1d")
+    pd.testing.assert_frame_equal(served, short)
+
+    healthy = FakeFetcher(clock=clock)
+    store = OHLCVStore(root=str(tmp_path), fetcher=healthy, clock=clock)
+    full = store.get("BTC-USD", "1y", "1d")
+
+    assert healthy.calls  # periode penuh diminta lagi
+    assert len(full) > len(short)
+    assert full.index[0] < short.index[0]
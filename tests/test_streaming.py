@@ -0,0 +1,24 @@
+import numpy as np
+
+from ohlcv_store import FakeFetcher
+from streaming import StreamingIndicators
+
+
+def _frames():
+    fetcher = FakeFetcher(clock=lambda: 1_700_000_000.0)
+    return {t: fetcher.fetch(t, "1d", period="1y") for t in ("A", "B")}
+
+
+def test_replace_last_leaves_nan_tickers_untouched():
+    frames = _frames()
+    ind = StreamingIndicators.from_frames(frames)
+    ind.update([101.0, 102.0])
+    ind.update([101.5, np.nan], replace_last=True)
+
+    expected = StreamingIndicators.from_frames(frames)
+    expected.update([101.5, 102.0])
+
+    np.testing.assert_array_equal(ind.bars, expected.bars)
+    np.testing.assert_array_equal(ind.last_close, expected.last_close)
+    np.testing.assert_allclose(ind.ema, expected.ema)
+    np.testing.assert_allclose(ind.rsi(), expected.rsi())
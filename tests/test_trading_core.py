@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from trading_core import analyze_frame, compute_indicators
+
+
+def _frame(close):
+    index = pd.date_range("2024-01-01", periods=len(close), freq="1D", tz="UTC")
+    close = np.asarray(close, dtype=np.float64)
+    return pd.DataFrame(
+        {"Open": close, "High": close, "Low": close, "Close": close, "Volume": 1000},
+        index=index,
+    )
+
+
+def test_nan_close_is_rejected():
+    close = np.linspace(100.0, 120.0, 300)
+    close[150] = np.nan
+    with pytest.raises(ValueError, match="NaN"):
+        compute_indicators(close)
+    with pytest.raises(ValueError, match="NaN"):
+        analyze_frame(_frame(close))
+
+
+def test_indicators_match_pandas_ewm():
+    close = 100 + np.cumsum(np.random.default_rng(3).normal(0, 1, 500))
+    out = compute_indicators(close, dtype="float64")
+    expected = pd.Series(close).ewm(span=20, adjust=False).mean().to_numpy()
+    np.testing.assert_allclose(out[1], expected, rtol=1e-10)
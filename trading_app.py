@@ -1,188 +1,264 @@
-import streamlit as st
-import yfinance as yf
-import pandas as pd
+import time
+
 import numpy as np
-import plotly.graph_objects as go
-from PIL import Image
+import pandas as pd
+import streamlit as st
+
+from backfill import needs_backfill
+from backtest import backtest_signals
+from chart_render import (
+    CHART_EMA_COLUMNS,
+    CHART_INDICATORS,
+    DEFAULT_MAX_BARS,
+    build_correlation_figure,
+    build_price_figure,
+    downsample_series,
+    visible_window,
+)
+from fetch_service import FetchService
+from image_pipeline import ThumbnailCache, content_key, make_thumbnail
+from indicators import IndicatorCache, LazyIndicators
+from instrumentation import NULL_TIMER, StageTimer, log_timings, profile_call
+from multi_timeframe import (
+    TIMEFRAMES,
+    base_interval,
+    confluence_matrix,
+    confluence_summary,
+    multi_timeframe_analysis,
+    period_supported,
+)
+from monte_carlo import simulate_risk_of_ruin
+from ohlcv_store import MAX_LOOKBACK_DAYS, OHLCVStore, YahooFetcher, period_to_seconds
+from portfolio import PortfolioBook, cap_exposure, correlation_from_cov, return_matrix, size_positions
+from scanner import scan_watchlist
+from symbol_index import STATUS_UNVERIFIED, default_index
+from signal_rules import CODE_BUY, CODE_SELL
+from trading_core import (
+    SUMMARY_INDICATORS,
+    analyze_frame_full,
+    compute_position_sizing,
+    position_from_entry_sl,
+    signal_log,
+    signal_timeline,
+)
+
 
 # =========================
-# FUNGSI MAPPING TICKER → YAHOO FINANCE
+# SUMBER DATA
 # =========================
-def map_ticker_to_yahoo(ticker: str, market_type: str) -> str:
+@st.cache_resource
+def get_fetch_service():
     """
-    Mengubah kode yang kamu ketik jadi kode yang dimengerti Yahoo Finance.
-    - Forex : EURUSD -> EURUSD=X, XAUUSD -> GC=F, dll.
-    - Saham Indonesia : BBCA -> BBCA.JK
+    Satu layanan fetch untuk semua sesi: rate limit global, retry, dan
+    request identik yang sedang berjalan digabung jadi satu ke Yahoo.
     """
-    if not ticker:
-        return ticker
+    return FetchService(YahooFetcher())
 
-    t = ticker.strip().upper()
 
-    if market_type == "Forex":
-        special_map = {
-            "XAUUSD": "GC=F",  # emas
-            "XAGUSD": "SI=F",  # silver
-        }
-        if t in special_map:
-            return special_map[t]
+@st.cache_resource
+def get_ohlcv_store():
+    """Satu store candle lokal dipakai bersama oleh semua sesi."""
+    return OHLCVStore(fetcher=get_fetch_service())
 
-        if not t.endswith("=X"):
-            return t + "=X"
-        return t
 
-    elif market_type == "Saham Indonesia":
-        if not t.endswith(".JK"):
-            return t + ".JK"
-        return t
+@st.cache_resource
+def get_symbol_index():
+    """Daftar simbol lokal (validasi + alias + autocomplete tanpa network)."""
+    return default_index()
 
-    else:
-        # Crypto & Saham US biasanya langsung pakai saja
-        return t
 
+def resolve_ticker(ticker: str, market: str):
+    """Kode Yahoo untuk input ticker (alias dipetakan), atau None jika tidak valid."""
+    return get_symbol_index().resolve(ticker, market).yahoo
 
-# =========================
-# FUNGSI INDIKATOR & RISK
-# =========================
-def compute_rsi(series, period: int = 14):
-    delta = series.diff()
-    gain = np.where(delta > 0, delta, 0)
-    loss = np.where(delta < 0, -delta, 0)
 
-    gain_rol = pd.Series(gain, index=series.index).rolling(window=period).mean()
-    loss_rol = pd.Series(loss, index=series.index).rolling(window=period).mean()
+def resolve_or_report(ticker: str, market: str):
+    """
+    Seperti resolve_ticker, tapi menampilkan error + saran untuk ticker yang
+    tidak valid (tanpa request ke Yahoo) dan catatan untuk ticker di luar daftar.
+    """
+    resolution = get_symbol_index().resolve(ticker, market)
+    if not resolution.ok:
+        st.error(resolution.message())
+    elif resolution.status == STATUS_UNVERIFIED:
+        st.caption(resolution.message())
+    return resolution.yahoo
+
+
+def render_symbol_matches(ticker: str, market: str):
+    """Autocomplete sederhana di bawah input ticker: simbol yang cocok dengan prefix."""
+    index = get_symbol_index()
+    if not ticker or index.lookup(ticker, market) is not None:
+        return
+    matches = index.complete(ticker, market, limit=6)
+    if matches:
+        st.caption("Cocok: " + " · ".join(f"{m.symbol} ({m.name})" for m in matches))
+
+
+@st.cache_resource
+def get_indicator_cache():
+    """
+    Memo indikator bersama (per versi data + parameter): panel yang meminta
+    indikator yang sudah dihitung panel lain tidak menghitung ulang.
+    """
+    return IndicatorCache(max_entries=256)
+
 
-    rs = gain_rol / loss_rol
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
+@st.cache_data(ttl=300, max_entries=32, show_spinner=False)
+def load_multi_timeframe(yahoo_ticker: str, period: str, timeframes: tuple):
+    """Satu download di interval terhalus, timeframe lain dibentuk lokal."""
+    base = base_interval(timeframes)
+    data = get_ohlcv_store().get(yahoo_ticker, period, base)
+    if data.empty:
+        return base, {}
+    return base, multi_timeframe_analysis(data, base, timeframes)
 
 
-def compute_emas(df: pd.DataFrame) -> pd.DataFrame:
-    """Tambahkan EMA 10/20/50/100/200 ke dataframe."""
-    close = df["Close"]
-    df["EMA10"] = close.ewm(span=10, adjust=False).mean()
-    df["EMA20"] = close.ewm(span=20, adjust=False).mean()
-    df["EMA50"] = close.ewm(span=50, adjust=False).mean()
-    df["EMA100"] = close.ewm(span=100, adjust=False).mean()
-    df["EMA200"] = close.ewm(span=200, adjust=False).mean()
-    return df
+def compute_analysis(yahoo_ticker: str, period: str, interval: str, timer=NULL_TIMER):
+    """Data + indikator + sinyal tanpa cache (dipakai juga untuk profil)."""
+    with timer.stage("fetch"):
+        data = get_ohlcv_store().get(yahoo_ticker, period, interval)
+    if data.empty:
+        return data, data, None, None
+    # data = frame penuh berindikator (sinyal + grafik); data_ind = view di atasnya
+    return analyze_frame_full(data, timer=timer, extra=CHART_INDICATORS, cache=get_indicator_cache())
 
 
-def generate_smart_signal(df: pd.DataFrame):
+@st.cache_data(ttl=300, max_entries=64, show_spinner=False)
+def load_analysis(yahoo_ticker: str, period: str, interval: str):
     """
-    Sinyal lebih ketat berbasis EMA + RSI:
-    - BUY: trend bullish (EMA50 > EMA200), momentum bullish (EMA10 crossover up EMA20),
-      harga di atas EMA20, RSI di 45–70
-    - SELL: trend bearish (EMA50 < EMA200), momentum bearish (EMA10 crossover down EMA20),
-      harga di bawah EMA20, RSI di 30–55
+    Data + indikator + sinyal untuk satu (ticker, periode, interval).
+    Di-cache lintas sesi (maks. 64 entri, kedaluwarsa 5 menit), jadi
+    sesi lain yang meminta ticker yang sama tidak mengulang download
+    maupun perhitungan indikator. Return juga timing tiap tahap saat
+    hasil ini pertama kali dihitung.
+
+    Yang di-cache hanya frame indikator penuh + offset warm-up; data_ind
+    adalah view di atasnya (lihat split_analysis), jadi tidak ada salinan
+    kedua saat cache di-pickle.
     """
-    if len(df) < 60:
-        return "DATA KURANG", "Data belum cukup panjang untuk analisis EMA & RSI."
-
-    last = df.iloc[-1]
-    prev = df.iloc[-2]
-
-    # Trend besar
-    trend_bull = last["EMA50"] > last["EMA200"]
-    trend_bear = last["EMA50"] < last["EMA200"]
-
-    # Momentum (crossover EMA10 - EMA20)
-    mom_bull = last["EMA10"] > last["EMA20"] and prev["EMA10"] <= prev["EMA20"]
-    mom_bear = last["EMA10"] < last["EMA20"] and prev["EMA10"] >= prev["EMA20"]
-
-    price_above_ema20 = last["Close"] > last["EMA20"]
-    price_below_ema20 = last["Close"] < last["EMA20"]
-
-    rsi = last["RSI"]
-
-        # BUY setup ketat (RSI 45–80, overbought di atas 80)
-    if (
-        trend_bull
-        and mom_bull
-        and price_above_ema20
-        and 45 <= rsi <= 80
-    ):
-        return "BUY", (
-            "Trend besar bullish (EMA50 > EMA200), momentum baru menguat "
-            "(EMA10 cross up EMA20), harga di atas EMA20, dan RSI mendukung (45–80)."
-        )
+    timer = StageTimer()
+    data, data_ind, signal, reason = compute_analysis(yahoo_ticker, period, interval, timer=timer)
+    return data, len(data) - len(data_ind), signal, reason, timer.stages
 
-    # SELL setup ketat (RSI 20–55, oversold di bawah 20)
-    if (
-        trend_bear
-        and mom_bear
-        and price_below_ema20
-        and 20 <= rsi <= 55
-    ):
-        return "SELL", (
-            "Trend besar bearish (EMA50 < EMA200), momentum baru melemah "
-            "(EMA10 cross down EMA20), harga di bawah EMA20, dan RSI mendukung (20–55)."
-        )
 
+def split_analysis(data, warmup: int):
+    """(frame penuh, view mulai bar warm-up) dari hasil load_analysis."""
+    return data, data.iloc[warmup:]
 
-    # SELL setup ketat
-    if (
-        trend_bear
-        and mom_bear
-        and price_below_ema20
-        and 30 <= rsi <= 55
-    ):
-        return "SELL", (
-            "Trend besar bearish (EMA50 < EMA200), momentum baru melemah "
-            "(EMA10 cross down EMA20), harga di bawah EMA20, dan RSI mendukung (30–55)."
-        )
 
-    # WAIT (penjelasan berdasarkan kondisi)
-    if trend_bull and not mom_bull:
-        return "WAIT", (
-            "Trend besar masih bullish (EMA50 > EMA200), namun momentum belum memberi sinyal kuat "
-            "(EMA10 belum cross up EMA20) atau harga belum cukup kuat di atas EMA20."
-        )
-    if trend_bear and not mom_bear:
-        return "WAIT", (
-            "Trend besar masih bearish (EMA50 < EMA200), namun momentum belum memberi sinyal kuat "
-            "(EMA10 belum cross down EMA20) atau harga belum cukup lemah di bawah EMA20."
-        )
-
-    return "WAIT", (
-        "Kondisi EMA dan RSI belum searah untuk setup BUY/SELL yang rapi. "
-        "Lebih aman menunggu struktur yang lebih jelas."
-    )
+# =========================
+# GAMBAR (LOGO & SCREENSHOT)
+# =========================
+@st.cache_resource
+def load_logo():
+    """Logo diperkecil sekali per proses (file asli 1024 px, tampil 160 px)."""
+    with open("app_logo.png", "rb") as f:
+        return make_thumbnail(f.read(), max_side=320).data
 
 
-def compute_position_sizing(balance, risk_pct, stop_pct, price):
-    if balance <= 0 or risk_pct <= 0 or stop_pct <= 0 or price <= 0:
-        return None, None, None, None
+@st.cache_resource
+def get_thumbnail_cache():
+    """Thumbnail screenshot bersama semua sesi, dibatasi total ukuran (LRU)."""
+    return ThumbnailCache()
 
-    risk_amount = balance * (risk_pct / 100.0)
-    risk_per_unit = price * (stop_pct / 100.0)
 
-    if risk_per_unit == 0:
-        return None, None, None, None
+def screenshot_thumbnail(uploaded):
+    """
+    Thumbnail untuk file upload. Hash isi dihitung sekali per file upload
+    (disimpan di sesi), rerun berikutnya hanya lookup cache tanpa decode.
+    """
+    upload_id = getattr(uploaded, "file_id", None) or (uploaded.name, uploaded.size)
+    known = st.session_state.get("screenshot_key")
+    if known is None or known[0] != upload_id:
+        known = (upload_id, content_key(uploaded.getvalue()))
+        st.session_state["screenshot_key"] = known
+    return get_thumbnail_cache().get(known[1], uploaded.getvalue)
 
-    qty = risk_amount / risk_per_unit
-    sl_price = price * (1 - stop_pct / 100.0)
-    tp_price = price + (price - sl_price) * 2
-    return risk_amount, qty, sl_price, tp_price
 
+# =========================
+# SIMULASI MONTE CARLO (RISK OF RUIN)
+# =========================
+MC_PATH_OPTIONS = [10_000, 100_000, 1_000_000]
+MC_TIME_BUDGET = 2.0  # detik; jalur yang belum jalan saat anggaran habis dilewati
 
-def position_from_entry_sl(balance, risk_pct, entry_price, sl_price, tp_price=None):
-    """Dipakai di mode screenshot: hitung size dari entry & SL."""
-    if balance <= 0 or risk_pct <= 0:
-        return None, None, None
 
-    if entry_price <= 0 or sl_price <= 0 or entry_price == sl_price:
-        return None, None, None
+@st.cache_data(ttl=600, max_entries=32, show_spinner=False)
+def run_monte_carlo(balance, risk_pct, win_rate, rr, n_trades, n_paths, ruin_pct, compound):
+    """Simulasi dengan seed tetap, jadi parameter yang sama selalu memberi hasil yang sama."""
+    return simulate_risk_of_ruin(
+        balance, risk_pct, win_rate, rr,
+        n_trades=n_trades, n_paths=n_paths, ruin_pct=ruin_pct, compound=compound,
+        time_budget=MC_TIME_BUDGET, seed=0,
+    )
 
-    risk_amount = balance * (risk_pct / 100.0)
-    risk_per_unit = abs(entry_price - sl_price)
-    qty = risk_amount / risk_per_unit
 
-    rr = None
-    if tp_price and tp_price != entry_price and tp_price > 0:
-        rr = abs(tp_price - entry_price) / abs(entry_price - sl_price)
+def render_monte_carlo(key: str, balance: float, risk_pct: float, rr: float, default_win_rate: float, note: str):
+    """Expander simulasi Monte Carlo; hasil disimpan di sesi per ``key``."""
+    with st.expander("🎲 Simulasi Monte Carlo (risk of ruin)"):
+        st.caption(note)
+        mc_col1, mc_col2, mc_col3, mc_col4 = st.columns(4)
+        with mc_col1:
+            win_rate_pct = st.slider(
+                "Win rate (%)", min_value=5, max_value=95,
+                value=int(round(min(max(default_win_rate, 0.05), 0.95) * 100)), key=f"{key}_mc_win_rate"
+            )
+        with mc_col2:
+            n_trades = st.selectbox("Jumlah trade", [50, 100, 200, 500, 1000], index=2, key=f"{key}_mc_trades")
+        with mc_col3:
+            n_paths = st.selectbox(
+                "Jumlah simulasi", MC_PATH_OPTIONS, index=1,
+                format_func=lambda n: f"{n:,}", key=f"{key}_mc_paths"
+            )
+        with mc_col4:
+            ruin_pct = st.slider(
+                "Batas ruin (drawdown %)", min_value=10, max_value=90, value=50, step=5, key=f"{key}_mc_ruin"
+            )
+        compound = st.checkbox(
+            "Risiko dihitung dari equity berjalan (compounding)", value=True, key=f"{key}_mc_compound"
+        )
 
-    return risk_amount, qty, rr
+        params = (balance, risk_pct, win_rate_pct / 100.0, rr, n_trades, n_paths, float(ruin_pct), compound)
+        if st.button("🎲 Jalankan simulasi", key=f"{key}_mc_run"):
+            if balance <= 0:
+                st.error("Isi total modal terlebih dahulu.")
+            else:
+                with st.spinner("Menjalankan simulasi ..."):
+                    st.session_state[f"{key}_mc"] = (params, run_monte_carlo(*params))
+
+        stored = st.session_state.get(f"{key}_mc")
+        if stored is None:
+            return
+        if stored[0] != params:
+            st.info("Parameter berubah. Klik tombol untuk menjalankan ulang simulasi.")
+            return
+
+        result = stored[1]
+        stats = result.stats
+        mc1, mc2, mc3, mc4 = st.columns(4)
+        mc1.metric(f"Risk of ruin (≥{ruin_pct}% DD)", f"{stats['risk_of_ruin'] * 100:.2f}%")
+        mc2.metric("Peluang akhir rugi", f"{stats['prob_loss'] * 100:.1f}%")
+        mc3.metric("Equity akhir (median)", f"{stats['median_final_equity']:,.2f}")
+        mc4.metric("Max drawdown P95", f"{stats['drawdown_percentiles'].get('P95', float('nan')):.1f}%")
+
+        st.markdown("**Persentil equity per trade**")
+        st.line_chart(result.equity_percentiles)
+
+        st.markdown("**Distribusi max drawdown**")
+        hist = result.drawdown_hist
+        upper = hist[hist > 0].index.max()
+        st.bar_chart(hist[hist.index <= upper])
+
+        prob_dd = " · ".join(f"≥{level}%: {p * 100:.1f}%" for level, p in stats["prob_drawdown"].items())
+        st.caption(
+            f"{result.paths:,} jalur x {n_trades} trade dalam {stats['seconds']:.2f} detik. "
+            f"Ekspektasi {stats['expectancy_r']:+.2f} R per trade. Peluang max drawdown {prob_dd}."
+        )
+        if result.paths < n_paths:
+            st.caption(
+                f"Anggaran waktu {MC_TIME_BUDGET:g} detik tercapai; hasil memakai {result.paths:,} "
+                f"dari {n_paths:,} jalur."
+            )
 
 
 # =========================
@@ -193,10 +269,7 @@ st.set_page_config(
     layout="wide"
 )
 
-from PIL import Image
-
-logo = Image.open("app_logo.png")
-st.sidebar.image(logo, width=160)
+st.sidebar.image(load_logo(), width=160)
 
 # =========================
 # SIDEBAR
@@ -290,6 +363,20 @@ with st.sidebar:
         "bukan saran finansial."
     )
 
+    st.markdown("---")
+    st.markdown("### Debug")
+    show_timings = st.checkbox(
+        "Tampilkan waktu per tahap",
+        value=False,
+        help="Fetch, indikator, warm-up, sinyal, figure & render grafik (Mode 1)."
+    )
+    profile_next_run = st.checkbox(
+        "Profil sekali jalan (cProfile + tracemalloc)",
+        value=False,
+        disabled=not show_timings,
+        help="Analisis berikutnya dihitung ulang tanpa cache di bawah profiler. Lebih lambat."
+    )
+
 # =========================
 # HEADER & MODE
 # =========================
@@ -304,7 +391,13 @@ st.markdown(
 
 mode = st.radio(
     "Pilih cara analisis:",
-    ["📡 Data harga (Yahoo Finance)", "🖼️ Screenshot dari TradingView"],
+    [
+        "📡 Data harga (Yahoo Finance)",
+        "🖼️ Screenshot dari TradingView",
+        "📋 Watchlist scanner",
+        "🧭 Multi-timeframe",
+        "💼 Risiko portofolio",
+    ],
     horizontal=True
 )
 
@@ -321,10 +414,11 @@ if mode.startswith("📡"):
             "Ticker / Kode (lihat contoh di sidebar)",
             value="BTC-USD"
         )
+        render_symbol_matches(ticker, market_type)
     with top_col2:
         period = st.selectbox(
             "Periode data",
-            ["1mo", "3mo", "6mo", "1y"],
+            ["1mo", "3mo", "6mo", "1y", "2y", "5y"],
             index=1
         )
     with top_col3:
@@ -334,143 +428,310 @@ if mode.startswith("📡"):
             index=0
         )
 
+    if needs_backfill(interval, 0.0, period_to_seconds(period)):
+        lookback = MAX_LOOKBACK_DAYS.get(interval)
+        st.caption(
+            f"Periode panjang untuk {interval} diunduh per jendela lalu disimpan lokal. "
+            + (
+                f"Yahoo hanya menyediakan ±{lookback} hari terakhir; histori yang lebih tua "
+                "tersedia sejauh sudah pernah tersimpan di store."
+                if lookback is not None and period_to_seconds(period) > lookback * 86400 else ""
+            )
+        )
+
     run_btn = st.button("🚀 Ambil & Analisis Data", type="primary")
 
     if run_btn:
+        yahoo_ticker = resolve_or_report(ticker, market_type) if ticker else None
         if not ticker:
             st.error("Masukkan ticker terlebih dahulu.")
-        else:
-            yahoo_ticker = map_ticker_to_yahoo(ticker, market_type)
-
+        elif yahoo_ticker is not None:
+            load_timer = StageTimer()
+            profile_report = None
             with st.spinner(f"Mengambil data untuk {yahoo_ticker} ..."):
-                data = yf.download(yahoo_ticker, period=period, interval=interval)
-
-            if data.empty:
-                st.error("Data tidak ditemukan. Coba ticker atau periode lain.")
-            else:
-                if isinstance(data.columns, pd.MultiIndex):
-                    data.columns = data.columns.get_level_values(0)
-
-                st.success(f"Data berhasil diambil untuk: {ticker}")
-                st.caption(f"Menggunakan kode Yahoo Finance: **{yahoo_ticker}**")
-
-                # Indikator: EMA + RSI
-                data = compute_emas(data)
-                data["RSI"] = compute_rsi(data["Close"], period=14)
-
-                data_ind = data.dropna(subset=["EMA10", "EMA20", "EMA50", "EMA200", "RSI"])
-
-                if data_ind.empty:
-                    st.warning("Data masih terlalu sedikit untuk menghitung indikator.")
+                if show_timings and profile_next_run:
+                    # profil sengaja melewati cache supaya semua tahap benar-benar jalan
+                    with load_timer.stage("compute_analysis (profil)"):
+                        (data, data_ind, signal, reason), profile_report = profile_call(
+                            compute_analysis, yahoo_ticker, period, interval, timer=load_timer
+                        )
                 else:
-                    signal, reason = generate_smart_signal(data_ind)
-                    last_row = data_ind.iloc[-1]
-
-                    chart_col, signal_col = st.columns([2.2, 1.1])
-
-                    with chart_col:
-                        st.subheader("📈 Grafik Harga (Candlestick) & EMA")
-
-                        fig = go.Figure()
-                        fig.add_trace(go.Candlestick(
-                            x=data_ind.index,
-                            open=data_ind["Open"],
-                            high=data_ind["High"],
-                            low=data_ind["Low"],
-                            close=data_ind["Close"],
-                            name="Harga"
-                        ))
-                        # Tampilkan beberapa EMA utama
-                        fig.add_trace(go.Scatter(
-                            x=data_ind.index,
-                            y=data_ind["EMA20"],
-                            mode="lines",
-                            name="EMA20"
-                        ))
-                        fig.add_trace(go.Scatter(
-                            x=data_ind.index,
-                            y=data_ind["EMA50"],
-                            mode="lines",
-                            name="EMA50"
-                        ))
-                        fig.add_trace(go.Scatter(
-                            x=data_ind.index,
-                            y=data_ind["EMA200"],
-                            mode="lines",
-                            name="EMA200"
-                        ))
-                        fig.update_layout(
-                            xaxis_title="Tanggal",
-                            yaxis_title="Harga",
-                            xaxis_rangeslider_visible=False,
-                            height=400,
+                    with load_timer.stage("load_analysis") as load_record:
+                        data, warmup, signal, reason, inner_stages = load_analysis(
+                            yahoo_ticker, period, interval
                         )
-                        st.plotly_chart(fig, use_container_width=True)
+                        data, data_ind = split_analysis(data, warmup)
+                    # cache miss minimal selama total tahap di dalamnya
+                    inner_total = sum(s["seconds"] for s in inner_stages if s["depth"] == 0)
+                    if load_record["seconds"] >= inner_total:
+                        load_timer.merge(inner_stages, depth=1)
+                    else:
+                        load_record["name"] = "load_analysis (cache)"
+
+                # kode sinyal setiap bar dihitung sekali per analisis (vektor),
+                # rerun berikutnya hanya membaca dari sesi
+                with load_timer.stage("timeline"):
+                    codes = signal_timeline(data_ind) if not data_ind.empty else None
+            log_timings(
+                "mode1_load", load_timer, ticker=yahoo_ticker, period=period,
+                interval=interval, rows=len(data),
+            )
 
-                        st.subheader("📉 RSI (14)")
-                        st.line_chart(data_ind[["RSI"]])
-
-                    with signal_col:
-                        st.subheader("🧠 Sinyal Keputusan (EMA + RSI)")
-                        if signal == "BUY":
-                            st.markdown("## ✅ Sinyal: **BUY**")
-                        elif signal == "SELL":
-                            st.markdown("## ❌ Sinyal: **SELL**")
-                        elif signal == "WAIT":
-                            st.markdown("## ⏳ Sinyal: **WAIT**")
-                        else:
-                            st.markdown("## ⚠️ Sinyal: **DATA KURANG**")
-                        st.write(reason)
-
-                        st.markdown("---")
-                        st.markdown("**Ringkasan Harga Terakhir:**")
-                        st.write(f"Close: {last_row['Close']:.4f}")
-                        st.write(f"High: {last_row['High']:.4f}")
-                        st.write(f"Low: {last_row['Low']:.4f}")
-                        st.write(f"Volume: {last_row['Volume']}")
-
-                        st.markdown("**EMA Terakhir:**")
-                        st.write(
-                            f"EMA10: {last_row['EMA10']:.4f} | "
-                            f"EMA20: {last_row['EMA20']:.4f} | "
-                            f"EMA50: {last_row['EMA50']:.4f}"
+            # simpan di sesi: widget lain (entry, slider) memicu rerun,
+            # tapi hasil analisis tetap dipakai tanpa download / hitung ulang
+            st.session_state["mode1_analysis"] = {
+                "key": (yahoo_ticker, period, interval),
+                "ticker": ticker,
+                "data": data,
+                "data_ind": data_ind,
+                "signal": signal,
+                "reason": reason,
+                "codes": codes,
+                "load_stages": load_timer.stages,
+                "profile": profile_report,
+            }
+
+    analysis = st.session_state.get("mode1_analysis")
+    if analysis is not None and analysis["key"] != (resolve_ticker(ticker, market_type), period, interval):
+        st.info("Ticker / periode / interval berubah. Klik tombol di atas untuk menganalisis ulang.")
+        analysis = None
+
+    if analysis is not None:
+        render_timer = StageTimer()
+        yahoo_ticker = analysis["key"][0]
+        data = analysis["data"]
+        data_ind = analysis["data_ind"]
+        signal, reason = analysis["signal"], analysis["reason"]
+
+        if data.empty:
+            st.error("Data tidak ditemukan. Coba ticker atau periode lain.")
+        else:
+            st.success(f"Data berhasil diambil untuk: {analysis['ticker']}")
+            st.caption(f"Menggunakan kode Yahoo Finance: **{yahoo_ticker}**")
+
+            if data_ind.empty:
+                st.warning("Data masih terlalu sedikit untuk menghitung indikator.")
+            else:
+                last_row = data_ind.iloc[-1]
+
+                chart_col, signal_col = st.columns([2.2, 1.1])
+
+                with chart_col:
+                    st.subheader("📈 Grafik Harga (Candlestick) & EMA")
+
+                    # Seri panjang: pilih rentang tampilan; data di dalam rentang
+                    # diagregasi / di-downsample agar muat di lebar grafik, dan
+                    # tampil detail penuh begitu rentangnya cukup sempit.
+                    codes = analysis["codes"]
+                    view, lo, hi = data_ind, 0, len(data_ind)
+                    if len(data_ind) > DEFAULT_MAX_BARS:
+                        naive_index = (
+                            data_ind.index.tz_localize(None)
+                            if data_ind.index.tz is not None else data_ind.index
                         )
-                        st.write(
-                            f"EMA100: {last_row['EMA100']:.4f} | "
-                            f"EMA200: {last_row['EMA200']:.4f}"
+                        first_time = naive_index[0].to_pydatetime()
+                        last_time = naive_index[-1].to_pydatetime()
+                        view_start, view_end = st.slider(
+                            "Rentang tampilan",
+                            min_value=first_time,
+                            max_value=last_time,
+                            value=(first_time, last_time),
+                            key=f"chart_window_{yahoo_ticker}_{period}_{interval}",
                         )
+                        lo, hi = visible_window(naive_index, view_start, view_end)
+                        view = data_ind.iloc[lo:hi]
+                        if len(view) > DEFAULT_MAX_BARS:
+                            st.caption(
+                                f"{len(view):,} candle diringkas agar grafik tetap ringan. "
+                                "Persempit rentang untuk melihat detail penuh."
+                            )
 
-                        # RISK MANAGEMENT – MODE DATA HARGA
-                        st.markdown("---")
-                        st.subheader("🛡️ Money & Risk Management (otomatis)")
-
-                        entry_price = st.number_input(
-                            "Harga entry (default = Close terakhir)",
-                            min_value=0.0,
-                            value=float(last_row["Close"]),
-                            step=float(max(last_row["Close"] * 0.001, 0.0001))
+                    show_markers = st.checkbox("Tampilkan penanda sinyal BUY/SELL", value=True)
+                    with render_timer.stage("figure"):
+                        fig = build_price_figure(
+                            view,
+                            ema_columns=CHART_EMA_COLUMNS,
+                            codes=codes[lo:hi] if show_markers else None,
                         )
+                    with render_timer.stage("plotly_chart"):
+                        st.plotly_chart(fig, use_container_width=True)
 
-                        risk_amount, qty, sl_price, tp_price = compute_position_sizing(
-                            balance, risk_pct, stop_pct, entry_price
+                    st.subheader("📉 RSI (14)")
+                    with render_timer.stage("rsi_chart"):
+                        st.line_chart(downsample_series(view["RSI"]).to_frame())
+
+                with signal_col:
+                    st.subheader("🧠 Sinyal Keputusan (EMA + RSI)")
+                    if signal == "BUY":
+                        st.markdown("## ✅ Sinyal: **BUY**")
+                    elif signal == "SELL":
+                        st.markdown("## ❌ Sinyal: **SELL**")
+                    elif signal == "WAIT":
+                        st.markdown("## ⏳ Sinyal: **WAIT**")
+                    else:
+                        st.markdown("## ⚠️ Sinyal: **DATA KURANG**")
+                    st.write(reason)
+
+                    st.markdown("---")
+                    st.markdown("**Ringkasan Harga Terakhir:**")
+                    st.write(f"Close: {last_row['Close']:.4f}")
+                    st.write(f"High: {last_row['High']:.4f}")
+                    st.write(f"Low: {last_row['Low']:.4f}")
+                    st.write(f"Volume: {last_row['Volume']}")
+
+                    # kolom ringkasan diambil dari memo indikator; yang belum
+                    # ada di frame analisis (EMA100) dihitung sekali di sini
+                    with render_timer.stage("summary_indicators"):
+                        lazy = LazyIndicators(data, cache=get_indicator_cache())
+                        last_ema = {name: float(lazy.get(name)[-1]) for name in SUMMARY_INDICATORS}
+                    st.markdown("**EMA Terakhir:**")
+                    st.write(
+                        f"EMA10: {last_ema['EMA10']:.4f} | "
+                        f"EMA20: {last_ema['EMA20']:.4f} | "
+                        f"EMA50: {last_ema['EMA50']:.4f}"
+                    )
+                    st.write(
+                        f"EMA100: {last_ema['EMA100']:.4f} | "
+                        f"EMA200: {last_ema['EMA200']:.4f}"
+                    )
+
+                    # RISK MANAGEMENT – MODE DATA HARGA
+                    st.markdown("---")
+                    st.subheader("🛡️ Money & Risk Management (otomatis)")
+
+                    entry_price = st.number_input(
+                        "Harga entry (default = Close terakhir)",
+                        min_value=0.0,
+                        value=float(last_row["Close"]),
+                        step=float(max(last_row["Close"] * 0.001, 0.0001))
+                    )
+
+                    risk_amount, qty, sl_price, tp_price = compute_position_sizing(
+                        balance, risk_pct, stop_pct, entry_price
+                    )
+
+                    if None in (risk_amount, qty, sl_price, tp_price):
+                        st.info("Lengkapi nilai modal / risiko / stop loss untuk melihat kalkulasi.")
+                    else:
+                        st.write(f"Modal: **{balance:,.2f}**")
+                        st.write(f"Risiko per trade: **{risk_pct:.1f}%** → ~**{risk_amount:,.2f}**")
+                        st.write(f"Perkiraan jumlah unit yang boleh dibeli: **{qty:,.4f}**")
+
+                        st.markdown("**Level Harga Penting (berdasarkan % SL):**")
+                        st.write(f"- Entry: **{entry_price:.4f}**")
+                        st.write(f"- Stop Loss (SL): **{sl_price:.4f}**")
+                        st.write(f"- Take Profit (TP, ± 1:2 RR): **{tp_price:.4f}**")
+
+                        st.caption(
+                            "Ini hanya simulasi kalkulasi sederhana. "
+                            "Sesuaikan lagi dengan kondisi broker/exchange dan rencana pribadi."
                         )
 
-                        if None in (risk_amount, qty, sl_price, tp_price):
-                            st.info("Lengkapi nilai modal / risiko / stop loss untuk melihat kalkulasi.")
-                        else:
-                            st.write(f"Modal: **{balance:,.2f}**")
-                            st.write(f"Risiko per trade: **{risk_pct:.1f}%** → ~**{risk_amount:,.2f}**")
-                            st.write(f"Perkiraan jumlah unit yang boleh dibeli: **{qty:,.4f}**")
-
-                            st.markdown("**Level Harga Penting (berdasarkan % SL):**")
-                            st.write(f"- Entry: **{entry_price:.4f}**")
-                            st.write(f"- Stop Loss (SL): **{sl_price:.4f}**")
-                            st.write(f"- Take Profit (TP, ± 1:2 RR): **{tp_price:.4f}**")
-
-                            st.caption(
-                                "Ini hanya simulasi kalkulasi sederhana. "
-                                "Sesuaikan lagi dengan kondisi broker/exchange dan rencana pribadi."
-                            )
+                # BACKTEST – ATURAN SINYAL DI SELURUH HISTORI
+                with st.expander("📊 Backtest aturan sinyal pada data ini"):
+                    # hanya hasil kombinasi risk terakhir yang disimpan di sesi
+                    # (setiap ketikan di input modal akan jadi kunci baru)
+                    bt_key = (stop_pct, risk_pct, balance)
+                    cached = analysis.get("backtest")
+                    if cached is None or cached[0] != bt_key:
+                        with render_timer.stage("backtest"):
+                            # kode sinyal yang sama dengan log sinyal (signal_timeline)
+                            cached = (bt_key, backtest_signals(
+                                data_ind, analysis["codes"], stop_pct=stop_pct, rr=2.0,
+                                balance=balance, risk_pct=risk_pct,
+                            ))
+                        analysis["backtest"] = cached
+                    bt = cached[1]
+                    stats = bt.stats
+
+                    bt_col1, bt_col2, bt_col3, bt_col4 = st.columns(4)
+                    bt_col1.metric("Jumlah trade", stats["trades"])
+                    bt_col2.metric(
+                        "Win rate",
+                        "-" if stats["trades"] == 0 else f"{stats['win_rate'] * 100:.1f}%"
+                    )
+                    bt_col3.metric("Total return", f"{stats['total_return_pct']:.2f}%")
+                    bt_col4.metric("Max drawdown", f"{stats['max_drawdown_pct']:.2f}%")
+
+                    st.line_chart(downsample_series(bt.equity))
+                    if stats["trades"]:
+                        st.dataframe(bt.trades, use_container_width=True, hide_index=True)
+                    else:
+                        st.info("Belum ada sinyal BUY/SELL pada periode ini.")
+
+                    st.caption(
+                        f"Entry di Close bar sinyal, SL {stop_pct:.1f}% & TP 1:2 RR seperti kalkulasi di atas, "
+                        f"risiko {risk_pct:.1f}% per trade. Hasil masa lalu tidak menjamin hasil ke depan."
+                    )
+
+                # MONTE CARLO – RISK OF RUIN DENGAN RR 1:2
+                enough_trades = stats["trades"] >= 10
+                render_monte_carlo(
+                    "mode1",
+                    balance,
+                    risk_pct,
+                    rr=2.0,
+                    default_win_rate=stats["win_rate"] if enough_trades else 0.5,
+                    note=(
+                        f"RR 1:2 seperti TP di atas. Win rate awal dari backtest ({stats['trades']} trade)."
+                        if enough_trades else
+                        "RR 1:2 seperti TP di atas. Trade backtest terlalu sedikit, win rate awal 50%."
+                    ),
+                )
+
+                # LOG SINYAL – SELURUH HISTORI
+                with st.expander("🧾 Log sinyal (seluruh histori)"):
+                    changes_only = st.checkbox(
+                        "Catat semua perubahan status (termasuk WAIT)",
+                        value=False,
+                        help="Default hanya bar dengan sinyal BUY / SELL."
+                    )
+                    logs = analysis.setdefault("signal_logs", {})
+                    if changes_only not in logs:
+                        log = signal_log(data_ind, codes, changes_only=changes_only)
+                        logs[changes_only] = (log, log.to_csv().encode("utf-8"))
+                    log, log_csv = logs[changes_only]
+
+                    log_col1, log_col2, log_col3 = st.columns(3)
+                    log_col1.metric("Sinyal BUY", int((codes == CODE_BUY).sum()))
+                    log_col2.metric("Sinyal SELL", int((codes == CODE_SELL).sum()))
+                    log_col3.metric("Baris log", len(log))
+
+                    if len(log):
+                        # terbaru di atas; tabel dibatasi, file unduhan berisi semuanya
+                        st.dataframe(log.iloc[::-1].head(500), use_container_width=True)
+                        st.download_button(
+                            "⬇️ Unduh log sinyal (CSV)",
+                            data=log_csv,
+                            file_name=f"sinyal_{yahoo_ticker}_{period}_{interval}.csv",
+                            mime="text/csv",
+                        )
+                    else:
+                        st.info("Belum ada sinyal BUY/SELL pada periode ini.")
+
+        if render_timer.stages:
+            log_timings("mode1_render", render_timer, ticker=yahoo_ticker, period=period, interval=interval)
+
+        # PANEL DEBUG – WAKTU PER TAHAP
+        if show_timings:
+            with st.expander("🐞 Debug: waktu per tahap", expanded=True):
+                rows = [
+                    {"Tahap": "\u2003" * s["depth"] + s["name"], "Waktu (ms)": round(s["seconds"] * 1000, 2)}
+                    for s in analysis["load_stages"] + render_timer.stages
+                ]
+                st.dataframe(rows, use_container_width=True, hide_index=True)
+                st.caption(
+                    "Tahap load diukur saat tombol analisis diklik; tahap render diukur di rerun ini. "
+                    "\"(cache)\" berarti hasil diambil dari cache, tahap di dalamnya tidak dijalankan."
+                )
+                report = analysis.get("profile")
+                if report is not None:
+                    st.markdown(
+                        f"**Profil:** {report['seconds'] * 1000:.1f} ms, "
+                        f"puncak memori {report['peak_mb']:.1f} MB"
+                    )
+                    st.dataframe(report["top_allocations"], use_container_width=True, hide_index=True)
+                    st.code(report["cprofile"], language="text")
 
     st.caption(
         "Disclaimer: Mode ini menggunakan data dari Yahoo Finance. "
@@ -481,7 +742,7 @@ if mode.startswith("📡"):
 # =====================================================
 # MODE 2 – SCREENSHOT TRADINGVIEW
 # =====================================================
-else:
+elif mode.startswith("🖼️"):
     st.subheader("🖼️ Analisis dari Screenshot TradingView")
 
     st.markdown(
@@ -496,8 +757,16 @@ else:
     )
 
     if uploaded is not None:
-        image = Image.open(uploaded)
-        st.image(image, caption="Screenshot TradingView", use_container_width=True)
+        thumb = screenshot_thumbnail(uploaded)
+        st.image(thumb.data, caption="Screenshot TradingView", use_container_width=True)
+        if thumb.size != thumb.original_size:
+            show_original = st.checkbox(
+                f"Tampilkan resolusi asli ({thumb.original_size[0]}×{thumb.original_size[1]}, "
+                f"{thumb.original_bytes / 1e6:.1f} MB)"
+            )
+            if show_original:
+                # byte file asli dikirim apa adanya, tanpa decode di server
+                st.image(uploaded.getvalue(), caption="Resolusi asli", use_container_width=True)
 
         st.markdown("### Informasi Chart")
 
@@ -559,6 +828,16 @@ else:
                 "Perhitungan berdasarkan level yang kamu baca sendiri dari TradingView. "
                 "Aplikasi ini hanya membantu mengubahnya jadi rencana & ukuran posisi."
             )
+
+            if rr is not None:
+                render_monte_carlo(
+                    "mode2",
+                    balance,
+                    risk_pct,
+                    rr=rr,
+                    default_win_rate=0.5,
+                    note=f"RR {rr:.2f} : 1 dari level Entry / SL / TP di atas. Sesuaikan win rate dengan catatan trading kamu.",
+                )
         else:
             st.info("Isi dulu entry & stop loss (minimal). TP opsional tapi disarankan.")
     else:
@@ -568,3 +847,294 @@ else:
         "Disclaimer: Mode ini tidak membaca gambar secara otomatis. "
         "Kamu tetap melakukan analisa visual di TradingView, aplikasi hanya membantu merapikan & menghitung risiko."
     )
+
+# =====================================================
+# MODE 3 – WATCHLIST SCANNER (BANYAK TICKER)
+# =====================================================
+elif mode.startswith("📋"):
+    st.subheader("📋 Watchlist Scanner (EMA + RSI)")
+
+    st.markdown(
+        "- Isi daftar ticker per jenis pasar (pisahkan dengan koma atau baris baru)\n"
+        "- Semua ticker diambil sekaligus, lalu sinyal dihitung bersamaan\n"
+        "- Klik judul kolom tabel untuk mengurutkan hasil."
+    )
+
+    watch_cols = st.columns(4)
+    watch_defaults = {
+        "Crypto": "BTC-USD, ETH-USD, SOL-USD",
+        "Saham US": "AAPL, TSLA, MSFT, NVDA",
+        "Saham Indonesia": "BBCA, BBRI, TLKM",
+        "Forex": "EURUSD, USDJPY, GBPUSD, XAUUSD",
+    }
+    watch_inputs = {}
+    for col, (market, default_list) in zip(watch_cols, watch_defaults.items()):
+        with col:
+            watch_inputs[market] = st.text_area(market, value=default_list, height=120)
+
+    scan_col1, scan_col2 = st.columns(2)
+    with scan_col1:
+        scan_period = st.selectbox("Periode data", ["1mo", "3mo", "6mo", "1y"], index=3, key="scan_period")
+    with scan_col2:
+        scan_interval = st.selectbox("Interval candle", ["1d", "4h", "1h", "30m", "15m"], index=0, key="scan_interval")
+
+    scan_btn = st.button("🔎 Scan Watchlist", type="primary")
+
+    if scan_btn:
+        # kode Yahoo -> (ticker asli, jenis pasar) untuk ditampilkan di tabel
+        # ticker yang tidak valid dibuang di sini, tidak ikut diminta ke Yahoo
+        yahoo_to_input, rejected = {}, []
+        for market, raw in watch_inputs.items():
+            for t in raw.replace("\n", ",").split(","):
+                if t.strip():
+                    yahoo = resolve_ticker(t, market)
+                    if yahoo is None:
+                        rejected.append(get_symbol_index().resolve(t, market).message())
+                    else:
+                        yahoo_to_input.setdefault(yahoo, (t.strip().upper(), market))
+        for message in rejected:
+            st.warning(message)
+
+        if not yahoo_to_input:
+            st.error("Masukkan minimal satu ticker.")
+        else:
+            with st.spinner(f"Mengambil data {len(yahoo_to_input)} ticker sekaligus ..."):
+                table = scan_watchlist(list(yahoo_to_input), scan_period, scan_interval, get_ohlcv_store())
+
+            table.insert(0, "Pasar", [yahoo_to_input[t][1] for t in table["Ticker"]])
+            table.insert(1, "Kode", [yahoo_to_input[t][0] for t in table["Ticker"]])
+            table = table.rename(columns={"Ticker": "Kode Yahoo"})
+
+            counts = table["Sinyal"].value_counts()
+            m1, m2, m3, m4 = st.columns(4)
+            m1.metric("BUY", int(counts.get("BUY", 0)))
+            m2.metric("SELL", int(counts.get("SELL", 0)))
+            m3.metric("WAIT", int(counts.get("WAIT", 0)))
+            m4.metric("DATA KURANG", int(counts.get("DATA KURANG", 0)))
+
+            st.dataframe(table, use_container_width=True, hide_index=True)
+
+    st.caption(
+        "Disclaimer: Scanner memakai data Yahoo Finance dan aturan sinyal yang sama dengan Mode 1. "
+        "Gunakan sebagai penyaring awal, bukan saran finansial."
+    )
+
+# =====================================================
+# MODE 4 – MULTI-TIMEFRAME (SATU DOWNLOAD, RESAMPLE LOKAL)
+# =====================================================
+elif mode.startswith("🧭"):
+    st.subheader("🧭 Analisis Multi-timeframe (EMA + RSI)")
+
+    st.markdown(
+        "- Data diambil sekali di timeframe terkecil yang dipilih\n"
+        "- Timeframe yang lebih besar dibentuk dari data itu (tanpa download ulang)\n"
+        "- Matriks konfluensi menunjukkan seberapa searah semua timeframe."
+    )
+
+    mtf_col1, mtf_col2, mtf_col3 = st.columns([2, 1, 2])
+    with mtf_col1:
+        mtf_ticker = st.text_input("Ticker / Kode (lihat contoh di sidebar)", value="BTC-USD", key="mtf_ticker")
+        render_symbol_matches(mtf_ticker, market_type)
+    with mtf_col2:
+        mtf_period = st.selectbox("Periode data", ["1mo", "3mo", "6mo", "1y"], index=0, key="mtf_period")
+    with mtf_col3:
+        mtf_timeframes = st.multiselect(
+            "Timeframe",
+            TIMEFRAMES,
+            default=["1h", "4h", "1d"],
+            help="Swing: 4h + 1d, Intraday: 15m + 1h, dst. sesuai preset gaya trading.",
+        )
+
+    mtf_btn = st.button("🧭 Analisis Multi-timeframe", type="primary")
+
+    if mtf_btn:
+        if not mtf_ticker:
+            st.error("Masukkan ticker terlebih dahulu.")
+        elif not mtf_timeframes:
+            st.error("Pilih minimal satu timeframe.")
+        else:
+            base = base_interval(mtf_timeframes)
+            yahoo_ticker = resolve_or_report(mtf_ticker, market_type)
+            if not period_supported(base, mtf_period):
+                st.error(
+                    f"Yahoo Finance tidak menyediakan data {base} selama {mtf_period}. "
+                    "Pilih periode lebih pendek atau buang timeframe kecil."
+                )
+            elif yahoo_ticker is not None:
+                with st.spinner(f"Mengambil data {base} untuk {yahoo_ticker} ..."):
+                    base, results = load_multi_timeframe(yahoo_ticker, mtf_period, tuple(mtf_timeframes))
+
+                if not results:
+                    st.error("Data tidak ditemukan. Coba ticker atau periode lain.")
+                else:
+                    st.caption(
+                        f"Kode Yahoo Finance: **{yahoo_ticker}** – diunduh sekali di interval **{base}**, "
+                        f"{len(results)} timeframe dibentuk secara lokal."
+                    )
+
+                    matrix = confluence_matrix(results)
+                    st.markdown("### Matriks Konfluensi")
+                    st.dataframe(matrix, use_container_width=True)
+                    st.write(confluence_summary(matrix))
+
+                    tabs = st.tabs(list(results))
+                    for tab, (tf, (data_ind, signal, reason)) in zip(tabs, results.items()):
+                        with tab:
+                            if data_ind.empty:
+                                st.warning("Data masih terlalu sedikit untuk menghitung indikator.")
+                                continue
+                            st.markdown(f"**Sinyal {tf}: {signal}** – {reason}")
+                            st.plotly_chart(build_price_figure(data_ind, height=350), use_container_width=True)
+
+    st.caption(
+        "Disclaimer: Candle timeframe besar dibentuk dari data Yahoo Finance timeframe kecil, "
+        "bisa sedikit berbeda dengan candle di broker / exchange kamu."
+    )
+
+# =====================================================
+# MODE 5 – RISIKO PORTOFOLIO (BANYAK POSISI SEKALIGUS)
+# =====================================================
+else:
+    st.subheader("💼 Risiko Portofolio (banyak posisi)")
+
+    st.markdown(
+        "- Isi posisi yang sedang / akan dibuka; entry 0 = pakai harga terakhir\n"
+        "- Semua posisi diukur sekaligus dengan risiko % & stop % masing-masing\n"
+        "- Total exposure & total risiko dibatasi, korelasi dihitung dari data harian."
+    )
+
+    positions_input = st.data_editor(
+        pd.DataFrame({
+            "Pasar": ["Crypto", "Crypto", "Saham US", "Forex"],
+            "Ticker": ["BTC-USD", "ETH-USD", "AAPL", "EURUSD"],
+            "Arah": ["BUY", "BUY", "SELL", "BUY"],
+            "Entry": [0.0, 0.0, 0.0, 0.0],
+            "Risiko %": [float(risk_pct)] * 4,
+            "Stop %": [float(stop_pct)] * 4,
+        }),
+        num_rows="dynamic",
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Pasar": st.column_config.SelectboxColumn(
+                options=["Crypto", "Saham US", "Saham Indonesia", "Forex"], required=True
+            ),
+            "Arah": st.column_config.SelectboxColumn(options=["BUY", "SELL"], required=True),
+            "Entry": st.column_config.NumberColumn(min_value=0.0, format="%.5f"),
+            "Risiko %": st.column_config.NumberColumn(min_value=0.0, max_value=100.0),
+            "Stop %": st.column_config.NumberColumn(min_value=0.0, max_value=100.0),
+        },
+        key="portfolio_positions",
+    )
+
+    pf_col1, pf_col2, pf_col3 = st.columns(3)
+    with pf_col1:
+        pf_period = st.selectbox("Periode korelasi (harian)", ["3mo", "6mo", "1y"], index=1, key="pf_period")
+    with pf_col2:
+        max_exposure_pct = st.slider(
+            "Batas total nilai posisi (% modal)", min_value=50, max_value=1000, value=300, step=50
+        )
+    with pf_col3:
+        max_total_risk_pct = st.slider(
+            "Batas total risiko ke SL (% modal)", min_value=1.0, max_value=30.0, value=10.0, step=0.5
+        )
+
+    positions_input = positions_input.dropna(subset=["Ticker"])
+    positions_input = positions_input[positions_input["Ticker"].str.strip() != ""]
+    pf_key = (
+        positions_input.to_json(), pf_period, balance, max_exposure_pct, max_total_risk_pct
+    )
+
+    if st.button("💼 Hitung Risiko Portofolio", type="primary"):
+        pf_pairs = list(zip(positions_input["Ticker"], positions_input["Pasar"]))
+        resolutions = [get_symbol_index().resolve(t, m) for t, m in pf_pairs]
+        rejected = [r.message() for r in resolutions if not r.ok]
+        if positions_input.empty:
+            st.error("Masukkan minimal satu posisi.")
+        elif balance <= 0:
+            st.error("Isi total modal terlebih dahulu.")
+        elif rejected:
+            for message in rejected:
+                st.error(message)
+        else:
+            yahoo_tickers = [r.yahoo for r in resolutions]
+            with st.spinner(f"Mengambil data harian {len(set(yahoo_tickers))} ticker sekaligus ..."):
+                frames = get_ohlcv_store().get_many(yahoo_tickers, pf_period, "1d")
+
+            last_prices = np.array([
+                float(frames[t]["Close"].iloc[-1]) if t in frames and len(frames[t]) else np.nan
+                for t in yahoo_tickers
+            ])
+            entry_input = positions_input["Entry"].fillna(0).to_numpy(dtype=np.float64)
+            entries = np.where(entry_input > 0, entry_input, last_prices)
+            direction = np.where(positions_input["Arah"].to_numpy() == "SELL", -1.0, 1.0)
+
+            sizing = size_positions(
+                balance,
+                positions_input["Risiko %"].fillna(0).to_numpy(dtype=np.float64),
+                positions_input["Stop %"].fillna(0).to_numpy(dtype=np.float64),
+                entries,
+                direction=direction,
+            )
+            qty, scale = cap_exposure(
+                sizing["qty"], entries, np.abs(entries - sizing["sl"]), balance,
+                max_exposure_pct=max_exposure_pct, max_risk_pct=max_total_risk_pct,
+            )
+            cov = return_matrix(frames).cov(min_periods=20)
+            st.session_state["portfolio"] = {
+                "key": pf_key,
+                "book": PortfolioBook(yahoo_tickers, direction, entries, qty, sizing["sl"], balance, cov),
+                "prices": last_prices,
+                "scale": scale,
+                "corr": correlation_from_cov(cov),
+                "missing": sorted({t for t, p in zip(yahoo_tickers, last_prices) if np.isnan(p)}),
+            }
+
+    portfolio = st.session_state.get("portfolio")
+    if portfolio is not None and portfolio["key"] != pf_key:
+        st.info("Posisi / batas berubah. Klik tombol di atas untuk menghitung ulang.")
+        portfolio = None
+
+    if portfolio is not None:
+        if portfolio["missing"]:
+            st.warning("Data tidak ditemukan untuk: " + ", ".join(portfolio["missing"]))
+        if portfolio["scale"] < 1:
+            st.caption(
+                f"Semua posisi diperkecil ke {portfolio['scale'] * 100:.1f}% dari ukuran awal "
+                "agar tidak melewati batas exposure / risiko."
+            )
+
+        # buku dihitung ulang dari array setiap kali harga digeser
+        shock = st.slider(
+            "Simulasi pergerakan harga semua posisi (%)",
+            min_value=-20.0, max_value=20.0, value=0.0, step=0.5,
+        )
+        reprice_start = time.perf_counter()
+        book_table, book = portfolio["book"].reprice(portfolio["prices"] * (1 + shock / 100.0))
+        reprice_ms = (time.perf_counter() - reprice_start) * 1000
+
+        pf_m1, pf_m2, pf_m3, pf_m4 = st.columns(4)
+        pf_m1.metric(
+            "Total nilai posisi", f"{book['gross_exposure']:,.2f}",
+            f"{book['gross_exposure_pct']:.0f}% modal", delta_color="off"
+        )
+        pf_m2.metric(
+            "Modal berisiko ke SL", f"{book['capital_at_risk']:,.2f}",
+            f"{book['capital_at_risk_pct']:.1f}% modal", delta_color="off"
+        )
+        pf_m3.metric("PnL berjalan", f"{book['unrealized_pnl']:,.2f}")
+        pf_m4.metric(f"VaR harian {book['confidence']:.0%}", f"{book['var']:,.2f}")
+
+        st.dataframe(book_table, use_container_width=True, hide_index=True)
+        st.caption(
+            f"Net exposure {book['net_exposure']:,.2f}, volatilitas harian portofolio "
+            f"{book['volatility']:,.2f}. Dihitung ulang dalam {reprice_ms:.1f} ms."
+        )
+
+        st.markdown("### Korelasi return harian")
+        st.plotly_chart(build_correlation_figure(portfolio["corr"]), use_container_width=True)
+
+    st.caption(
+        "Disclaimer: VaR dan korelasi memakai data historis Yahoo Finance dan asumsi distribusi normal. "
+        "Risiko nyata bisa lebih besar, terutama saat pasar bergejolak."
+    )
@@ -0,0 +1,127 @@
+"""
+CLI headless Trader Analyzer: analisis EMA + RSI + ukuran posisi untuk
+daftar ticker, hasil ditulis sebagai JSON atau CSV. Cocok untuk cron /
+worker batch karena tidak memuat Streamlit, Plotly, maupun PIL.
+
+Contoh:
+    python trading_cli.py BTC-USD ETH-USD --market Crypto --interval 1h --period 3mo
+    python trading_cli.py Forex:EURUSD "Saham Indonesia:BBCA" AAPL --format csv --out hasil.csv
+    python trading_cli.py BTC-USD --fake          # data sintetis, tanpa network
+    python trading_cli.py BTC-USD --fake --timings --profile   # timing & profil ke stderr
+
+Ticker boleh diberi awalan "<jenis pasar>:" untuk menimpa --market.
+"""
+import argparse
+import csv
+import json
+import logging
+import sys
+
+MARKET_TYPES = ["Crypto", "Saham US", "Saham Indonesia", "Forex"]
+
+CSV_FIELDS = [
+    "ticker", "market_type", "yahoo_ticker", "period", "interval", "signal", "time",
+    "close", "high", "low", "volume", "ema10", "ema20", "ema50", "ema100", "ema200", "rsi",
+    "risk_amount", "qty", "sl_price", "tp_price", "reason",
+]
+
+
+def parse_ticker(raw: str, default_market: str):
+    """'Forex:EURUSD' -> ('EURUSD', 'Forex'); tanpa awalan pakai default_market."""
+    market, sep, ticker = raw.rpartition(":")
+    if sep and market in MARKET_TYPES:
+        return ticker, market
+    return raw, default_market
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Analisis EMA + RSI tanpa UI (output JSON/CSV).")
+    parser.add_argument("tickers", nargs="+", help="Ticker, opsional dengan awalan '<jenis pasar>:'")
+    parser.add_argument("--market", default="Crypto", choices=MARKET_TYPES, help="jenis pasar default")
+    parser.add_argument("--period", default="3mo")
+    parser.add_argument("--interval", default="1d")
+    parser.add_argument("--balance", type=float, default=1000.0, help="total modal")
+    parser.add_argument("--risk-pct", type=float, default=2.0, help="risiko per trade (%%)")
+    parser.add_argument("--stop-pct", type=float, default=3.0, help="jarak stop loss (%%)")
+    parser.add_argument("--format", choices=["json", "csv"], default="json")
+    parser.add_argument("--out", help="file output (default: stdout)")
+    parser.add_argument("--store-dir", help="folder cache candle lokal")
+    parser.add_argument("--fake", action="store_true", help="pakai data sintetis (offline)")
+    parser.add_argument("--dtype", choices=["float64", "float32"], default=None,
+                        help="dtype buffer indikator (default: env TRADING_ANALISA_DTYPE atau float64)")
+    parser.add_argument("--no-validate", action="store_true",
+                        help="lewati validasi ticker terhadap daftar simbol lokal")
+    parser.add_argument("--timings", action="store_true", help="log JSON waktu per tahap ke stderr")
+    parser.add_argument("--profile", action="store_true", help="profil cProfile + tracemalloc ke stderr")
+    return parser
+
+
+def write_results(results, fmt: str, out):
+    if fmt == "json":
+        json.dump(results, out, indent=2, ensure_ascii=False)
+        out.write("\n")
+    else:
+        writer = csv.DictWriter(out, fieldnames=CSV_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    # library berat baru dimuat setelah argumen valid
+    from instrumentation import NULL_TIMER, StageTimer, log_timings, profile_call
+    from ohlcv_store import FakeFetcher, OHLCVStore, store_root
+    from symbol_index import default_index
+    from trading_core import analyze_ticker
+
+    if args.timings:
+        logging.basicConfig(stream=sys.stderr, level=logging.INFO, format="%(message)s")
+
+    store = OHLCVStore(
+        root=store_root(args.store_dir, args.fake),
+        fetcher=FakeFetcher() if args.fake else None,
+    )
+
+    symbols = None if args.no_validate else default_index()
+
+    def run_batch():
+        results = []
+        for raw in args.tickers:
+            ticker, market = parse_ticker(raw, args.market)
+            timer = StageTimer() if args.timings else NULL_TIMER
+            try:
+                results.append(analyze_ticker(
+                    ticker, market, args.period, args.interval, store,
+                    balance=args.balance, risk_pct=args.risk_pct, stop_pct=args.stop_pct,
+                    timer=timer, dtype=args.dtype, symbols=symbols,
+                ))
+            except Exception as exc:  # satu ticker gagal tidak menghentikan batch
+                results.append({"ticker": ticker, "market_type": market, "signal": "ERROR", "reason": str(exc)})
+            if args.timings:
+                log_timings(
+                    "analyze_ticker", timer, ticker=ticker, period=args.period,
+                    interval=args.interval, signal=results[-1]["signal"],
+                )
+        return results
+
+    if args.profile:
+        results, report = profile_call(run_batch)
+        sys.stderr.write(report["cprofile"])
+        sys.stderr.write(f"Waktu total: {report['seconds']:.3f} s, puncak memori: {report['peak_mb']:.1f} MB\n")
+        for alloc in report["top_allocations"]:
+            sys.stderr.write(f"  {alloc['size_mb']:8.2f} MB  {alloc['where']}\n")
+    else:
+        results = run_batch()
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8", newline="") as f:
+            write_results(results, args.format, f)
+    else:
+        write_results(results, args.format, sys.stdout)
+
+    return 0 if all(r["signal"] != "ERROR" for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
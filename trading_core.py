@@ -0,0 +1,515 @@
+"""
+Inti analisis Trader Analyzer tanpa Streamlit: mapping ticker, indikator
+EMA + RSI, sinyal, dan kalkulasi ukuran posisi.
+
+Modul ini sengaja ringan saat di-import: numpy/pandas baru dimuat ketika
+fungsi yang membutuhkannya dipanggil, sehingga worker batch / cron bisa
+memakai map_ticker_to_yahoo atau kalkulasi posisi tanpa biaya import
+library berat. UI Streamlit ada di trading_app.py, CLI di trading_cli.py.
+"""
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+
+from instrumentation import NULL_TIMER
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# =========================
+# FUNGSI MAPPING TICKER → YAHOO FINANCE
+# =========================
+def map_ticker_to_yahoo(ticker: str, market_type: str) -> str:
+    """
+    Mengubah kode yang kamu ketik jadi kode yang dimengerti Yahoo Finance.
+    - Forex : EURUSD -> EURUSD=X, XAUUSD -> GC=F, dll.
+    - Saham Indonesia : BBCA -> BBCA.JK
+    """
+    if not ticker:
+        return ticker
+
+    t = ticker.strip().upper()
+
+    if market_type == "Forex":
+        special_map = {
+            "XAUUSD": "GC=F",  # emas
+            "XAGUSD": "SI=F",  # silver
+        }
+        if t in special_map:
+            return special_map[t]
+
+        if not t.endswith("=X"):
+            return t + "=X"
+        return t
+
+    elif market_type == "Saham Indonesia":
+        if not t.endswith(".JK"):
+            return t + ".JK"
+        return t
+
+    else:
+        # Crypto & Saham US biasanya langsung pakai saja
+        return t
+
+
+# =========================
+# FUNGSI INDIKATOR & RISK
+# =========================
+def compute_rsi(series, period: int = 14):
+    import numpy as np
+    import pandas as pd
+
+    delta = series.diff()
+    gain = np.where(delta > 0, delta, 0)
+    loss = np.where(delta < 0, -delta, 0)
+
+    gain_rol = pd.Series(gain, index=series.index).rolling(window=period).mean()
+    loss_rol = pd.Series(loss, index=series.index).rolling(window=period).mean()
+
+    rs = gain_rol / loss_rol
+    rsi = 100 - (100 / (1 + rs))
+    return rsi
+
+
+def compute_emas(df: pd.DataFrame) -> pd.DataFrame:
+    """Tambahkan EMA 10/20/50/100/200 ke dataframe."""
+    close = df["Close"]
+    df["EMA10"] = close.ewm(span=10, adjust=False).mean()
+    df["EMA20"] = close.ewm(span=20, adjust=False).mean()
+    df["EMA50"] = close.ewm(span=50, adjust=False).mean()
+    df["EMA100"] = close.ewm(span=100, adjust=False).mean()
+    df["EMA200"] = close.ewm(span=200, adjust=False).mean()
+    return df
+
+
+def generate_smart_signal(df: pd.DataFrame):
+    """
+    Sinyal lebih ketat berbasis EMA + RSI:
+    - BUY: trend bullish (EMA50 > EMA200), momentum bullish (EMA10 crossover up EMA20),
+      harga di atas EMA20, RSI di 45–70
+    - SELL: trend bearish (EMA50 < EMA200), momentum bearish (EMA10 crossover down EMA20),
+      harga di bawah EMA20, RSI di 30–55
+    """
+    if len(df) < 60:
+        return "DATA KURANG", "Data belum cukup panjang untuk analisis EMA & RSI."
+
+    last = df.iloc[-1]
+    prev = df.iloc[-2]
+
+    # Trend besar
+    trend_bull = last["EMA50"] > last["EMA200"]
+    trend_bear = last["EMA50"] < last["EMA200"]
+
+    # Momentum (crossover EMA10 - EMA20)
+    mom_bull = last["EMA10"] > last["EMA20"] and prev["EMA10"] <= prev["EMA20"]
+    mom_bear = last["EMA10"] < last["EMA20"] and prev["EMA10"] >= prev["EMA20"]
+
+    price_above_ema20 = last["Close"] > last["EMA20"]
+    price_below_ema20 = last["Close"] < last["EMA20"]
+
+    rsi = last["RSI"]
+
+        # BUY setup ketat (RSI 45–80, overbought di atas 80)
+    if (
+        trend_bull
+        and mom_bull
+        and price_above_ema20
+        and 45 <= rsi <= 80
+    ):
+        return "BUY", (
+            "Trend besar bullish (EMA50 > EMA200), momentum baru menguat "
+            "(EMA10 cross up EMA20), harga di atas EMA20, dan RSI mendukung (45–80)."
+        )
+
+    # SELL setup ketat (RSI 20–55, oversold di bawah 20)
+    if (
+        trend_bear
+        and mom_bear
+        and price_below_ema20
+        and 20 <= rsi <= 55
+    ):
+        return "SELL", (
+            "Trend besar bearish (EMA50 < EMA200), momentum baru melemah "
+            "(EMA10 cross down EMA20), harga di bawah EMA20, dan RSI mendukung (20–55)."
+        )
+
+
+    # SELL setup ketat
+    if (
+        trend_bear
+        and mom_bear
+        and price_below_ema20
+        and 30 <= rsi <= 55
+    ):
+        return "SELL", (
+            "Trend besar bearish (EMA50 < EMA200), momentum baru melemah "
+            "(EMA10 cross down EMA20), harga di bawah EMA20, dan RSI mendukung (30–55)."
+        )
+
+    # WAIT (penjelasan berdasarkan kondisi)
+    if trend_bull and not mom_bull:
+        return "WAIT", (
+            "Trend besar masih bullish (EMA50 > EMA200), namun momentum belum memberi sinyal kuat "
+            "(EMA10 belum cross up EMA20) atau harga belum cukup kuat di atas EMA20."
+        )
+    if trend_bear and not mom_bear:
+        return "WAIT", (
+            "Trend besar masih bearish (EMA50 < EMA200), namun momentum belum memberi sinyal kuat "
+            "(EMA10 belum cross down EMA20) atau harga belum cukup lemah di bawah EMA20."
+        )
+
+    return "WAIT", (
+        "Kondisi EMA dan RSI belum searah untuk setup BUY/SELL yang rapi. "
+        "Lebih aman menunggu struktur yang lebih jelas."
+    )
+
+
+def compute_position_sizing(balance, risk_pct, stop_pct, price):
+    if balance <= 0 or risk_pct <= 0 or stop_pct <= 0 or price <= 0:
+        return None, None, None, None
+
+    risk_amount = balance * (risk_pct / 100.0)
+    risk_per_unit = price * (stop_pct / 100.0)
+
+    if risk_per_unit == 0:
+        return None, None, None, None
+
+    qty = risk_amount / risk_per_unit
+    sl_price = price * (1 - stop_pct / 100.0)
+    tp_price = price + (price - sl_price) * 2
+    return risk_amount, qty, sl_price, tp_price
+
+
+def position_from_entry_sl(balance, risk_pct, entry_price, sl_price, tp_price=None):
+    """Dipakai di mode screenshot: hitung size dari entry & SL."""
+    if balance <= 0 or risk_pct <= 0:
+        return None, None, None
+
+    if entry_price <= 0 or sl_price <= 0 or entry_price == sl_price:
+        return None, None, None
+
+    risk_amount = balance * (risk_pct / 100.0)
+    risk_per_unit = abs(entry_price - sl_price)
+    qty = risk_amount / risk_per_unit
+
+    rr = None
+    if tp_price and tp_price != entry_price and tp_price > 0:
+        rr = abs(tp_price - entry_price) / abs(entry_price - sl_price)
+
+    return risk_amount, qty, rr
+
+
+# =========================
+# INDIKATOR HEMAT MEMORI (ARRAY)
+# =========================
+INDICATOR_SPANS = (10, 20, 50, 100, 200)
+INDICATOR_FRAME_COLUMNS = [f"EMA{span}" for span in INDICATOR_SPANS] + ["RSI"]
+
+# dtype buffer indikator; float32 memotong memori separuh dengan error
+# relatif ~1e-7 (cukup untuk EMA / RSI, tapi keputusan di batas persis
+# bisa berbeda dari float64)
+DEFAULT_INDICATOR_DTYPE = os.environ.get("TRADING_ANALISA_DTYPE", "float64")
+
+# panjang blok perhitungan: memori sementara O(blok), bukan O(n)
+_BLOCK = 4096
+
+
+def require_finite_close(close):
+    """
+    ValueError bila ``close`` berisi NaN / inf. ema_into dan rsi_into
+    membutuhkan seri tanpa celah: satu NaN membuat semua EMA sesudahnya NaN
+    (berbeda dengan ``ewm`` yang melewati NaN). Bersihkan frame mentah
+    dengan ohlcv_store.normalize_ohlcv lebih dulu.
+    """
+    import numpy as np
+
+    bad = ~np.isfinite(close)
+    if bad.any():
+        raise ValueError(
+            f"Close berisi {int(bad.sum())} nilai NaN/inf (bar ke-{int(bad.argmax())}); "
+            "buang baris itu dulu, mis. dengan normalize_ohlcv."
+        )
+    return close
+
+
+def ema_into(close, span: int, out):
+    """
+    EMA (adjust=False, sama dengan ``Series.ewm(span).mean()``) ditulis ke
+    ``out``. Dihitung per blok dengan rumus tertutup
+    y_j = d^(j+1) * (y_prev + a * cumsum(x_k / d^(k+1))), d = 1 - a,
+    sehingga tidak ada array sementara sepanjang seri. ``close`` harus
+    bebas NaN / inf (lihat require_finite_close).
+    """
+    import numpy as np
+
+    n = len(close)
+    if n == 0:
+        return out
+    alpha = 2.0 / (span + 1.0)
+    decay = 1.0 - alpha
+    # d^-(blok) harus tetap jauh dari overflow float64
+    block = max(1, min(_BLOCK, int(600 / -np.log(decay))))
+    powers = decay ** np.arange(1, block + 1)
+
+    prev = float(close[0])
+    for lo in range(0, n, block):
+        x = np.asarray(close[lo:lo + block], dtype=np.float64)
+        p = powers[:len(x)]
+        y = np.cumsum(x / p)
+        y *= alpha
+        y += prev
+        y *= p
+        out[lo:lo + len(x)] = y
+        prev = y[-1]
+    return out
+
+
+def rsi_into(close, period: int, out):
+    """
+    RSI rata-rata sederhana (sama dengan compute_rsi) ditulis ke ``out``.
+    Jumlah gain/loss per jendela diambil dari cumsum lokal tiap blok,
+    jadi tidak ada drift floating point pada seri panjang.
+    """
+    import numpy as np
+
+    n = len(close)
+    out[: min(period - 1, n)] = np.nan
+    for lo in range(0, n, _BLOCK):
+        hi = min(lo + _BLOCK, n)
+        first = max(lo, period - 1)  # bar pertama dengan jendela penuh
+        if first >= hi:
+            continue
+        # delta untuk bar (first - period + 1) .. (hi - 1); delta bar 0 = 0
+        seg_lo = first - period + 1
+        delta = np.diff(np.asarray(close[max(seg_lo - 1, 0):hi], dtype=np.float64))
+        if seg_lo == 0:
+            delta = np.concatenate([[0.0], delta])
+        gain = np.concatenate([[0.0], np.cumsum(np.maximum(delta, 0.0))])
+        loss = np.concatenate([[0.0], np.cumsum(np.maximum(-delta, 0.0))])
+        gain_sum = gain[period:] - gain[:-period]
+        loss_sum = loss[period:] - loss[:-period]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[first:hi] = 100.0 - 100.0 / (1.0 + gain_sum / loss_sum)
+    return out
+
+
+def compute_indicators(close, rsi_period: int = 14, dtype=None, out=None):
+    """
+    EMA 10/20/50/100/200 + RSI dalam satu buffer ``(6, n)`` (urutan
+    INDICATOR_FRAME_COLUMNS). ``out`` boleh diberikan untuk memakai ulang
+    buffer yang sudah dialokasikan. ValueError bila ``close`` berisi
+    NaN / inf.
+    """
+    import numpy as np
+
+    close = require_finite_close(np.asarray(close, dtype=np.float64))
+    dtype = np.dtype(dtype or DEFAULT_INDICATOR_DTYPE)
+    if out is None:
+        out = np.empty((len(INDICATOR_FRAME_COLUMNS), len(close)), dtype=dtype)
+    for row, span in enumerate(INDICATOR_SPANS):
+        ema_into(close, span, out[row])
+    rsi_into(close, rsi_period, out[-1])
+    return out
+
+
+def warmup_offset(rsi_period: int = 14) -> int:
+    """Bar pertama dengan semua indikator terisi (EMA adjust=False sudah ada sejak bar 0)."""
+    return rsi_period - 1
+
+
+# =========================
+# PIPELINE ANALISIS (TANPA UI)
+# =========================
+# kebutuhan indikator tiap panel (lihat indicators.py): sinyal
+# generate_smart_signal dan ringkasan EMA terakhir
+SIGNAL_INDICATORS = ("EMA10", "EMA20", "EMA50", "EMA200", "RSI")
+SUMMARY_INDICATORS = ("EMA10", "EMA20", "EMA50", "EMA100", "EMA200")
+INDICATOR_COLUMNS = list(SIGNAL_INDICATORS)
+
+
+def indicator_frame(
+    data: pd.DataFrame,
+    rsi_period: int = 14,
+    dtype=None,
+    columns=INDICATOR_FRAME_COLUMNS,
+    cache=None,
+) -> pd.DataFrame:
+    """
+    Frame OHLCV + kolom indikator ``columns`` tanpa menyalin ``data``:
+    kolom harga tetap memakai array ``data``, indikator dihitung lewat
+    registry (hanya kolom yang diminta). Kolom "RSI" memakai
+    ``rsi_period``. ``cache`` (indicators.IndicatorCache) opsional untuk
+    memo lintas pemanggilan. ``data`` tidak diubah.
+    """
+    import pandas as pd
+
+    from indicators import LazyIndicators
+
+    lazy = LazyIndicators(data, dtype=dtype, cache=cache)
+    values = {
+        col: lazy.get(f"RSI{rsi_period}" if col == "RSI" else col)
+        for col in columns
+    }
+    indicators = pd.DataFrame(values, index=data.index, copy=False)
+    return pd.concat([data, indicators], axis=1)
+
+
+def analyze_frame_full(data: pd.DataFrame, timer=NULL_TIMER, dtype=None, extra=(), cache=None):
+    """
+    Seperti analyze_frame, tapi juga mengembalikan frame berindikator
+    penuh (termasuk bar warm-up): return (frame, data_ind, signal, reason)
+    dengan data_ind = view ``frame`` mulai bar warm-up. Frame berisi
+    SIGNAL_INDICATORS ditambah kolom ``extra`` yang diminta panel lain.
+    """
+    from indicators import merge_needs
+
+    with timer.stage("indicators"):
+        frame = indicator_frame(
+            data, rsi_period=14, dtype=dtype,
+            columns=merge_needs(SIGNAL_INDICATORS, extra), cache=cache,
+        )
+
+    with timer.stage("warmup"):
+        data_ind = frame.iloc[warmup_offset(14):]
+    if data_ind.empty:
+        return frame, data_ind, None, None
+
+    with timer.stage("signal"):
+        signal, reason = generate_smart_signal(data_ind)
+    return frame, data_ind, signal, reason
+
+
+def analyze_frame(data: pd.DataFrame, timer=NULL_TIMER, dtype=None, extra=()):
+    """
+    Pipeline Mode 1 untuk frame OHLCV: EMA + RSI, lewati bar warm-up,
+    lalu sinyal. Return (data_ind, signal, reason); data_ind kosong jika
+    data terlalu sedikit untuk indikator. data_ind adalah view mulai bar
+    warm-up (bukan salinan hasil dropna). ``dtype`` = dtype buffer
+    indikator (default DEFAULT_INDICATOR_DTYPE), ``extra`` = kolom
+    indikator tambahan di luar SIGNAL_INDICATORS, ``timer``
+    (instrumentation.StageTimer) opsional untuk mencatat durasi tiap tahap.
+    """
+    _, data_ind, signal, reason = analyze_frame_full(data, timer=timer, dtype=dtype, extra=extra)
+    return data_ind, signal, reason
+
+
+def analyze_ticker(
+    ticker: str,
+    market_type: str,
+    period: str,
+    interval: str,
+    store,
+    balance: float = 1000.0,
+    risk_pct: float = 2.0,
+    stop_pct: float = 3.0,
+    timer=NULL_TIMER,
+    dtype=None,
+    symbols=None,
+) -> dict:
+    """
+    Analisis lengkap satu ticker untuk pemakaian headless (CLI / batch).
+    ``store`` adalah objek dengan ``get(yahoo_ticker, period, interval)``,
+    mis. ohlcv_store.OHLCVStore. ``symbols`` (symbol_index.SymbolIndex)
+    opsional: ticker divalidasi + alias dipetakan lokal, dan ticker yang
+    tidak valid langsung ERROR tanpa request ke upstream. Return dict
+    datar yang siap jadi JSON/CSV.
+    """
+    resolution = symbols.resolve(ticker, market_type) if symbols is not None else None
+    yahoo_ticker = resolution.yahoo if resolution is not None else map_ticker_to_yahoo(ticker, market_type)
+    result = {
+        "ticker": ticker,
+        "market_type": market_type,
+        "yahoo_ticker": yahoo_ticker,
+        "period": period,
+        "interval": interval,
+    }
+    if resolution is not None and not resolution.ok:
+        result.update(signal="ERROR", reason=resolution.message(), suggestions=list(resolution.suggestions))
+        return result
+
+    with timer.stage("fetch"):
+        data = store.get(yahoo_ticker, period, interval)
+    if data.empty:
+        result.update(signal="ERROR", reason="Data tidak ditemukan. Coba ticker atau periode lain.")
+        return result
+
+    data_ind, signal, reason = analyze_frame(data, timer=timer, dtype=dtype, extra=SUMMARY_INDICATORS)
+    if data_ind.empty:
+        result.update(signal="DATA KURANG", reason="Data masih terlalu sedikit untuk menghitung indikator.")
+        return result
+
+    last_row = data_ind.iloc[-1]
+    result.update(
+        signal=signal,
+        reason=reason,
+        time=str(data_ind.index[-1]),
+        close=float(last_row["Close"]),
+        high=float(last_row["High"]),
+        low=float(last_row["Low"]),
+        volume=float(last_row["Volume"]),
+        ema10=float(last_row["EMA10"]),
+        ema20=float(last_row["EMA20"]),
+        ema50=float(last_row["EMA50"]),
+        ema100=float(last_row["EMA100"]),
+        ema200=float(last_row["EMA200"]),
+        rsi=float(last_row["RSI"]),
+    )
+
+    with timer.stage("sizing"):
+        risk_amount, qty, sl_price, tp_price = compute_position_sizing(
+            balance, risk_pct, stop_pct, float(last_row["Close"])
+        )
+    result.update(risk_amount=risk_amount, qty=qty, sl_price=sl_price, tp_price=tp_price)
+    return result
+
+
+# =========================
+# TIMELINE SINYAL (SELURUH HISTORI)
+# =========================
+def signal_timeline(data_ind: pd.DataFrame):
+    """
+    Kode sinyal (signal_rules) untuk setiap bar ``data_ind`` dalam satu
+    operasi array. Kode bar ke-i sama dengan hasil generate_smart_signal
+    pada ``data_ind.iloc[:i + 1]``, termasuk DATA KURANG untuk 59 bar
+    pertama; kode bar terakhir = sinyal Mode 1.
+    """
+    from signal_rules import CODE_DATA_KURANG, MIN_SIGNAL_BARS, evaluate_signal_codes
+
+    codes = evaluate_signal_codes(
+        data_ind["Close"].to_numpy(),
+        data_ind["EMA10"].to_numpy(),
+        data_ind["EMA20"].to_numpy(),
+        data_ind["EMA50"].to_numpy(),
+        data_ind["EMA200"].to_numpy(),
+        data_ind["RSI"].to_numpy(),
+    )
+    codes[: MIN_SIGNAL_BARS - 1] = CODE_DATA_KURANG
+    return codes
+
+
+def signal_log(data_ind: pd.DataFrame, codes, changes_only: bool = False) -> pd.DataFrame:
+    """
+    Log sinyal siap diunduh: satu baris per bar BUY/SELL, atau (jika
+    ``changes_only``) per bar yang labelnya berubah dari bar sebelumnya.
+    Hanya baris terpilih yang diambil dari frame (tanpa loop per baris).
+    """
+    import numpy as np
+
+    from signal_rules import CODE_BUY, CODE_DATA_KURANG, CODE_SELL, SIGNAL_LABELS, SIGNAL_REASONS
+
+    codes = np.asarray(codes)
+    if changes_only:
+        picked = np.flatnonzero(codes != np.concatenate([[CODE_DATA_KURANG], codes[:-1]]))
+    else:
+        picked = np.flatnonzero((codes == CODE_BUY) | (codes == CODE_SELL))
+
+    labels = np.array([SIGNAL_LABELS[c] for c in range(len(SIGNAL_LABELS))], dtype=object)
+    reasons = np.array([SIGNAL_REASONS[c] for c in range(len(SIGNAL_REASONS))], dtype=object)
+
+    log = data_ind.iloc[picked][["Close", "EMA10", "EMA20", "EMA50", "EMA200", "RSI"]].copy()
+    log.insert(0, "Sinyal", labels[codes[picked]])
+    log["Alasan"] = reasons[codes[picked]]
+    log.index.name = "Waktu"
+    return log